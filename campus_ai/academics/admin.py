@@ -3,7 +3,20 @@ from .models import Department, Course, Subject, Enrollment, Section, ClassSched
 
 admin.site.register(Department)
 admin.site.register(Course)
-admin.site.register(Section)
 admin.site.register(Subject)
-admin.site.register(Enrollment)
-admin.site.register(ClassSchedule)
+
+
+# __str__ of these reads related rows; join them into the changelist query.
+@admin.register(Section)
+class SectionAdmin(admin.ModelAdmin):
+    list_select_related = ("course",)
+
+
+@admin.register(Enrollment)
+class EnrollmentAdmin(admin.ModelAdmin):
+    list_select_related = ("subject",)
+
+
+@admin.register(ClassSchedule)
+class ClassScheduleAdmin(admin.ModelAdmin):
+    list_select_related = ("section__course",)
@@ -2,13 +2,15 @@ import random
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils import timezone
 
 from accounts.models import FacultyProfile, StudentProfile, User
 from academics.models import ClassSchedule, Course, Department, Enrollment, Section, Subject
-from attendance.models import AttendanceRecord, AttendanceSession
+from attendance.models import AttendanceRecord, AttendanceSession, AttendanceSlotSummary, AttendanceSummary
+from attendance.services import create_pending_sessions, record_attendance_counts, record_slot_counts
+from attendance.signals import notify_attendance_changed
 from canteen.models import MenuItem, Order, OrderItem, Stall, TimeSlot
 
 try:
@@ -42,7 +44,23 @@ class Command(BaseCommand):
         self._roll_start = 200000
         self._used_rolls = set(StudentProfile.objects.values_list("roll_no", flat=True))
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=1,
+            help="Multiply the faculty, student, section and order targets (default: 1).",
+        )
+
     def handle(self, *args, **options):
+        scale = options["scale"]
+        if scale < 1:
+            raise CommandError("--scale must be at least 1.")
+        self.FACULTY_TARGET = type(self).FACULTY_TARGET * scale
+        self.STUDENT_TARGET = type(self).STUDENT_TARGET * scale
+        self.SECTION_TARGET = type(self).SECTION_TARGET * scale
+        self.ORDER_TARGET = type(self).ORDER_TARGET * scale
+
         random.seed()
         with transaction.atomic():
             departments = self._ensure_departments()
@@ -56,6 +74,8 @@ class Command(BaseCommand):
             self._enroll_students(section_map=self._build_section_student_map(student_users), sections=sections, subjects=subjects)
             self._generate_class_schedules(sections)
             self._generate_attendance_history(subjects, sections)
+            notify_attendance_changed(AttendanceSummary, AttendanceSlotSummary)
+            create_pending_sessions(timezone.localdate())
 
             stalls, menu_items = self._ensure_canteen_catalog()
             timeslots = self._ensure_canteen_timeslots()
@@ -357,6 +377,16 @@ class Command(BaseCommand):
             )
         if records_to_create:
             AttendanceRecord.objects.bulk_create(records_to_create, batch_size=1000)
+            record_attendance_counts(
+                session.subject_id,
+                [record.student_id for record in records_to_create if record.status == "PRESENT"],
+                [record.student_id for record in records_to_create if record.status == "ABSENT"],
+            )
+            record_slot_counts(
+                session,
+                sum(record.status == "PRESENT" for record in records_to_create),
+                len(records_to_create),
+            )
 
     def _generate_class_schedules(self, sections):
         room_pool = [f"Room-{room_no}" for room_no in range(101, 131)]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_classschedule'),
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classschedule',
+            index=models.Index(fields=['faculty', 'day_of_week', 'start_time'], name='schedule_faculty_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classschedule',
+            index=models.Index(fields=['day_of_week', 'start_time'], name='schedule_day_start_idx'),
+        ),
+    ]
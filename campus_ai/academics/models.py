@@ -61,7 +61,7 @@ class Enrollment(models.Model):
         unique_together = ('student', 'subject')
 
     def __str__(self):
-        return f"{self.student.user_id} enrolled in {self.subject.subject_code}"
+        return f"{self.student_id} enrolled in {self.subject.subject_code}"
 class Section(models.Model):
     name = models.CharField(max_length=20)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
@@ -106,6 +106,12 @@ class ClassSchedule(models.Model):
     class Meta:
         unique_together = ("section", "day_of_week", "start_time")
         ordering = ["day_of_week", "start_time"]
+        indexes = [
+            # A faculty member's week or day, in timetable order.
+            models.Index(fields=["faculty", "day_of_week", "start_time"], name="schedule_faculty_day_idx"),
+            # Everything on one weekday (timetable index, inactive faculty report).
+            models.Index(fields=["day_of_week", "start_time"], name="schedule_day_start_idx"),
+        ]
 
     def __str__(self):
         return f"{self.section} {self.day_of_week} {self.start_time}"
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ClassSchedule, Section, Subject
+from .timetable import bump_timetable_version
+
+
+@receiver(post_save, sender=ClassSchedule)
+@receiver(post_delete, sender=ClassSchedule)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+@receiver(post_save, sender="planner.RemedialSession")
+@receiver(post_delete, sender="planner.RemedialSession")
+def invalidate_timetable(sender, **kwargs):
+    # Subject / Section names are served from the index and weekly grids
+    # too; remedial sessions are merged into the weekly grids.
+    bump_timetable_version()
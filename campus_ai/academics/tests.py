@@ -1,3 +1,185 @@
-from django.test import TestCase
+import unittest
+from datetime import date, time, timedelta
+from functools import partial
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from core.query_assertions import QueryBudgetMixin, QueryPlanMixin
+from planner.models import RemedialSession
+from .models import ClassSchedule, Course, Department, Section, Subject
+from .timetable import TimetableIndex, build_weekly_grid, get_timetable_index, get_weekly_grid
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class WeeklyGridTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        department = Department.objects.create(name="Computer Science")
+        course = Course.objects.create(course_name="B.Tech CSE", department=department, duration_years=4)
+        self.section = Section.objects.create(name="SEC-A", course=course, year=1)
+        self.faculty = User.objects.create(user_id="FAC001", password="x", role="FACULTY")
+        self.subject = Subject.objects.create(
+            subject_code="CS101",
+            subject_name="Programming Fundamentals",
+            department=department,
+            course=course,
+            semester=1,
+            faculty=self.faculty,
+        )
+
+    def _schedule(self, day, hour):
+        return ClassSchedule.objects.create(
+            subject=self.subject,
+            faculty=self.faculty,
+            section=self.section,
+            day_of_week=day,
+            start_time=time(hour, 0),
+            end_time=time(hour + 1, 0),
+            room="Room-101",
+        )
+
+    def test_slots_come_from_schedule_and_include_saturday(self):
+        self._schedule("MON", 8)
+        self._schedule("SAT", 13)
+
+        grid = get_weekly_grid(section_id=self.section.id)
+
+        self.assertEqual(grid["day_columns"], ["MON", "TUE", "WED", "THU", "FRI", "SAT"])
+        self.assertEqual([row["label"] for row in grid["slot_rows"]], ["08:00 - 09:00", "13:00 - 14:00"])
+        self.assertEqual(grid["slot_rows"][1]["ordered_cells"][5]["subject_name"], "Programming Fundamentals")
+
+    def test_cached_grid_is_rebuilt_after_remedial_is_scheduled(self):
+        self._schedule("MON", 9)
+        self.assertEqual(len(get_weekly_grid(faculty_id="FAC001")["slot_rows"]), 1)
+        with self.assertNumQueries(0):
+            get_weekly_grid(faculty_id="FAC001")
+
+        day = timezone.localdate() + timedelta(days=1)
+        while day.weekday() > 4:
+            day += timedelta(days=1)
+        RemedialSession.objects.create(
+            subject=self.subject,
+            section=self.section,
+            scheduled_date=day,
+            start_time=time(16, 0),
+            end_time=time(17, 0),
+            code="REM001",
+            created_by=self.faculty,
+        )
+
+        grid = get_weekly_grid(faculty_id="FAC001")
+        cells = [cell for row in grid["slot_rows"] for cell in row["ordered_cells"] if cell]
+        self.assertEqual(sorted(cell["type"] for cell in cells), ["CLASS", "REMEDIAL"])
+
+
+class TimetableIndexTests(TestCase):
+    MONDAY = date(2026, 3, 2)
+
+    def setUp(self):
+        cache.clear()
+        department = Department.objects.create(name="Computer Science")
+        course = Course.objects.create(course_name="B.Tech CSE", department=department, duration_years=4)
+        self.section = Section.objects.create(name="SEC-A", course=course, year=1)
+        self.faculty = User.objects.create(user_id="FAC001", password="x", role="FACULTY")
+        self.subject = Subject.objects.create(
+            subject_code="CS101",
+            subject_name="Programming Fundamentals",
+            department=department,
+            course=course,
+            semester=1,
+            faculty=self.faculty,
+        )
+        self.schedule = ClassSchedule.objects.create(
+            subject=self.subject,
+            faculty=self.faculty,
+            section=self.section,
+            day_of_week="MON",
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            room="Room-101",
+        )
+
+    def test_lookups_are_served_from_memory(self):
+        index = get_timetable_index(self.MONDAY)
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_timetable_index(self.MONDAY), index)
+            self.assertEqual(index.for_faculty("FAC001"), [self.schedule])
+            self.assertEqual(index.for_section(self.section.id)[0].subject.subject_name, "Programming Fundamentals")
+            self.assertEqual(index.active_for_faculty("FAC001", time(9, 30)), self.schedule)
+            self.assertIsNone(index.active_for_section(self.section.id, time(10, 30)))
+        self.assertEqual(get_timetable_index(self.MONDAY + timedelta(days=1)).entries, [])
+
+    def test_saving_or_deleting_a_class_rebuilds_the_index(self):
+        stale = get_timetable_index(self.MONDAY)
+
+        self.schedule.room = "Room-202"
+        self.schedule.save()
+        index = get_timetable_index(self.MONDAY)
+        self.assertIsNot(index, stale)
+        self.assertEqual(index.for_faculty("FAC001")[0].room, "Room-202")
+
+        self.schedule.delete()
+        self.assertEqual(get_timetable_index(self.MONDAY).for_faculty("FAC001"), [])
+
+    def test_cleared_cache_never_reuses_an_old_index(self):
+        stale = get_timetable_index(self.MONDAY)
+        cache.clear()
+        ClassSchedule.objects.filter(pk=self.schedule.pk).update(room="Room-303")
+
+        self.assertEqual(get_timetable_index(self.MONDAY).for_faculty("FAC001")[0].room, "Room-303")
+        self.assertIsNot(get_timetable_index(self.MONDAY), stale)
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    ADMIN_APPS = ("academics",)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    MONDAY = date(2026, 3, 2)
+
+    def setUp(self):
+        department = Department.objects.create(name="Computer Science")
+        course = Course.objects.create(course_name="B.Tech CSE", department=department, duration_years=4)
+        self.section = Section.objects.create(name="SEC-A", course=course, year=1)
+        faculty = User.objects.create(user_id="FAC001", password="x", role="FACULTY")
+        subject = Subject.objects.create(
+            subject_code="CS101",
+            subject_name="Programming Fundamentals",
+            department=department,
+            course=course,
+            semester=1,
+            faculty=faculty,
+        )
+        ClassSchedule.objects.create(
+            subject=subject,
+            faculty=faculty,
+            section=self.section,
+            day_of_week="MON",
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            room="Room-101",
+        )
+
+    def test_daily_index(self):
+        self.assertUsesIndex(
+            partial(TimetableIndex.build, self.MONDAY, version=1),
+            "academics_classschedule",
+            "schedule_day_start_idx",
+        )
+
+    def test_weekly_grids(self):
+        self.assertUsesIndex(
+            partial(build_weekly_grid, faculty_id="FAC001", today=self.MONDAY),
+            "academics_classschedule",
+            "schedule_faculty_day_idx",
+        )
+        self.assertUsesIndex(
+            partial(build_weekly_grid, section_id=self.section.id, today=self.MONDAY),
+            "academics_classschedule",
+        )
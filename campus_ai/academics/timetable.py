@@ -0,0 +1,243 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from planner.models import RemedialSession
+from .models import ClassSchedule
+
+
+WEEKDAY_CODE_MAP = {
+    0: "MON",
+    1: "TUE",
+    2: "WED",
+    3: "THU",
+    4: "FRI",
+    5: "SAT",
+    6: "SUN",
+}
+
+TIMETABLE_VERSION_KEY = "academics:timetable_version"
+TIMETABLE_GRID_PREFIX = "academics:timetable_grid:"
+TIMETABLE_GRID_TTL = 60 * 60 * 24
+
+WEEK_DAYS = [code for code, _ in ClassSchedule.DAY_CHOICES]
+WORKING_DAYS = WEEK_DAYS[:5]
+
+
+def day_code_for(day):
+    return WEEKDAY_CODE_MAP[day.weekday()]
+
+
+# =========================================================
+# VERSION STAMP (shared across workers via the cache)
+# =========================================================
+def _fresh_version():
+    # Start from the clock rather than 1, so a process-local index built
+    # before the cache was cleared can never match the new stamp.
+    return time.time_ns()
+
+
+def get_timetable_version():
+    version = cache.get(TIMETABLE_VERSION_KEY)
+    if version is None:
+        fresh = _fresh_version()
+        cache.add(TIMETABLE_VERSION_KEY, fresh, timeout=None)
+        # Without a working cache every call gets a new stamp (no reuse).
+        version = cache.get(TIMETABLE_VERSION_KEY, fresh)
+    return version
+
+
+def bump_timetable_version():
+    try:
+        return cache.incr(TIMETABLE_VERSION_KEY)
+    except ValueError:
+        version = _fresh_version()
+        cache.set(TIMETABLE_VERSION_KEY, version, timeout=None)
+        return version
+
+
+# =========================================================
+# DAILY INDEX
+# =========================================================
+class TimetableIndex:
+    """
+    Read-only index of one day's ClassSchedule rows.
+
+    Entries are fully select_related, so every lookup and template
+    access after the build is served from memory.
+    """
+
+    def __init__(self, day, version, entries):
+        self.day = day
+        self.day_code = day_code_for(day)
+        self.version = version
+        self.entries = entries
+        self.by_faculty = {}
+        self.by_section = {}
+        self.by_time = {}
+
+        for entry in entries:
+            self.by_faculty.setdefault(entry.faculty_id, []).append(entry)
+            self.by_section.setdefault(entry.section_id, []).append(entry)
+            self.by_time.setdefault(entry.start_time, []).append(entry)
+
+    @classmethod
+    def build(cls, day, version):
+        entries = list(
+            ClassSchedule.objects.filter(day_of_week=day_code_for(day))
+            .select_related("subject", "section", "faculty")
+            .order_by("start_time")
+        )
+        return cls(day, version, entries)
+
+    def for_faculty(self, faculty_id):
+        return self.by_faculty.get(faculty_id, [])
+
+    def for_section(self, section_id):
+        return self.by_section.get(section_id, [])
+
+    def starting_at(self, start_time):
+        return self.by_time.get(start_time, [])
+
+    def faculty_ids(self):
+        return set(self.by_faculty)
+
+    def running_at(self, at_time, entries=None):
+        """
+        Classes in progress at `at_time`, optionally within `entries`.
+        """
+        if entries is None:
+            entries = self.entries
+        return [entry for entry in entries if entry.start_time <= at_time <= entry.end_time]
+
+    def active_for_faculty(self, faculty_id, at_time):
+        running = self.running_at(at_time, self.for_faculty(faculty_id))
+        return running[0] if running else None
+
+    def active_for_section(self, section_id, at_time):
+        running = self.running_at(at_time, self.for_section(section_id))
+        return running[0] if running else None
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_timetable_index(day=None):
+    """
+    Process-local index for `day` (default: today), rebuilt only when
+    the day rolls over or the shared timetable version changes.
+    """
+    day = day or timezone.localdate()
+    version = get_timetable_version()
+
+    index = _indexes.get(day)
+    if index is not None and index.version == version:
+        return index
+
+    with _lock:
+        index = _indexes.get(day)
+        if index is None or index.version != version:
+            index = TimetableIndex.build(day, version)
+            today = timezone.localdate()
+            for stale_day in [key for key in _indexes if key < today]:
+                del _indexes[stale_day]
+            _indexes[day] = index
+    return index
+
+
+# =========================================================
+# WEEKLY GRID (student / faculty timetable pages)
+# =========================================================
+def _grid_cell(kind, subject, faculty_id, section_name, room):
+    return {
+        "type": kind,
+        "subject_name": subject.subject_name,
+        "faculty_name": faculty_id,
+        "section_name": section_name,
+        "room": room,
+    }
+
+
+def build_weekly_grid(section_id=None, faculty_id=None, today=None):
+    """
+    {"day_columns", "slot_rows"} for one section or one faculty member.
+
+    Rows are the distinct (start, end) slots found in the schedule and in
+    upcoming remedial sessions; SAT is shown only when something is on it.
+    A remedial only fills a cell that has no regular class.
+    """
+    today = today or timezone.localdate()
+    schedules = ClassSchedule.objects.select_related("subject", "section").order_by("day_of_week", "start_time")
+    remedials = RemedialSession.objects.filter(
+        scheduled_date__gte=today,
+        start_time__isnull=False,
+        end_time__isnull=False,
+    ).select_related("subject", "section")
+    if section_id is not None:
+        schedules = schedules.filter(section_id=section_id)
+        remedials = remedials.filter(section_id=section_id)
+    if faculty_id is not None:
+        schedules = schedules.filter(faculty_id=faculty_id)
+        remedials = remedials.filter(created_by_id=faculty_id)
+
+    entries = []
+    for schedule in schedules:
+        entries.append(
+            (
+                schedule.day_of_week,
+                schedule.start_time,
+                schedule.end_time,
+                _grid_cell("CLASS", schedule.subject, schedule.faculty_id, schedule.section.name, schedule.room),
+            )
+        )
+    for remedial in remedials.order_by("scheduled_date", "start_time"):
+        day_code = day_code_for(remedial.scheduled_date)
+        if day_code not in WEEK_DAYS:
+            continue
+        entries.append(
+            (
+                day_code,
+                remedial.start_time,
+                remedial.end_time,
+                _grid_cell("REMEDIAL", remedial.subject, remedial.created_by_id, remedial.section.name, "Remedial"),
+            )
+        )
+
+    day_columns = WEEK_DAYS if any(day == "SAT" for day, *_ in entries) else WORKING_DAYS
+    slots = sorted({(start, end) for _, start, end, _ in entries})
+    cells = {}
+    for day, start, end, cell in entries:
+        cells.setdefault((start, end, day), cell)
+
+    slot_rows = []
+    for start, end in slots:
+        start_str, end_str = start.strftime("%H:%M"), end.strftime("%H:%M")
+        slot_rows.append(
+            {
+                "start_str": start_str,
+                "end_str": end_str,
+                "label": f"{start_str} - {end_str}",
+                "ordered_cells": [cells.get((start, end, day)) for day in day_columns],
+            }
+        )
+    return {"day_columns": day_columns, "slot_rows": slot_rows}
+
+
+def get_weekly_grid(section_id=None, faculty_id=None):
+    """
+    Cached build_weekly_grid(). The key carries the timetable version and
+    today's date, so schedule or remedial edits and the day rolling over
+    (remedials drop off once past) each produce a fresh grid.
+    """
+    today = timezone.localdate()
+    owner = f"section:{section_id}" if section_id is not None else f"faculty:{faculty_id}"
+    key = f"{TIMETABLE_GRID_PREFIX}{owner}:{get_timetable_version()}:{today.isoformat()}"
+
+    grid = cache.get(key)
+    if grid is None:
+        grid = build_weekly_grid(section_id=section_id, faculty_id=faculty_id, today=today)
+        cache.set(key, grid, TIMETABLE_GRID_TTL)
+    return grid
@@ -0,0 +1,70 @@
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+from .models import User
+
+
+CURRENT_USER_PREFIX = "accounts:current_user:"
+USER_VERSION_KEY = "accounts:user_version"
+CURRENT_USER_TTL = 60
+
+PROFILE_RELATIONS = ("studentprofile__section__course", "facultyprofile")
+
+
+# =========================================================
+# VERSION STAMP (bumped on any user / profile change)
+# =========================================================
+def bump_user_version():
+    try:
+        return cache.incr(USER_VERSION_KEY)
+    except ValueError:
+        cache.set(USER_VERSION_KEY, 2, timeout=None)
+        return 2
+
+
+# =========================================================
+# SESSION USER
+# =========================================================
+def load_session_user(user_id, role):
+    """
+    Active user for the session with its profile attached as `profile`
+    (StudentProfile, FacultyProfile or None). Cached briefly across
+    requests; one cache round trip on a hit.
+    """
+    key = f"{CURRENT_USER_PREFIX}{user_id}"
+    cached = cache.get_many([USER_VERSION_KEY, key])
+    version = cached.get(USER_VERSION_KEY, 1)
+    entry = cached.get(key)
+    if entry is not None and entry[0] == version:
+        user = entry[1]
+    else:
+        user = User.objects.filter(user_id=user_id, is_active=True).select_related(*PROFILE_RELATIONS).first()
+        if user is not None:
+            user.profile = getattr(user, "studentprofile", None) or getattr(user, "facultyprofile", None)
+        cache.set(key, (version, user), CURRENT_USER_TTL)
+
+    if user is None or user.role != role:
+        return None
+    return user
+
+
+def _resolve(request):
+    user_id = request.session.get("user_id")
+    role = request.session.get("role")
+    if not user_id or not role:
+        return None
+    return load_session_user(user_id, role)
+
+
+class CurrentUserMiddleware:
+    """
+    Sets `request.current_user`: the session's active User (with
+    `profile`) or None, resolved on first access only.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.current_user = SimpleLazyObject(lambda: _resolve(request))
+        return self.get_response(request)
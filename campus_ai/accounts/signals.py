@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .middleware import bump_user_version
+from .models import FacultyProfile, StudentProfile, User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_save, sender=FacultyProfile)
+@receiver(post_delete, sender=FacultyProfile)
+@receiver(post_save, sender="academics.Section")
+@receiver(post_delete, sender="academics.Section")
+def invalidate_current_users(sender, **kwargs):
+    # Cached session users carry their profile and section.
+    bump_user_version()
@@ -1,3 +1,62 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from academics.models import Course, Department, Section
+from core.query_assertions import QueryBudgetMixin
+from .middleware import load_session_user
+from .models import StudentProfile, User
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CurrentUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        department = Department.objects.create(name="Computer Science")
+        course = Course.objects.create(course_name="B.Tech CSE", department=department, duration_years=4)
+        section = Section.objects.create(name="SEC-A", course=course, year=1)
+        self.student = User.objects.create(user_id="STU001", password="x", role="STUDENT")
+        self.profile = StudentProfile.objects.create(
+            user=self.student,
+            name="Student One",
+            roll_no=1,
+            department=department,
+            course=course,
+            section=section,
+            admission_year=2025,
+            parent_contact="",
+        )
+
+    def test_user_and_profile_load_in_one_query_then_come_from_cache(self):
+        with self.assertNumQueries(1):
+            user = load_session_user("STU001", "STUDENT")
+            self.assertEqual(user.profile.section.name, "SEC-A")
+        with self.assertNumQueries(0):
+            self.assertEqual(load_session_user("STU001", "STUDENT").profile.name, "Student One")
+        self.assertIsNone(load_session_user("STU001", "FACULTY"))
+
+    def test_profile_change_invalidates_cached_user(self):
+        load_session_user("STU001", "STUDENT")
+        self.profile.name = "Student Renamed"
+        self.profile.save()
+
+        self.assertEqual(load_session_user("STU001", "STUDENT").profile.name, "Student Renamed")
+
+        self.student.is_active = False
+        self.student.save()
+        self.assertIsNone(load_session_user("STU001", "STUDENT"))
+
+    def test_views_resolve_session_user_once(self):
+        session = self.client.session
+        session["user_id"] = "STU001"
+        session["role"] = "STUDENT"
+        session.save()
+
+        self.client.get("/student-timetable/")
+        # Session lookup only; the user and profile come from the cache.
+        with self.assertNumQueries(1):
+            response = self.client.get("/student-timetable/")
+        self.assertEqual(response.context["section"].name, "SEC-A")
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    ADMIN_APPS = ("accounts",)
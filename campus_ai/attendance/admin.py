@@ -1,5 +1,48 @@
 from django.contrib import admin
-from .models import AttendanceSession, AttendanceRecord
+from .models import (
+    ArchivedAttendanceSummary,
+    AttendanceSession,
+    AttendanceRecord,
+    AttendanceRiskScore,
+    AttendanceSlotSummary,
+    AttendanceSummary,
+)
 
-admin.site.register(AttendanceSession)
-admin.site.register(AttendanceRecord)
+@admin.register(AttendanceSession)
+class AttendanceSessionAdmin(admin.ModelAdmin):
+    list_select_related = ("subject", "section__course")
+
+
+@admin.register(AttendanceRecord)
+class AttendanceRecordAdmin(admin.ModelAdmin):
+    list_select_related = ("session__subject",)
+
+
+@admin.register(AttendanceSummary)
+class AttendanceSummaryAdmin(admin.ModelAdmin):
+    list_display = ("student", "subject", "present_count", "total_count")
+    list_select_related = ("student", "subject")
+    search_fields = ("student__user_id",)
+
+
+@admin.register(AttendanceSlotSummary)
+class AttendanceSlotSummaryAdmin(admin.ModelAdmin):
+    list_display = ("section", "faculty", "day_of_week", "start_time", "present_count", "total_count")
+    list_select_related = ("section__course", "faculty")
+    list_filter = ("day_of_week",)
+
+
+@admin.register(AttendanceRiskScore)
+class AttendanceRiskScoreAdmin(admin.ModelAdmin):
+    list_display = ("student", "score", "attendance_percentage", "recent_trend", "current_absence_streak", "computed_at")
+    list_select_related = ("student",)
+    search_fields = ("student__user_id",)
+    ordering = ("-score",)
+
+
+@admin.register(ArchivedAttendanceSummary)
+class ArchivedAttendanceSummaryAdmin(admin.ModelAdmin):
+    list_display = ("semester", "student", "subject", "present_count", "total_count")
+    list_select_related = ("student", "subject")
+    list_filter = ("semester",)
+    search_fields = ("student__user_id",)
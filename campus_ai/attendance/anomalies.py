@@ -0,0 +1,129 @@
+from .models import AttendanceRecord
+
+
+# Face matches are only accepted at >= 0.92 similarity (ml.utils);
+# anything just above that line is treated as a weak match.
+LOW_CONFIDENCE_SCORE = 0.95
+
+
+def _filter_dates(records, date_from=None, date_to=None):
+    if date_from:
+        records = records.filter(session__date__gte=date_from)
+    if date_to:
+        records = records.filter(session__date__lte=date_to)
+    return records
+
+
+# =========================================================
+# OVERLAPPING PRESENCE (sort-and-sweep)
+# =========================================================
+def find_overlapping_presence(date_from=None, date_to=None, chunk_size=5000):
+    """
+    Yield one anomaly per pair of PRESENT records of the same student
+    whose session times overlap on the same day.
+
+    Records are streamed sorted by (student, date, start_time) and swept
+    once; only the intervals still open at the current start time are
+    kept, so a semester of records is a single linear pass.
+    """
+    records = _filter_dates(
+        AttendanceRecord.objects.filter(status="PRESENT", session__confirmed=True),
+        date_from,
+        date_to,
+    )
+    rows = (
+        records.order_by("student_id", "session__date", "session__start_time", "session_id")
+        .values_list(
+            "student_id",
+            "session__date",
+            "session__start_time",
+            "session__end_time",
+            "session_id",
+            "session__section_id",
+            "session__subject__subject_code",
+            "session__marked_by_id",
+            "session__method",
+            "confidence_score",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+    group = None
+    open_intervals = []
+    for row in rows:
+        student_id, day, start_time, end_time = row[:4]
+        if (student_id, day) != group:
+            group = (student_id, day)
+            open_intervals = []
+
+        open_intervals = [interval for interval in open_intervals if interval[3] > start_time]
+        for interval in open_intervals:
+            yield _overlap(interval, row)
+        open_intervals.append(row)
+
+
+def _overlap(first, second):
+    def side(row):
+        return {
+            "session_id": row[4],
+            "section_id": row[5],
+            "subject_code": row[6],
+            "start_time": row[2],
+            "end_time": row[3],
+            "marked_by": row[7],
+            "method": row[8],
+            "confidence_score": row[9],
+        }
+
+    return {
+        "type": "OVERLAPPING_PRESENCE",
+        "student_id": first[0],
+        "date": first[1],
+        "first": side(first),
+        "second": side(second),
+    }
+
+
+# =========================================================
+# OVERRIDDEN FACE MATCHES
+# =========================================================
+def find_overridden_face_matches(date_from=None, date_to=None, max_confidence=LOW_CONFIDENCE_SCORE):
+    """
+    Records where face recognition matched the student with a weak score
+    but the stored status is ABSENT, i.e. the match was overridden.
+    """
+    records = _filter_dates(
+        AttendanceRecord.objects.filter(
+            status="ABSENT",
+            confidence_score__isnull=False,
+            confidence_score__lt=max_confidence,
+            session__confirmed=True,
+        ),
+        date_from,
+        date_to,
+    )
+    for row in (
+        records.order_by("session__date", "session__start_time", "student_id")
+        .values(
+            "student_id",
+            "session_id",
+            "session__date",
+            "session__start_time",
+            "session__section_id",
+            "session__subject__subject_code",
+            "session__marked_by_id",
+            "confidence_score",
+        )
+        .iterator(chunk_size=2000)
+    ):
+        yield {
+            "type": "OVERRIDDEN_FACE_MATCH",
+            "student_id": row["student_id"],
+            "date": row["session__date"],
+            "session_id": row["session_id"],
+            "section_id": row["session__section_id"],
+            "subject_code": row["session__subject__subject_code"],
+            "start_time": row["session__start_time"],
+            "marked_by": row["session__marked_by_id"],
+            "confidence_score": row["confidence_score"],
+        }
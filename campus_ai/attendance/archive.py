@@ -0,0 +1,175 @@
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    ArchivedAttendanceRecord,
+    ArchivedAttendanceSession,
+    ArchivedAttendanceSummary,
+    AttendanceRecord,
+    AttendanceSession,
+)
+from .services import get_low_attendance_standings, rebuild_attendance_summary, rebuild_slot_summary
+
+
+ARCHIVE_CHUNK_SIZE = 500
+
+SESSION_FIELDS = (
+    "id",
+    "subject_id",
+    "section_id",
+    "date",
+    "start_time",
+    "end_time",
+    "marked_by_id",
+    "method",
+    "confirmed",
+)
+RECORD_FIELDS = ("id", "session_id", "student_id", "status", "confidence_score", "verified_by_faculty")
+
+
+# =========================================================
+# SEMESTERS
+# =========================================================
+def semester_for(day):
+    """
+    (label, first day, first day of the next semester) for the semester
+    containing `day`. Semesters start on the first of each month in
+    SEMESTER_START_MONTHS and are numbered from 1 within a year.
+    """
+    starts = sorted(settings.SEMESTER_START_MONTHS)
+    year = day.year
+    started = [month for month in starts if month <= day.month]
+    if not started:
+        year -= 1
+        started = starts
+    number = len(started)
+    first_day = date(year, started[-1], 1)
+    if number < len(starts):
+        next_start = date(year, starts[number], 1)
+    else:
+        next_start = date(year + 1, starts[0], 1)
+    return f"{year}-S{number}", first_day, next_start
+
+
+def archived_semesters():
+    """
+    Labels of the archived semesters, newest first.
+    """
+    return list(
+        ArchivedAttendanceSummary.objects.order_by("-semester").values_list("semester", flat=True).distinct()
+    )
+
+
+# =========================================================
+# ARCHIVAL (batched, one transaction per chunk)
+# =========================================================
+def archive_closed_semesters(today=None, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Move every session dated before the current semester, with its
+    records, into the archive tables `chunk_size` sessions at a time,
+    then rebuild the live counters from what is left.
+
+    Each chunk commits on its own, so an interrupted run loses nothing
+    and the next run carries on. Returns {semester: sessions archived}.
+    """
+    today = today or timezone.localdate()
+    _, cutoff, _ = semester_for(today)
+
+    archived = {}
+    pending = AttendanceSession.objects.filter(date__lt=cutoff).order_by("id")
+    while True:
+        session_ids = list(pending.values_list("id", flat=True)[:chunk_size])
+        if not session_ids:
+            break
+        for semester, count in _archive_chunk(session_ids).items():
+            archived[semester] = archived.get(semester, 0) + count
+
+    if archived:
+        # The live tables now hold the current semester only.
+        rebuild_attendance_summary()
+        rebuild_slot_summary()
+    return archived
+
+
+@transaction.atomic
+def _archive_chunk(session_ids):
+    sessions = list(AttendanceSession.objects.filter(id__in=session_ids).values(*SESSION_FIELDS))
+    semesters = {row["id"]: semester_for(row["date"])[0] for row in sessions}
+    ArchivedAttendanceSession.objects.bulk_create(
+        [ArchivedAttendanceSession(semester=semesters[row["id"]], **row) for row in sessions],
+        batch_size=1000,
+    )
+
+    records = list(AttendanceRecord.objects.filter(session_id__in=session_ids).values(*RECORD_FIELDS))
+    ArchivedAttendanceRecord.objects.bulk_create(
+        [ArchivedAttendanceRecord(**row) for row in records],
+        batch_size=1000,
+    )
+
+    subjects = {row["id"]: row["subject_id"] for row in sessions}
+    counts = {}
+    for row in records:
+        key = (semesters[row["session_id"]], row["student_id"], subjects[row["session_id"]])
+        present, total = counts.get(key, (0, 0))
+        counts[key] = (present + (row["status"] == "PRESENT"), total + 1)
+    _add_to_archived_summaries(counts)
+
+    AttendanceRecord.objects.filter(session_id__in=session_ids).delete()
+    AttendanceSession.objects.filter(id__in=session_ids).delete()
+
+    per_semester = {}
+    for semester in semesters.values():
+        per_semester[semester] = per_semester.get(semester, 0) + 1
+    return per_semester
+
+
+def _add_to_archived_summaries(counts):
+    """
+    Add {(semester, student_id, subject_id): (present, total)} to the
+    archived summaries. A semester can span several chunks.
+    """
+    if not counts:
+        return
+    existing = {
+        (summary.semester, summary.student_id, summary.subject_id): summary
+        for summary in ArchivedAttendanceSummary.objects.filter(
+            semester__in={key[0] for key in counts},
+            student_id__in={key[1] for key in counts},
+            subject_id__in={key[2] for key in counts},
+        )
+    }
+
+    changed, created = [], []
+    for key, (present, total) in counts.items():
+        summary = existing.get(key)
+        if summary is None:
+            semester, student_id, subject_id = key
+            created.append(
+                ArchivedAttendanceSummary(
+                    semester=semester,
+                    student_id=student_id,
+                    subject_id=subject_id,
+                    present_count=present,
+                    total_count=total,
+                )
+            )
+            continue
+        summary.present_count += present
+        summary.total_count += total
+        changed.append(summary)
+
+    ArchivedAttendanceSummary.objects.bulk_create(created, batch_size=1000)
+    ArchivedAttendanceSummary.objects.bulk_update(changed, ["present_count", "total_count"], batch_size=1000)
+
+
+# =========================================================
+# READS
+# =========================================================
+def get_archived_low_attendance_standings(semester):
+    """
+    get_low_attendance_standings() for one archived semester.
+    """
+    return get_low_attendance_standings(ArchivedAttendanceSummary.objects.filter(semester=semester))
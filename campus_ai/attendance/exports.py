@@ -0,0 +1,118 @@
+import csv
+from datetime import date
+from itertools import chain
+
+from .models import ArchivedAttendanceRecord, AttendanceRecord
+
+
+EXPORT_HEADER = [
+    "date",
+    "start_time",
+    "end_time",
+    "subject_code",
+    "subject_name",
+    "section",
+    "faculty_id",
+    "student_id",
+    "student_name",
+    "roll_no",
+    "status",
+    "confidence_score",
+    "method",
+]
+
+
+class Echo:
+    """
+    File-like object whose write() hands the line straight back,
+    so csv.writer can feed a generator without buffering.
+    """
+
+    def write(self, value):
+        return value
+
+
+def parse_export_filters(params):
+    """
+    Normalise export filters from a QueryDict / dict.
+    Raises ValueError on malformed dates or ids.
+    """
+    filters = {}
+    for key in ("date_from", "date_to"):
+        value = (params.get(key) or "").strip()
+        if value:
+            filters[key] = date.fromisoformat(value)
+    for key in ("section", "subject"):
+        value = (params.get(key) or "").strip()
+        if value:
+            filters[key] = int(value)
+    faculty = (params.get("faculty") or "").strip()
+    if faculty:
+        filters["faculty"] = faculty
+    if params.get("archive") in (True, "1", "true", "on"):
+        filters["include_archive"] = True
+    return filters
+
+
+def export_queryset(date_from=None, date_to=None, section=None, subject=None, faculty=None, archive=False):
+    records = (ArchivedAttendanceRecord if archive else AttendanceRecord).objects.all()
+    if date_from:
+        records = records.filter(session__date__gte=date_from)
+    if date_to:
+        records = records.filter(session__date__lte=date_to)
+    if section:
+        records = records.filter(session__section_id=section)
+    if subject:
+        records = records.filter(session__subject_id=subject)
+    if faculty:
+        records = records.filter(session__marked_by_id=faculty)
+
+    return (
+        records.select_related("session__subject", "session__section__course")
+        .prefetch_related("student__studentprofile")
+        .order_by("session__date", "session__start_time", "session_id", "student_id")
+    )
+
+
+def export_querysets(include_archive=False, **filters):
+    """
+    The record querysets to export, oldest first: archived semesters
+    (only when asked for) then the live tables.
+    """
+    querysets = [export_queryset(**filters)]
+    if include_archive:
+        querysets.insert(0, export_queryset(archive=True, **filters))
+    return querysets
+
+
+def export_rows(*querysets, chunk_size=2000):
+    """
+    Yield the header then one list per record of each queryset in turn,
+    fetching `chunk_size` records (and their student profiles) at a time.
+    """
+    yield EXPORT_HEADER
+    records = chain.from_iterable(queryset.iterator(chunk_size=chunk_size) for queryset in querysets)
+    for record in records:
+        session = record.session
+        profile = getattr(record.student, "studentprofile", None)
+        yield [
+            session.date.isoformat(),
+            session.start_time.strftime("%H:%M"),
+            session.end_time.strftime("%H:%M"),
+            session.subject.subject_code,
+            session.subject.subject_name,
+            str(session.section),
+            session.marked_by_id or "",
+            record.student_id,
+            profile.name if profile else "",
+            profile.roll_no if profile else "",
+            record.status,
+            "" if record.confidence_score is None else record.confidence_score,
+            session.method,
+        ]
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
@@ -0,0 +1,74 @@
+from django.db.models import ExpressionWrapper, F, FloatField, Sum
+
+from .models import AttendanceSlotSummary
+
+
+DAY_ORDER = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
+
+
+def _cell(present, total):
+    percentage = round(present * 100 / total, 1) if total else None
+    return {
+        "present": present,
+        "total": total,
+        "percentage": percentage,
+        # 0 (red) .. 120 (green) for the heatmap background
+        "hue": round(percentage * 1.2) if percentage is not None else None,
+    }
+
+
+def slot_heatmap(section_id=None, faculty_id=None):
+    """
+    Weekday x start time turnout grid from the slot counters, for all
+    classes or one section / faculty. One query regardless of history.
+
+    Returns {"times": [...], "rows": [{"day": "MON", "cells": [...]}, ...]}
+    where a cell is None when nothing was held in that slot.
+    """
+    slots = AttendanceSlotSummary.objects.all()
+    if section_id:
+        slots = slots.filter(section_id=section_id)
+    if faculty_id:
+        slots = slots.filter(faculty_id=faculty_id)
+
+    cells = {
+        (row["day_of_week"], row["start_time"]): _cell(row["present"], row["total"])
+        for row in (
+            slots.values("day_of_week", "start_time")
+            .annotate(present=Sum("present_count"), total=Sum("total_count"))
+            .order_by()
+        )
+    }
+
+    times = sorted({start_time for _, start_time in cells})
+    days = [day for day in DAY_ORDER if any((day, start_time) in cells for start_time in times)]
+    return {
+        "times": times,
+        "rows": [
+            {"day": day, "cells": [cells.get((day, start_time)) for start_time in times]}
+            for day in days
+        ],
+    }
+
+
+def worst_slots(group_by="section", limit=10, min_total=1):
+    """
+    Lowest-turnout (section | faculty, weekday, start time) slots.
+    """
+    label_fields = {
+        "section": ("section_id", "section__name", "section__year", "section__course__course_name"),
+        "faculty": ("faculty_id", "faculty__facultyprofile__name"),
+    }[group_by]
+
+    return list(
+        AttendanceSlotSummary.objects.values(*label_fields, "day_of_week", "start_time")
+        .annotate(present=Sum("present_count"), total=Sum("total_count"))
+        .filter(total__gte=min_total)
+        .annotate(
+            percentage=ExpressionWrapper(
+                F("present") * 100.0 / F("total"),
+                output_field=FloatField(),
+            )
+        )
+        .order_by("percentage", "-total")[:limit]
+    )
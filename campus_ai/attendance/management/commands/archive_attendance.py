@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from attendance.archive import ARCHIVE_CHUNK_SIZE, archive_closed_semesters, semester_for
+
+
+class Command(BaseCommand):
+    help = (
+        "Move attendance sessions and records of closed semesters into the archive tables "
+        "and keep per-student summaries for them (run at the start of each semester)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=ARCHIVE_CHUNK_SIZE,
+            help=f"Sessions moved per transaction (default: {ARCHIVE_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive.")
+
+        current, _, _ = semester_for(timezone.localdate())
+        archived = archive_closed_semesters(chunk_size=options["chunk_size"])
+        if not archived:
+            self.stdout.write(f"Nothing to archive before {current}.")
+            return
+        for semester, sessions in sorted(archived.items()):
+            self.stdout.write(f"{semester}: {sessions} sessions archived.")
+        self.stdout.write(self.style.SUCCESS(f"Live attendance now holds {current} only."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from attendance.snapshots import build_snapshots
+
+
+class Command(BaseCommand):
+    help = "Write bit-packed student x session attendance matrices (.npz) per section & subject."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--section", type=int, help="Only build snapshots for this section id.")
+        parser.add_argument("--subject", type=int, help="Only build snapshots for this subject id.")
+        parser.add_argument("--output-dir", help="Directory for .npz files (default: MEDIA_ROOT/attendance_snapshots).")
+
+    def handle(self, *args, **options):
+        written = build_snapshots(
+            section_id=options["section"],
+            subject_id=options["subject"],
+            directory=options["output_dir"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(written)} attendance snapshots."))
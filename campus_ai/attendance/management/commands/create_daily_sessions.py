@@ -0,0 +1,22 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from attendance.services import create_pending_sessions
+
+
+class Command(BaseCommand):
+    help = "Pre-create pending attendance sessions for every ClassSchedule entry of a day (run at day start)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Day to prepare (YYYY-MM-DD, default: today).")
+
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options["date"]) if options["date"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+
+        created = create_pending_sessions(day)
+        self.stdout.write(self.style.SUCCESS(f"Created {created} pending attendance sessions for {day}."))
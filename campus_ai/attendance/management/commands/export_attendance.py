@@ -0,0 +1,41 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.exports import export_querysets, export_rows, parse_export_filters
+
+
+class Command(BaseCommand):
+    help = "Stream attendance records to CSV, filtered by date range, section, subject and faculty."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", help="First session date (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="date_to", help="Last session date (YYYY-MM-DD).")
+        parser.add_argument("--section", help="Section id.")
+        parser.add_argument("--subject", help="Subject id.")
+        parser.add_argument("--faculty", help="User id of the faculty who marked the session.")
+        parser.add_argument("--archive", action="store_true", help="Include archived semesters.")
+        parser.add_argument("--output", help="CSV file path (default: stdout).")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            filters = parse_export_filters(options)
+        except ValueError as exc:
+            raise CommandError(f"Invalid export filters: {exc}")
+
+        rows = export_rows(*export_querysets(**filters), chunk_size=options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as handle:
+                written = self._write(handle, rows)
+            self.stderr.write(self.style.SUCCESS(f"Exported {written} records to {options['output']}."))
+        else:
+            self._write(self.stdout, rows)
+
+    def _write(self, handle, rows):
+        writer = csv.writer(handle)
+        written = -1
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+        return written
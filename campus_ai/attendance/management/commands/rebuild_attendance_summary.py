@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from attendance.services import rebuild_attendance_summary, rebuild_slot_summary
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-student/subject and per-slot attendance counters from attendance records."
+
+    def handle(self, *args, **options):
+        rows_written = rebuild_attendance_summary()
+        slot_rows_written = rebuild_slot_summary()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Attendance summary rebuilt ({rows_written} rows, {slot_rows_written} slot rows)."
+            )
+        )
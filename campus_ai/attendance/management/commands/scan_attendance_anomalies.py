@@ -0,0 +1,51 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.anomalies import LOW_CONFIDENCE_SCORE, find_overlapping_presence, find_overridden_face_matches
+
+
+class Command(BaseCommand):
+    help = "Flag students marked present in overlapping sessions and weak face matches that were overridden."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", help="First session date (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="date_to", help="Last session date (YYYY-MM-DD).")
+        parser.add_argument(
+            "--max-confidence",
+            type=float,
+            default=LOW_CONFIDENCE_SCORE,
+            help=f"Overridden face matches below this score are flagged (default: {LOW_CONFIDENCE_SCORE}).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            date_from = date.fromisoformat(options["date_from"]) if options["date_from"] else None
+            date_to = date.fromisoformat(options["date_to"]) if options["date_to"] else None
+        except ValueError:
+            raise CommandError("--from and --to must be YYYY-MM-DD.")
+
+        overlaps = 0
+        for anomaly in find_overlapping_presence(date_from, date_to):
+            overlaps += 1
+            first, second = anomaly["first"], anomaly["second"]
+            self.stdout.write(
+                f"OVERLAP {anomaly['student_id']} {anomaly['date']}: "
+                f"{first['subject_code']} section {first['section_id']} "
+                f"{first['start_time']:%H:%M}-{first['end_time']:%H:%M} ({first['method']}, {first['marked_by']}) / "
+                f"{second['subject_code']} section {second['section_id']} "
+                f"{second['start_time']:%H:%M}-{second['end_time']:%H:%M} ({second['method']}, {second['marked_by']})"
+            )
+
+        overrides = 0
+        for anomaly in find_overridden_face_matches(date_from, date_to, options["max_confidence"]):
+            overrides += 1
+            self.stdout.write(
+                f"OVERRIDDEN {anomaly['student_id']} {anomaly['date']}: "
+                f"{anomaly['subject_code']} section {anomaly['section_id']} {anomaly['start_time']:%H:%M} "
+                f"confidence {anomaly['confidence_score']:.2f}, marked by {anomaly['marked_by']}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Found {overlaps} overlapping presences and {overrides} overridden face matches.")
+        )
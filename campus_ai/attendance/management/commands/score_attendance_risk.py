@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.risk import score_students
+
+
+class Command(BaseCommand):
+    help = "Retrain the attendance risk model and score every student (run nightly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--no-train", action="store_true", help="Reuse the saved model instead of retraining.")
+        parser.add_argument("--model-dir", help="Directory for the saved model (default: MEDIA_ROOT/attendance_snapshots).")
+
+    def handle(self, *args, **options):
+        try:
+            scored, trained = score_students(train=not options["no_train"], directory=options["model_dir"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        model_note = "retrained model" if trained else "saved model"
+        self.stdout.write(self.style.SUCCESS(f"Scored {scored} students with the {model_note}."))
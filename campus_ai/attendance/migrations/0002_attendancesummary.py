@@ -0,0 +1,56 @@
+# Generated by Django 6.0.1 on 2026-10-19 02:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_summaries(apps, schema_editor):
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    AttendanceSummary = apps.get_model('attendance', 'AttendanceSummary')
+
+    rows = (
+        AttendanceRecord.objects.values('student_id', 'session__subject_id')
+        .annotate(total=Count('id'), present=Count('id', filter=Q(status='PRESENT')))
+        .order_by()
+    )
+    AttendanceSummary.objects.bulk_create(
+        [
+            AttendanceSummary(
+                student_id=row['student_id'],
+                subject_id=row['session__subject_id'],
+                present_count=row['present'],
+                total_count=row['total'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_classschedule'),
+        ('accounts', '0001_initial'),
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'STUDENT'}, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='accounts.user')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='academics.subject')),
+            ],
+            options={
+                'verbose_name': 'Attendance Summary',
+                'verbose_name_plural': 'Attendance Summaries',
+                'unique_together': {('student', 'subject')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
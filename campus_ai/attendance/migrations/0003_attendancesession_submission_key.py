@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 02:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_attendancesummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancesession',
+            name='submission_key',
+            field=models.CharField(blank=True, help_text='Idempotency key of the submission that confirmed this session', max_length=64, null=True, unique=True),
+        ),
+    ]
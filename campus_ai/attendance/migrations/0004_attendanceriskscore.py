@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-19 02:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('attendance', '0003_attendancesession_submission_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceRiskScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Probability (0–1) of falling below the attendance minimum')),
+                ('attendance_percentage', models.FloatField(default=0)),
+                ('recent_trend', models.FloatField(default=0, help_text='Last four weeks minus earlier attendance, in percentage points')),
+                ('longest_absence_streak', models.PositiveIntegerField(default=0)),
+                ('current_absence_streak', models.PositiveIntegerField(default=0)),
+                ('lowest_subject_percentage', models.FloatField(default=0)),
+                ('remedial_attendance_percentage', models.FloatField(default=0)),
+                ('computed_at', models.DateTimeField()),
+                ('student', models.OneToOneField(limit_choices_to={'role': 'STUDENT'}, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_risk', to='accounts.user')),
+            ],
+            options={
+                'verbose_name': 'Attendance Risk Score',
+                'verbose_name_plural': 'Attendance Risk Scores',
+            },
+        ),
+    ]
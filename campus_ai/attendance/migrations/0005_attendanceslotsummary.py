@@ -0,0 +1,69 @@
+# Generated by Django 6.0.1 on 2026-10-19 02:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractWeekDay
+
+
+WEEK_DAY_CODES = {1: 'SUN', 2: 'MON', 3: 'TUE', 4: 'WED', 5: 'THU', 6: 'FRI', 7: 'SAT'}
+
+
+def backfill_slot_summaries(apps, schema_editor):
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    AttendanceSlotSummary = apps.get_model('attendance', 'AttendanceSlotSummary')
+
+    rows = (
+        AttendanceRecord.objects.filter(session__confirmed=True)
+        .values('session__section_id', 'session__marked_by_id', 'session__start_time')
+        .annotate(
+            week_day=ExtractWeekDay('session__date'),
+            total=Count('id'),
+            present=Count('id', filter=Q(status='PRESENT')),
+        )
+        .order_by()
+    )
+    AttendanceSlotSummary.objects.bulk_create(
+        [
+            AttendanceSlotSummary(
+                section_id=row['session__section_id'],
+                faculty_id=row['session__marked_by_id'],
+                day_of_week=WEEK_DAY_CODES[row['week_day']],
+                start_time=row['session__start_time'],
+                present_count=row['present'],
+                total_count=row['total'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_classschedule'),
+        ('accounts', '0001_initial'),
+        ('attendance', '0004_attendanceriskscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSlotSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day_of_week', models.CharField(max_length=3)),
+                ('start_time', models.TimeField()),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('faculty', models.ForeignKey(limit_choices_to={'role': 'FACULTY'}, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_slot_summaries', to='accounts.user')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_slot_summaries', to='academics.section')),
+            ],
+            options={
+                'verbose_name': 'Attendance Slot Summary',
+                'verbose_name_plural': 'Attendance Slot Summaries',
+                'unique_together': {('section', 'faculty', 'day_of_week', 'start_time')},
+            },
+        ),
+        migrations.RunPython(backfill_slot_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_attendanceslotsummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendancesession',
+            index=models.Index(fields=['date', 'confirmed'], name='session_date_confirmed_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 6.0.1 on 2026-10-19 03:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0006_classschedule_schedule_faculty_day_idx_and_more'),
+        ('accounts', '0001_initial'),
+        ('attendance', '0006_attendancesession_session_date_confirmed_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAttendanceSession',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('semester', models.CharField(db_index=True, max_length=8)),
+                ('date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('method', models.CharField(choices=[('MANUAL', 'Manual'), ('FACE', 'Face Recognition')], max_length=10)),
+                ('confirmed', models.BooleanField(default=False)),
+                ('marked_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.user')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.section')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.subject')),
+            ],
+            options={
+                'verbose_name': 'Archived Attendance Session',
+                'verbose_name_plural': 'Archived Attendance Sessions',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttendanceRecord',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('PRESENT', 'Present'), ('ABSENT', 'Absent')], max_length=10)),
+                ('confidence_score', models.FloatField(blank=True, null=True)),
+                ('verified_by_faculty', models.BooleanField(default=False)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.user')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='records', to='attendance.archivedattendancesession')),
+            ],
+            options={
+                'verbose_name': 'Archived Attendance Record',
+                'verbose_name_plural': 'Archived Attendance Records',
+                'unique_together': {('session', 'student')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(max_length=8)),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendance_summaries', to='accounts.user')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendance_summaries', to='academics.subject')),
+            ],
+            options={
+                'verbose_name': 'Archived Attendance Summary',
+                'verbose_name_plural': 'Archived Attendance Summaries',
+                'unique_together': {('semester', 'student', 'subject')},
+            },
+        ),
+    ]
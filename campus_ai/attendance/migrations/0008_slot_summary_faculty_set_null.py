@@ -0,0 +1,59 @@
+# Generated by Django 6.0.1 on 2026-10-19 03:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractWeekDay
+
+
+WEEK_DAY_CODES = {1: 'SUN', 2: 'MON', 3: 'TUE', 4: 'WED', 5: 'THU', 6: 'FRI', 7: 'SAT'}
+
+
+def rebuild_unassigned_slots(apps, schema_editor):
+    # Sessions without marked_by each added a NULL-faculty row that every
+    # later update incremented; recount that bucket from the records.
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    AttendanceSlotSummary = apps.get_model('attendance', 'AttendanceSlotSummary')
+
+    AttendanceSlotSummary.objects.filter(faculty__isnull=True).delete()
+    rows = (
+        AttendanceRecord.objects.filter(session__confirmed=True, session__marked_by__isnull=True)
+        .values('session__section_id', 'session__start_time')
+        .annotate(
+            week_day=ExtractWeekDay('session__date'),
+            total=Count('id'),
+            present=Count('id', filter=Q(status='PRESENT')),
+        )
+        .order_by()
+    )
+    AttendanceSlotSummary.objects.bulk_create(
+        [
+            AttendanceSlotSummary(
+                section_id=row['session__section_id'],
+                faculty_id=None,
+                day_of_week=WEEK_DAY_CODES[row['week_day']],
+                start_time=row['session__start_time'],
+                present_count=row['present'],
+                total_count=row['total'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('attendance', '0007_attendance_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attendanceslotsummary',
+            name='faculty',
+            field=models.ForeignKey(limit_choices_to={'role': 'FACULTY'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendance_slot_summaries', to='accounts.user'),
+        ),
+        migrations.RunPython(rebuild_unassigned_slots, migrations.RunPython.noop),
+    ]
@@ -42,8 +42,22 @@ class AttendanceSession(models.Model):
         default=False,
         help_text="Final confirmation by faculty"
     )
+
+    submission_key = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        unique=True,
+        help_text="Idempotency key of the submission that confirmed this session"
+    )
+
     class Meta:
         unique_together = ('subject', 'date', 'section')
+        indexes = [
+            # A day's confirmed sessions (sessions-today KPI).
+            models.Index(fields=['date', 'confirmed'], name='session_date_confirmed_idx'),
+        ]
+
     def __str__(self):
         return f"{self.subject.subject_code} | {self.date} | Section {self.section}"
 
@@ -93,7 +107,208 @@ class AttendanceRecord(models.Model):
 
     def __str__(self):
         return (
-            f"{self.student.user_id} | "
+            f"{self.student_id} | "
             f"{self.session.subject.subject_code} | "
             f"{self.status}"
         )
+
+
+class AttendanceSummary(models.Model):
+    """
+    Running attendance counters per student & subject.
+    Kept in step with AttendanceRecord writes so dashboards never
+    have to aggregate the full record history.
+    """
+
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        limit_choices_to={'role': 'STUDENT'},
+        related_name='attendance_summaries'
+    )
+
+    subject = models.ForeignKey(
+        Subject,
+        on_delete=models.CASCADE,
+        related_name='attendance_summaries'
+    )
+
+    present_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('student', 'subject')
+        verbose_name = "Attendance Summary"
+        verbose_name_plural = "Attendance Summaries"
+
+    def __str__(self):
+        return (
+            f"{self.student_id} | "
+            f"{self.subject_id} | "
+            f"{self.present_count}/{self.total_count}"
+        )
+
+
+class AttendanceRiskScore(models.Model):
+    """
+    Predicted probability that a student ends up below the attendance
+    minimum, with the features behind it. Rewritten nightly in one pass
+    by the score_attendance_risk command.
+    """
+
+    student = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        limit_choices_to={'role': 'STUDENT'},
+        related_name='attendance_risk'
+    )
+
+    score = models.FloatField(help_text="Probability (0–1) of falling below the attendance minimum")
+
+    attendance_percentage = models.FloatField(default=0)
+    recent_trend = models.FloatField(
+        default=0,
+        help_text="Last four weeks minus earlier attendance, in percentage points"
+    )
+    longest_absence_streak = models.PositiveIntegerField(default=0)
+    current_absence_streak = models.PositiveIntegerField(default=0)
+    lowest_subject_percentage = models.FloatField(default=0)
+    remedial_attendance_percentage = models.FloatField(default=0)
+
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Attendance Risk Score"
+        verbose_name_plural = "Attendance Risk Scores"
+
+    def __str__(self):
+        return f"{self.student_id} | {self.score:.2f}"
+
+
+class AttendanceSlotSummary(models.Model):
+    """
+    Running present/total counters per section, faculty and weekly
+    slot (weekday + start time). Feeds the turnout heatmaps without
+    scanning AttendanceRecord.
+    """
+
+    section = models.ForeignKey(
+        'academics.Section',
+        on_delete=models.CASCADE,
+        related_name='attendance_slot_summaries'
+    )
+
+    # Follows AttendanceSession.marked_by: sessions of a deleted faculty
+    # keep their counts in the unassigned (NULL) bucket.
+    faculty = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        limit_choices_to={'role': 'FACULTY'},
+        related_name='attendance_slot_summaries'
+    )
+
+    day_of_week = models.CharField(max_length=3)
+    start_time = models.TimeField()
+
+    present_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('section', 'faculty', 'day_of_week', 'start_time')
+        verbose_name = "Attendance Slot Summary"
+        verbose_name_plural = "Attendance Slot Summaries"
+
+    def __str__(self):
+        return (
+            f"{self.section_id} | "
+            f"{self.day_of_week} {self.start_time} | "
+            f"{self.present_count}/{self.total_count}"
+        )
+
+
+# =========================================================
+# ARCHIVE (closed semesters, see attendance.archive)
+# =========================================================
+class ArchivedAttendanceSession(models.Model):
+    """
+    An AttendanceSession of a closed semester, moved out of the live
+    table with its original id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    semester = models.CharField(max_length=8, db_index=True)
+
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='+')
+    section = models.ForeignKey('academics.Section', on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    marked_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    method = models.CharField(max_length=10, choices=AttendanceSession.METHOD_CHOICES)
+    confirmed = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = "Archived Attendance Session"
+        verbose_name_plural = "Archived Attendance Sessions"
+
+    def __str__(self):
+        return f"{self.semester} | {self.subject_id} | {self.date}"
+
+
+class ArchivedAttendanceRecord(models.Model):
+    """
+    An AttendanceRecord of a closed semester, with its original id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    session = models.ForeignKey(
+        ArchivedAttendanceSession,
+        on_delete=models.CASCADE,
+        related_name='records'
+    )
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    status = models.CharField(max_length=10, choices=AttendanceRecord.STATUS_CHOICES)
+    confidence_score = models.FloatField(null=True, blank=True)
+    verified_by_faculty = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('session', 'student')
+        verbose_name = "Archived Attendance Record"
+        verbose_name_plural = "Archived Attendance Records"
+
+    def __str__(self):
+        return f"{self.student_id} | {self.session_id} | {self.status}"
+
+
+class ArchivedAttendanceSummary(models.Model):
+    """
+    Final present/total counts per student & subject for one closed
+    semester; what stays queryable without reading archived records.
+    """
+
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_attendance_summaries'
+    )
+    subject = models.ForeignKey(
+        Subject,
+        on_delete=models.CASCADE,
+        related_name='archived_attendance_summaries'
+    )
+    semester = models.CharField(max_length=8)
+
+    present_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('semester', 'student', 'subject')
+        verbose_name = "Archived Attendance Summary"
+        verbose_name_plural = "Archived Attendance Summaries"
+
+    def __str__(self):
+        return (
+            f"{self.semester} | {self.student_id} | "
+            f"{self.subject_id} | {self.present_count}/{self.total_count}"
+        )
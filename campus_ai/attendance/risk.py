@@ -0,0 +1,386 @@
+import os
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import StudentProfile
+from academics.models import Subject
+from planner.models import RemedialAttendance, RemedialSession
+from .models import AttendanceRecord, AttendanceRiskScore
+from .signals import notify_attendance_changed
+from .snapshots import snapshot_dir
+
+
+FEATURE_NAMES = (
+    "attendance_rate",
+    "recent_trend",
+    "longest_absence_streak",
+    "current_absence_streak",
+    "lowest_subject_rate",
+    "remedial_attendance_rate",
+)
+
+RECENT_WINDOW_DAYS = 28
+AT_RISK_SCORE = 0.5
+
+
+def model_path(directory=None):
+    return os.path.join(directory or snapshot_dir(), "attendance_risk_model.npz")
+
+
+# =========================================================
+# HISTORY (one streamed query per table)
+# =========================================================
+class AttendanceHistory:
+    """
+    Column arrays of every confirmed record, sorted by student then time,
+    plus remedial offers and attendance. Students are integer codes into
+    `student_ids`; `thresholds` holds each record's subject minimum.
+    """
+
+    def __init__(
+        self,
+        student_ids,
+        students,
+        subjects,
+        days,
+        present,
+        student_sections,
+        remedial_sections,
+        remedial_days,
+        remedial_students,
+        remedial_attended_days,
+        thresholds=None,
+    ):
+        self.student_ids = np.asarray(student_ids, dtype=str)
+        self.students = np.asarray(students, dtype=np.int64)
+        self.subjects = np.asarray(subjects, dtype=np.int64)
+        self.days = np.asarray(days, dtype="datetime64[D]")
+        self.present = np.asarray(present, dtype=bool)
+        self.student_sections = np.asarray(student_sections, dtype=np.int64)
+        self.remedial_sections = np.asarray(remedial_sections, dtype=np.int64)
+        self.remedial_days = np.asarray(remedial_days, dtype="datetime64[D]")
+        self.remedial_students = np.asarray(remedial_students, dtype=np.int64)
+        self.remedial_attended_days = np.asarray(remedial_attended_days, dtype="datetime64[D]")
+        if thresholds is None:
+            thresholds = np.full(len(self.students), Subject._meta.get_field("min_attendance_percentage").default)
+        self.thresholds = np.asarray(thresholds, dtype=float)
+
+    @property
+    def end(self):
+        """
+        Day after the latest record (or today when there is no history).
+        """
+        if not len(self.days):
+            return np.datetime64(timezone.localdate(), "D")
+        return self.days.max() + np.timedelta64(1, "D")
+
+    @classmethod
+    def load(cls, chunk_size=5000):
+        profiles = list(StudentProfile.objects.order_by("user_id").values_list("user_id", "section_id"))
+        student_ids = [user_id for user_id, _ in profiles]
+        student_codes = {user_id: code for code, user_id in enumerate(student_ids)}
+
+        def code_for(student_id):
+            code = student_codes.get(student_id)
+            if code is None:
+                # Record for a student without a profile; still score them.
+                code = student_codes[student_id] = len(student_ids)
+                student_ids.append(student_id)
+                profiles.append((student_id, None))
+            return code
+
+        students, subjects, days, present, thresholds = [], [], [], [], []
+        for student_id, subject_id, day, status, threshold in (
+            AttendanceRecord.objects.filter(session__confirmed=True)
+            .order_by("student_id", "session__date", "session__start_time")
+            .values_list(
+                "student_id",
+                "session__subject_id",
+                "session__date",
+                "status",
+                "session__subject__min_attendance_percentage",
+            )
+            .iterator(chunk_size=chunk_size)
+        ):
+            students.append(code_for(student_id))
+            subjects.append(subject_id)
+            days.append(day)
+            present.append(status == "PRESENT")
+            thresholds.append(threshold)
+
+        remedial_sections, remedial_days = [], []
+        for section_id, day in RemedialSession.objects.values_list("section_id", "scheduled_date"):
+            remedial_sections.append(section_id)
+            remedial_days.append(day)
+
+        remedial_students, remedial_attended_days = [], []
+        for student_id, day in RemedialAttendance.objects.values_list("student_id", "session__scheduled_date"):
+            if student_id in student_codes:
+                remedial_students.append(student_codes[student_id])
+                remedial_attended_days.append(day)
+
+        return cls(
+            student_ids=student_ids,
+            students=students,
+            subjects=subjects,
+            days=days,
+            present=present,
+            student_sections=[section_id or -1 for _, section_id in profiles],
+            remedial_sections=remedial_sections,
+            remedial_days=remedial_days,
+            remedial_students=remedial_students,
+            remedial_attended_days=remedial_attended_days,
+            thresholds=thresholds,
+        )
+
+
+# =========================================================
+# VECTORIZED FEATURES
+# =========================================================
+def _rates(students, present, n_students, default):
+    total = np.bincount(students, minlength=n_students)
+    attended = np.bincount(students, weights=present, minlength=n_students)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, attended / total, default), total
+
+
+def _absence_streaks(students, present, n_students):
+    """
+    (longest, current) run of consecutive absences per student.
+    Rows must be sorted by student, then time.
+    """
+    longest = np.zeros(n_students, dtype=np.int64)
+    current = np.zeros(n_students, dtype=np.int64)
+    if not len(students):
+        return longest, current
+
+    absent = ~present
+    new_student = np.r_[True, students[1:] != students[:-1]]
+    run_start = absent & (new_student | np.r_[True, present[:-1]])
+    run_id = np.cumsum(run_start) - 1
+    lengths = np.bincount(run_id[absent])
+    np.maximum.at(longest, students[run_start], lengths)
+
+    last = np.r_[students[1:] != students[:-1], True]
+    trailing = last & absent
+    current[students[trailing]] = lengths[run_id[trailing]]
+    return longest, current
+
+
+def _subject_rates(students, subjects, present):
+    """
+    (pairs, pair_index, pair_rate): the distinct (student, subject) rows,
+    each record's row and each row's attendance rate.
+    """
+    pairs, pair_index = np.unique(np.stack([students, subjects], axis=1), axis=0, return_inverse=True)
+    pair_index = pair_index.ravel()
+    pair_rate = np.bincount(pair_index, weights=present) / np.bincount(pair_index)
+    return pairs, pair_index, pair_rate
+
+
+def build_features(history, cutoff=None, recent_days=RECENT_WINDOW_DAYS):
+    """
+    Feature matrix (students x FEATURE_NAMES) from records before `cutoff`
+    (default: all history). Rates are 0–1, streaks are session counts.
+    """
+    end = history.end if cutoff is None else np.datetime64(cutoff, "D")
+    n_students = len(history.student_ids)
+
+    mask = history.days < end
+    students = history.students[mask]
+    subjects = history.subjects[mask]
+    days = history.days[mask]
+    present = history.present[mask]
+
+    rate, _ = _rates(students, present, n_students, 1.0)
+
+    recent = days >= end - np.timedelta64(recent_days, "D")
+    recent_rate, recent_total = _rates(students[recent], present[recent], n_students, np.nan)
+    earlier_rate, earlier_total = _rates(students[~recent], present[~recent], n_students, np.nan)
+    trend = np.where((recent_total > 0) & (earlier_total > 0), recent_rate - earlier_rate, 0.0)
+
+    longest, current = _absence_streaks(students, present, n_students)
+
+    lowest_subject = np.ones(n_students)
+    if len(students):
+        pairs, _, pair_rate = _subject_rates(students, subjects, present)
+        np.minimum.at(lowest_subject, pairs[:, 0], pair_rate)
+
+    offered_mask = history.remedial_days < end
+    sections, offered_counts = np.unique(history.remedial_sections[offered_mask], return_counts=True)
+    offered = np.zeros(n_students, dtype=np.int64)
+    if len(sections):
+        position = np.clip(np.searchsorted(sections, history.student_sections), 0, len(sections) - 1)
+        matched = sections[position] == history.student_sections
+        offered[matched] = offered_counts[position[matched]]
+    attended = np.bincount(
+        history.remedial_students[history.remedial_attended_days < end],
+        minlength=n_students,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        remedial_rate = np.where(offered > 0, np.minimum(attended / offered, 1.0), 1.0)
+
+    return np.column_stack([rate, trend, longest, current, lowest_subject, remedial_rate]).astype(float)
+
+
+def build_labels(history, cutoff):
+    """
+    (labels, has_label): whether, from `cutoff` onwards, each student fell
+    below the minimum of any subject, the same test the standings and the
+    low-attendance count apply.
+    """
+    n_students = len(history.student_ids)
+    mask = history.days >= np.datetime64(cutoff, "D")
+    students = history.students[mask]
+
+    labels = np.zeros(n_students)
+    if len(students):
+        pairs, pair_index, pair_rate = _subject_rates(students, history.subjects[mask], history.present[mask])
+        pair_threshold = np.zeros(len(pairs))
+        pair_threshold[pair_index] = history.thresholds[mask]
+        np.maximum.at(labels, pairs[:, 0], (pair_rate * 100 < pair_threshold).astype(float))
+    return labels, np.bincount(students, minlength=n_students) > 0
+
+
+# =========================================================
+# LOGISTIC REGRESSION
+# =========================================================
+class LogisticRiskModel:
+    """
+    Plain NumPy logistic regression over standardised features.
+    """
+
+    def __init__(self, weights, bias, mean, scale):
+        self.weights = np.asarray(weights, dtype=float)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+
+    @classmethod
+    def fit(cls, features, labels, epochs=500, learning_rate=0.5, l2=1e-3):
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        x = (features - mean) / scale
+
+        weights = np.zeros(x.shape[1])
+        bias = 0.0
+        n = len(labels)
+        for _ in range(epochs):
+            error = _sigmoid(x @ weights + bias) - labels
+            weights -= learning_rate * (x.T @ error / n + l2 * weights)
+            bias -= learning_rate * error.mean()
+        return cls(weights, bias, mean, scale)
+
+    def predict_proba(self, features):
+        return _sigmoid(((features - self.mean) / self.scale) @ self.weights + self.bias)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            mean=self.mean,
+            scale=self.scale,
+            feature_names=np.array(FEATURE_NAMES),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if tuple(data["feature_names"]) != FEATURE_NAMES:
+                raise ValueError("Saved risk model was trained on different features.")
+            return cls(data["weights"], data["bias"], data["mean"], data["scale"])
+
+
+def _sigmoid(values):
+    return 1.0 / (1.0 + np.exp(-np.clip(values, -30, 30)))
+
+
+def train_risk_model(history, label_days=RECENT_WINDOW_DAYS):
+    """
+    Fit on features as they stood `label_days` before the end of history
+    against what happened afterwards. Returns None when the labelled
+    window holds only one class.
+    """
+    cutoff = history.end - np.timedelta64(label_days, "D")
+    labels, has_label = build_labels(history, cutoff)
+    labels = labels[has_label]
+    if not len(labels) or labels.min() == labels.max():
+        return None
+    return LogisticRiskModel.fit(build_features(history, cutoff)[has_label], labels)
+
+
+# =========================================================
+# NIGHTLY SCORING
+# =========================================================
+def score_students(train=True, directory=None):
+    """
+    Score every student in one pass and replace AttendanceRiskScore rows.
+    Retrains first when `train` is set and the history allows it,
+    otherwise reuses the saved model. Returns (scored_count, trained).
+    """
+    history = AttendanceHistory.load()
+    path = model_path(directory)
+
+    model = train_risk_model(history) if train else None
+    trained = model is not None
+    if trained:
+        model.save(path)
+    elif os.path.exists(path):
+        model = LogisticRiskModel.load(path)
+    else:
+        raise ValueError("No saved risk model and not enough labelled history to train one.")
+
+    features = build_features(history)
+    scores = model.predict_proba(features)
+    computed_at = timezone.now()
+
+    with transaction.atomic():
+        AttendanceRiskScore.objects.exclude(student_id__in=history.student_ids.tolist()).delete()
+        AttendanceRiskScore.objects.bulk_create(
+            [
+                AttendanceRiskScore(
+                    student_id=student_id,
+                    score=round(float(score), 4),
+                    attendance_percentage=round(row[0] * 100, 2),
+                    recent_trend=round(row[1] * 100, 2),
+                    longest_absence_streak=int(row[2]),
+                    current_absence_streak=int(row[3]),
+                    lowest_subject_percentage=round(row[4] * 100, 2),
+                    remedial_attendance_percentage=round(row[5] * 100, 2),
+                    computed_at=computed_at,
+                )
+                for student_id, score, row in zip(history.student_ids.tolist(), scores, features)
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["student"],
+            update_fields=[
+                "score",
+                "attendance_percentage",
+                "recent_trend",
+                "longest_absence_streak",
+                "current_absence_streak",
+                "lowest_subject_percentage",
+                "remedial_attendance_percentage",
+                "computed_at",
+            ],
+        )
+        notify_attendance_changed(AttendanceRiskScore)
+    return len(scores), trained
+
+
+def at_risk_students(min_score=AT_RISK_SCORE):
+    """
+    Latest stored scores at or above `min_score`, highest first.
+    """
+    return (
+        AttendanceRiskScore.objects.filter(score__gte=min_score)
+        .select_related("student__studentprofile__section__course")
+        .order_by("-score")
+    )
@@ -0,0 +1,467 @@
+from django.db import transaction
+from django.db.models import Count, ExpressionWrapper, F, FloatField, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, ExtractWeekDay
+
+from accounts.models import User
+from academics.models import Enrollment
+from academics.timetable import day_code_for, get_timetable_index
+from notifications.utils import send_absent_email
+from .models import AttendanceRecord, AttendanceSession, AttendanceSlotSummary, AttendanceSummary
+from .signals import notify_attendance_changed
+
+
+# =========================================================
+# ATTENDANCE SUMMARY COUNTERS
+# =========================================================
+def _ensure_summary_rows(subject_id, student_ids):
+    AttendanceSummary.objects.bulk_create(
+        [
+            AttendanceSummary(student_id=student_id, subject_id=subject_id)
+            for student_id in student_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def record_attendance_counts(subject_id, present_ids, absent_ids):
+    """
+    Add one session worth of records to the summary counters.
+
+    Must be called inside the transaction that writes the
+    AttendanceRecord rows so the two never drift apart.
+    """
+    present_ids = list(present_ids)
+    absent_ids = list(absent_ids)
+    if not present_ids and not absent_ids:
+        return
+
+    _ensure_summary_rows(subject_id, present_ids + absent_ids)
+
+    if present_ids:
+        AttendanceSummary.objects.filter(
+            subject_id=subject_id,
+            student_id__in=present_ids,
+        ).update(
+            present_count=F("present_count") + 1,
+            total_count=F("total_count") + 1,
+        )
+    if absent_ids:
+        AttendanceSummary.objects.filter(
+            subject_id=subject_id,
+            student_id__in=absent_ids,
+        ).update(total_count=F("total_count") + 1)
+
+
+@transaction.atomic
+def rebuild_attendance_summary():
+    """
+    Recompute every summary row from AttendanceRecord.
+    Used to recover from drift; returns the number of rows written.
+    """
+    rows = (
+        AttendanceRecord.objects.values("student_id", "session__subject_id")
+        .annotate(
+            total=Count("id"),
+            present=Count("id", filter=Q(status="PRESENT")),
+        )
+        .order_by()
+    )
+
+    AttendanceSummary.objects.all().delete()
+    summaries = AttendanceSummary.objects.bulk_create(
+        [
+            AttendanceSummary(
+                student_id=row["student_id"],
+                subject_id=row["session__subject_id"],
+                present_count=row["present"],
+                total_count=row["total"],
+            )
+            for row in rows.iterator(chunk_size=2000)
+        ],
+        batch_size=1000,
+    )
+    notify_attendance_changed(AttendanceSummary)
+    return len(summaries)
+
+
+# =========================================================
+# SLOT COUNTERS (section x faculty x weekday x start time)
+# =========================================================
+WEEK_DAY_CODES = {1: "SUN", 2: "MON", 3: "TUE", 4: "WED", 5: "THU", 6: "FRI", 7: "SAT"}
+
+
+def record_slot_counts(session, present, total):
+    """
+    Add `present` / `total` records of a confirmed session to its slot.
+    Negative `present` is allowed for corrections.
+    """
+    if not present and not total:
+        return
+
+    slot = {
+        "section_id": session.section_id,
+        "faculty_id": session.marked_by_id,
+        "day_of_week": day_code_for(session.date),
+        "start_time": session.start_time,
+    }
+    if slot["faculty_id"] is None:
+        # NULLs never conflict under unique_together, so the unassigned
+        # bucket is found explicitly and only one of its rows is counted.
+        rows = AttendanceSlotSummary.objects.filter(pk=_unassigned_slot_pk(slot))
+    else:
+        AttendanceSlotSummary.objects.bulk_create(
+            [AttendanceSlotSummary(**slot)],
+            ignore_conflicts=True,
+        )
+        rows = AttendanceSlotSummary.objects.filter(**slot)
+    rows.update(
+        present_count=F("present_count") + present,
+        total_count=F("total_count") + total,
+    )
+
+
+def _unassigned_slot_pk(slot):
+    """
+    Pk of the slot row with no faculty, created on first use. Readers sum
+    over rows, so extra NULL rows left by deleted faculty stay correct.
+    """
+    # faculty_id=None filters on IS NULL.
+    pk = AttendanceSlotSummary.objects.filter(**slot).order_by("pk").values_list("pk", flat=True).first()
+    if pk is None:
+        pk = AttendanceSlotSummary.objects.create(**slot).pk
+    return pk
+
+
+@transaction.atomic
+def rebuild_slot_summary():
+    """
+    Recompute every slot counter in one aggregate query.
+    Returns the number of rows written.
+    """
+    rows = (
+        AttendanceRecord.objects.filter(session__confirmed=True)
+        .values("session__section_id", "session__marked_by_id", "session__start_time")
+        .annotate(
+            week_day=ExtractWeekDay("session__date"),
+            total=Count("id"),
+            present=Count("id", filter=Q(status="PRESENT")),
+        )
+        .order_by()
+    )
+
+    AttendanceSlotSummary.objects.all().delete()
+    summaries = AttendanceSlotSummary.objects.bulk_create(
+        [
+            AttendanceSlotSummary(
+                section_id=row["session__section_id"],
+                faculty_id=row["session__marked_by_id"],
+                day_of_week=WEEK_DAY_CODES[row["week_day"]],
+                start_time=row["session__start_time"],
+                present_count=row["present"],
+                total_count=row["total"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+    notify_attendance_changed(AttendanceSlotSummary)
+    return len(summaries)
+
+
+# =========================================================
+# PER-SUBJECT ATTENDANCE STANDING
+# =========================================================
+STANDING_FIELDS = (
+    "student_id",
+    "subject_id",
+    "subject__subject_code",
+    "subject__subject_name",
+    "subject__semester",
+    "subject__faculty_id",
+    "subject__min_attendance_percentage",
+)
+
+
+def classes_needed(present, total, threshold):
+    """
+    Consecutive classes a student must attend to reach the threshold.
+    Returns None when the threshold can no longer be reached (100%).
+    """
+    # Integer math: in floats 1 - 0.8 is 0.1999..., so exact answers
+    # such as 25 came out as 25.000000000000007 and rounded up to 26.
+    if total == 0 or 100 * present >= threshold * total:
+        return 0
+    if threshold >= 100:
+        return None
+    return -(-(threshold * total - 100 * present) // (100 - threshold))
+
+
+def build_standing(row, present, total):
+    threshold = row["subject__min_attendance_percentage"]
+    percentage = (present / total * 100) if total > 0 else 0
+    return {
+        "student_id": row["student_id"],
+        "subject_id": row["subject_id"],
+        "subject_code": row["subject__subject_code"],
+        "subject_name": row["subject__subject_name"],
+        "semester": row["subject__semester"],
+        "faculty_id": row["subject__faculty_id"],
+        "present": present,
+        "total": total,
+        "percentage": round(percentage, 2),
+        "threshold": threshold,
+        "classes_needed": classes_needed(present, total, threshold),
+        "is_below_threshold": total > 0 and percentage < threshold,
+    }
+
+
+def get_subject_standings(student):
+    """
+    Standing for every enrolled subject of one student, in a single query.
+    """
+    summary = AttendanceSummary.objects.filter(
+        student_id=OuterRef("student_id"),
+        subject_id=OuterRef("subject_id"),
+    )
+    rows = (
+        Enrollment.objects.filter(student=student)
+        .annotate(
+            present=Coalesce(Subquery(summary.values("present_count")[:1]), Value(0), output_field=IntegerField()),
+            total=Coalesce(Subquery(summary.values("total_count")[:1]), Value(0), output_field=IntegerField()),
+        )
+        .values(*STANDING_FIELDS, "present", "total")
+        .order_by("subject__semester", "subject__subject_code")
+    )
+    return [build_standing(row, row["present"], row["total"]) for row in rows]
+
+
+def below_threshold_summaries(summaries=None):
+    """
+    Summary rows whose percentage is under the subject's own minimum.
+    `summaries` defaults to the live AttendanceSummary table; archived
+    semesters pass an ArchivedAttendanceSummary queryset.
+    """
+    if summaries is None:
+        summaries = AttendanceSummary.objects.all()
+    return (
+        summaries.filter(total_count__gt=0)
+        .annotate(
+            attendance_percentage=ExpressionWrapper(
+                (F("present_count") * 100.0) / F("total_count"),
+                output_field=FloatField(),
+            )
+        )
+        .filter(attendance_percentage__lt=F("subject__min_attendance_percentage"))
+    )
+
+
+def get_low_attendance_standings(summaries=None):
+    """
+    Standings below threshold across all students, worst first.
+    """
+    rows = (
+        below_threshold_summaries(summaries)
+        .values(*STANDING_FIELDS, "present_count", "total_count")
+        .order_by("attendance_percentage")
+    )
+    return [build_standing(row, row["present_count"], row["total_count"]) for row in rows]
+
+
+# =========================================================
+# IDEMPOTENT ATTENDANCE SUBMISSION
+# =========================================================
+SUBMISSION_CREATED = "CREATED"
+SUBMISSION_DUPLICATE = "DUPLICATE"
+SUBMISSION_CONFLICT = "CONFLICT"
+
+
+def submit_attendance(
+    subject,
+    section,
+    day,
+    marked_by,
+    method,
+    statuses,
+    confidences=None,
+    submission_key=None,
+    start_time=None,
+    end_time=None,
+):
+    """
+    Confirm one class session with its records, safe under concurrency.
+
+    The session row is inserted or fetched, then claimed with a single
+    conditional UPDATE on `confirmed=False`; only the submission that wins
+    the claim writes records and counters. Returns (session, outcome):
+
+    - CREATED: this call confirmed the session
+    - DUPLICATE: the same submission_key already confirmed it (replay)
+    - CONFLICT: a different submission confirmed it first
+
+    `statuses` maps student_id -> "PRESENT" / "ABSENT" and `confidences`
+    optionally maps student_id -> face recognition score.
+    """
+    confidences = confidences or {}
+
+    with transaction.atomic():
+        session, _ = AttendanceSession.objects.get_or_create(
+            subject=subject,
+            section=section,
+            date=day,
+            defaults={
+                "start_time": start_time,
+                "end_time": end_time,
+                "marked_by": marked_by,
+                "method": method,
+                "confirmed": False,
+            },
+        )
+
+        claimed = AttendanceSession.objects.filter(pk=session.pk, confirmed=False).update(
+            confirmed=True,
+            submission_key=submission_key,
+            marked_by=marked_by,
+            method=method,
+        )
+        if not claimed:
+            replay = submission_key and AttendanceSession.objects.filter(
+                pk=session.pk,
+                submission_key=submission_key,
+            ).exists()
+            return session, SUBMISSION_DUPLICATE if replay else SUBMISSION_CONFLICT
+
+        session.confirmed = True
+        session.submission_key = submission_key
+        session.marked_by = marked_by
+        session.method = method
+
+        AttendanceRecord.objects.bulk_create(
+            [
+                AttendanceRecord(
+                    session=session,
+                    student_id=student_id,
+                    status=status,
+                    confidence_score=confidences.get(student_id),
+                    verified_by_faculty=True,
+                )
+                for student_id, status in statuses.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["session", "student"],
+            update_fields=["status", "confidence_score", "verified_by_faculty"],
+        )
+        present_ids = [student_id for student_id, status in statuses.items() if status == "PRESENT"]
+        record_attendance_counts(
+            subject.id,
+            present_ids,
+            [student_id for student_id, status in statuses.items() if status != "PRESENT"],
+        )
+        record_slot_counts(session, len(present_ids), len(statuses))
+        notify_attendance_changed(AttendanceSession, AttendanceRecord, AttendanceSummary, AttendanceSlotSummary)
+
+    return session, SUBMISSION_CREATED
+
+
+# =========================================================
+# EDIT-IN-PLACE CORRECTIONS
+# =========================================================
+def adjust_present_counts(subject_id, gained_ids, lost_ids):
+    """
+    Move students between present and absent without touching totals.
+    """
+    if gained_ids:
+        AttendanceSummary.objects.filter(
+            subject_id=subject_id,
+            student_id__in=gained_ids,
+        ).update(present_count=F("present_count") + 1)
+    if lost_ids:
+        AttendanceSummary.objects.filter(
+            subject_id=subject_id,
+            student_id__in=lost_ids,
+        ).update(present_count=F("present_count") - 1)
+
+
+def _notify_corrected_absentees(session, student_ids):
+    students = User.objects.filter(user_id__in=student_ids).select_related("studentprofile")
+    for student in students:
+        send_absent_email(student, session.subject, session)
+
+
+def correct_attendance(session, present_ids):
+    """
+    Bring a confirmed session in line with the final present set.
+
+    Only records whose status actually flips are written; summary
+    counters move by the same delta and absence emails are queued for
+    students flipped to ABSENT once the transaction commits. Students
+    without a stored record are ignored. Returns (marked_present,
+    marked_absent) as lists of student ids.
+    """
+    present_ids = set(present_ids)
+    marked_present = []
+    marked_absent = []
+
+    with transaction.atomic():
+        changed = []
+        records = (
+            AttendanceRecord.objects.select_for_update()
+            .filter(session=session)
+            .only("id", "student_id", "status")
+        )
+        for record in records:
+            status = "PRESENT" if record.student_id in present_ids else "ABSENT"
+            if record.status == status:
+                continue
+            record.status = status
+            record.verified_by_faculty = True
+            changed.append(record)
+            if status == "PRESENT":
+                marked_present.append(record.student_id)
+            else:
+                marked_absent.append(record.student_id)
+
+        if not changed:
+            return marked_present, marked_absent
+
+        AttendanceRecord.objects.bulk_update(changed, ["status", "verified_by_faculty"])
+        adjust_present_counts(session.subject_id, marked_present, marked_absent)
+        record_slot_counts(session, len(marked_present) - len(marked_absent), 0)
+        notify_attendance_changed(AttendanceRecord, AttendanceSummary, AttendanceSlotSummary)
+
+        if marked_absent:
+            transaction.on_commit(
+                lambda: _notify_corrected_absentees(session, marked_absent)
+            )
+
+    return marked_present, marked_absent
+
+
+# =========================================================
+# DAY-START PENDING SESSIONS
+# =========================================================
+def create_pending_sessions(day):
+    """
+    Bulk-create one unconfirmed session per ClassSchedule entry of `day`
+    with the real slot times and scheduled faculty. Safe to re-run;
+    returns the number of sessions that did not exist yet.
+    """
+    entries = get_timetable_index(day).entries
+    existing = AttendanceSession.objects.filter(date=day).count()
+    AttendanceSession.objects.bulk_create(
+        [
+            AttendanceSession(
+                subject_id=entry.subject_id,
+                section_id=entry.section_id,
+                date=day,
+                start_time=entry.start_time,
+                end_time=entry.end_time,
+                marked_by_id=entry.faculty_id,
+                method="MANUAL",
+                confirmed=False,
+            )
+            for entry in entries
+        ],
+        ignore_conflicts=True,
+    )
+    notify_attendance_changed(AttendanceSession)
+    return AttendanceSession.objects.filter(date=day).count() - existing
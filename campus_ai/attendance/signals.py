@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.dispatch import Signal
+
+
+# Sent after writes that bypass post_save / post_delete (bulk_create,
+# bulk_update, queryset.update). `models` lists the model classes whose
+# rows changed.
+attendance_changed = Signal()
+
+
+def notify_attendance_changed(*models):
+    """
+    Send attendance_changed once the surrounding transaction commits.
+    """
+    transaction.on_commit(
+        lambda: attendance_changed.send(sender=models[0], models=models)
+    )
@@ -0,0 +1,264 @@
+import os
+from itertools import groupby
+
+import numpy as np
+from django.conf import settings
+
+from accounts.models import StudentProfile
+from .models import AttendanceRecord, AttendanceSession
+
+
+# =========================================================
+# SNAPSHOT STORAGE
+# =========================================================
+def snapshot_dir():
+    return os.path.join(settings.MEDIA_ROOT, "attendance_snapshots")
+
+
+def snapshot_path(section_id, subject_id, directory=None):
+    return os.path.join(
+        directory or snapshot_dir(),
+        f"section_{section_id}_subject_{subject_id}.npz",
+    )
+
+
+# =========================================================
+# SNAPSHOT BUILDER
+# =========================================================
+def _write_snapshot(path, section_id, subject_id, sessions, student_ids, records):
+    """
+    Pack one section/subject into student x session bit matrices.
+
+    `sessions` is an ordered list of (session_id, date) and `records`
+    an iterable of (session_id, student_id, status).
+    """
+    session_index = {session_id: col for col, (session_id, _) in enumerate(sessions)}
+    student_index = {student_id: row for row, student_id in enumerate(student_ids)}
+
+    rows, cols, statuses = [], [], []
+    for session_id, student_id, status in records:
+        row = student_index.get(student_id)
+        if row is None:
+            # Student has since moved section; keep their history anyway.
+            row = student_index[student_id] = len(student_ids)
+            student_ids.append(student_id)
+        rows.append(row)
+        cols.append(session_index[session_id])
+        statuses.append(status == "PRESENT")
+
+    present = np.zeros((len(student_ids), len(sessions)), dtype=bool)
+    recorded = np.zeros_like(present)
+    recorded[rows, cols] = True
+    present[rows, cols] = statuses
+
+    np.savez_compressed(
+        path,
+        section_id=section_id,
+        subject_id=subject_id,
+        n_sessions=len(sessions),
+        present=np.packbits(present, axis=1),
+        recorded=np.packbits(recorded, axis=1),
+        session_dates=np.array([day for _, day in sessions], dtype="datetime64[D]"),
+        student_ids=np.array(student_ids, dtype=str),
+    )
+    return path
+
+
+def build_snapshots(section_id=None, subject_id=None, directory=None, chunk_size=5000):
+    """
+    Stream confirmed attendance into one .npz snapshot per section & subject.
+    Returns the list of written paths.
+    """
+    directory = directory or snapshot_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    sessions_qs = AttendanceSession.objects.filter(confirmed=True)
+    records_qs = AttendanceRecord.objects.filter(session__confirmed=True)
+    if section_id:
+        sessions_qs = sessions_qs.filter(section_id=section_id)
+        records_qs = records_qs.filter(session__section_id=section_id)
+    if subject_id:
+        sessions_qs = sessions_qs.filter(subject_id=subject_id)
+        records_qs = records_qs.filter(session__subject_id=subject_id)
+
+    sessions_by_group = {}
+    for session_id, group_section_id, group_subject_id, day in (
+        sessions_qs.order_by("section_id", "subject_id", "date", "start_time")
+        .values_list("id", "section_id", "subject_id", "date")
+    ):
+        sessions_by_group.setdefault((group_section_id, group_subject_id), []).append((session_id, day))
+
+    students_by_section = {}
+    for user_id, profile_section_id in (
+        StudentProfile.objects.filter(section_id__in={key[0] for key in sessions_by_group})
+        .order_by("user_id")
+        .values_list("user_id", "section_id")
+    ):
+        students_by_section.setdefault(profile_section_id, []).append(user_id)
+
+    records = (
+        records_qs.order_by("session__section_id", "session__subject_id")
+        .values_list("session__section_id", "session__subject_id", "session_id", "student_id", "status")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    written = []
+    for key, group in groupby(records, key=lambda row: (row[0], row[1])):
+        written.append(
+            _write_snapshot(
+                snapshot_path(key[0], key[1], directory),
+                key[0],
+                key[1],
+                sessions_by_group[key],
+                list(students_by_section.get(key[0], [])),
+                (row[2:] for row in group),
+            )
+        )
+    return written
+
+
+# =========================================================
+# QUERY API
+# =========================================================
+class AttendanceMatrix:
+    """
+    Student x session view of one snapshot.
+
+    `present[i, j]` is True when student i attended session j and
+    `recorded[i, j]` is True when a record exists at all, so absence is
+    `recorded & ~present`.
+    """
+
+    def __init__(self, student_ids, session_dates, present, recorded, section_id=None, subject_id=None):
+        self.student_ids = np.asarray(student_ids)
+        self.session_dates = np.asarray(session_dates, dtype="datetime64[D]")
+        self.present = np.asarray(present, dtype=bool)
+        self.recorded = np.asarray(recorded, dtype=bool)
+        self.section_id = section_id
+        self.subject_id = subject_id
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            n_sessions = int(data["n_sessions"])
+            return cls(
+                student_ids=data["student_ids"],
+                session_dates=data["session_dates"],
+                present=np.unpackbits(data["present"], axis=1, count=n_sessions).astype(bool),
+                recorded=np.unpackbits(data["recorded"], axis=1, count=n_sessions).astype(bool),
+                section_id=int(data["section_id"]),
+                subject_id=int(data["subject_id"]),
+            )
+
+    @classmethod
+    def for_class(cls, section_id, subject_id, directory=None):
+        return cls.load(snapshot_path(section_id, subject_id, directory))
+
+    @property
+    def absent(self):
+        return self.recorded & ~self.present
+
+    def _rows(self, student_ids):
+        return np.flatnonzero(np.isin(self.student_ids, list(student_ids)))
+
+    # ------------------------------------------------------
+    # Percentages
+    # ------------------------------------------------------
+    def attendance_percentage(self):
+        """
+        Overall percentage per student (NaN when nothing recorded).
+        """
+        total = self.recorded.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, self.present.sum(axis=1) * 100.0 / total, np.nan)
+
+    def rolling_percentage(self, window):
+        """
+        Percentage over each run of `window` consecutive sessions.
+        Shape: (students, sessions - window + 1).
+        """
+        if window <= 0 or window > self.present.shape[1]:
+            return np.empty((self.present.shape[0], 0))
+
+        def window_sums(matrix):
+            cumulative = np.cumsum(np.pad(matrix.astype(np.int32), ((0, 0), (1, 0))), axis=1)
+            return cumulative[:, window:] - cumulative[:, :-window]
+
+        present = window_sums(self.present)
+        total = window_sums(self.recorded)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, present * 100.0 / total, np.nan)
+
+    def weekly_percentage(self):
+        """
+        Per-student trend line bucketed by calendar week.
+        Returns (week_start_dates, percentages[students, weeks]).
+        """
+        if not len(self.session_dates):
+            return self.session_dates, np.empty((self.present.shape[0], 0))
+
+        # datetime64 epoch is a Thursday; shift so weeks start on Monday.
+        weeks = (self.session_dates.astype("int64") + 3) // 7
+        boundaries = np.flatnonzero(np.r_[True, weeks[1:] != weeks[:-1]])
+        present = np.add.reduceat(self.present.astype(np.int32), boundaries, axis=1)
+        total = np.add.reduceat(self.recorded.astype(np.int32), boundaries, axis=1)
+        week_starts = (weeks[boundaries] * 7 - 3).astype("datetime64[D]")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return week_starts, np.where(total > 0, present * 100.0 / total, np.nan)
+
+    # ------------------------------------------------------
+    # Streaks
+    # ------------------------------------------------------
+    def longest_absence_streaks(self):
+        """
+        Longest run of consecutive absences per student.
+        """
+        n_students, n_sessions = self.present.shape
+        longest = np.zeros(n_students, dtype=np.int64)
+        if n_sessions == 0:
+            return longest
+
+        # Flatten with a separator column so runs never cross students.
+        flat = np.pad(self.absent, ((0, 0), (0, 1))).ravel().astype(np.int8)
+        edges = np.diff(np.r_[0, flat, 0])
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        np.maximum.at(longest, starts // (n_sessions + 1), ends - starts)
+        return longest
+
+    def students_with_absence_streak(self, min_length):
+        """
+        {student_id: longest streak} for students who missed at least
+        `min_length` consecutive sessions.
+        """
+        longest = self.longest_absence_streaks()
+        rows = np.flatnonzero(longest >= min_length)
+        return {str(self.student_ids[row]): int(longest[row]) for row in rows}
+
+    # ------------------------------------------------------
+    # Cohorts
+    # ------------------------------------------------------
+    def session_rates(self, student_ids=None):
+        """
+        Turnout per session for all students or a cohort.
+        """
+        rows = slice(None) if student_ids is None else self._rows(student_ids)
+        total = self.recorded[rows].sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, self.present[rows].sum(axis=0) * 100.0 / total, np.nan)
+
+    def compare_cohorts(self, cohort_a, cohort_b):
+        """
+        Compare two groups of students over the same sessions.
+        """
+        rates_a = self.session_rates(cohort_a)
+        rates_b = self.session_rates(cohort_b)
+        mean_a = float(np.nanmean(rates_a)) if np.isfinite(rates_a).any() else None
+        mean_b = float(np.nanmean(rates_b)) if np.isfinite(rates_b).any() else None
+        return {
+            "cohort_a_percentage": mean_a,
+            "cohort_b_percentage": mean_b,
+            "difference": (mean_a - mean_b) if mean_a is not None and mean_b is not None else None,
+            "cohort_a_session_rates": rates_a,
+            "cohort_b_session_rates": rates_b,
+        }
@@ -0,0 +1,325 @@
+from datetime import date, time
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import User
+from academics.models import ClassSchedule, Enrollment
+from academics.timetable import day_code_for
+from notifications.utils import send_absent_email
+from .models import AttendanceRecord, AttendanceSession, AttendanceSlotSummary, AttendanceSummary
+from .services import (
+    SUBMISSION_CONFLICT,
+    SUBMISSION_CREATED,
+    SUBMISSION_DUPLICATE,
+    record_attendance_counts,
+    record_slot_counts,
+)
+from .signals import notify_attendance_changed
+
+
+SYNC_INVALID = "INVALID"
+MAX_SYNC_BATCH = 200
+
+
+# =========================================================
+# PAYLOAD PARSING
+# =========================================================
+def _parse_session(payload):
+    """
+    Validate the shape of one queued session.
+    Returns (parsed, errors).
+    """
+    errors = []
+    parsed = {
+        "client_id": payload.get("client_id"),
+        "submission_key": str(payload.get("submission_key") or "").strip()[:64],
+    }
+
+    if not parsed["submission_key"]:
+        errors.append("submission_key is required.")
+
+    try:
+        parsed["subject_id"] = int(payload.get("subject"))
+        parsed["section_id"] = int(payload.get("section"))
+    except (TypeError, ValueError):
+        errors.append("subject and section must be ids.")
+
+    try:
+        parsed["date"] = date.fromisoformat(str(payload.get("date")))
+    except ValueError:
+        errors.append("date must be YYYY-MM-DD.")
+    else:
+        if parsed["date"] > timezone.localdate():
+            errors.append("date cannot be in the future.")
+
+    start_time_raw = payload.get("start_time")
+    parsed["start_time"] = None
+    if start_time_raw:
+        try:
+            parsed["start_time"] = time.fromisoformat(str(start_time_raw))
+        except ValueError:
+            errors.append("start_time must be HH:MM.")
+
+    parsed["method"] = payload.get("method") or "MANUAL"
+    if parsed["method"] not in dict(AttendanceSession.METHOD_CHOICES):
+        errors.append("method must be MANUAL or FACE.")
+
+    statuses = {}
+    confidences = {}
+    records = payload.get("records")
+    if not isinstance(records, list):
+        errors.append("records must be a list.")
+        records = []
+    for record in records:
+        if not isinstance(record, dict):
+            errors.append("each record must be an object.")
+            continue
+        student_id = str(record.get("student") or "")
+        status = record.get("status")
+        if status not in dict(AttendanceRecord.STATUS_CHOICES):
+            errors.append(f"{student_id}: status must be PRESENT or ABSENT.")
+            continue
+        confidence = record.get("confidence")
+        if confidence is not None:
+            try:
+                confidence = float(confidence)
+            except (TypeError, ValueError):
+                confidence = -1
+            if not 0 <= confidence <= 1:
+                errors.append(f"{student_id}: confidence must be between 0 and 1.")
+                continue
+            confidences[student_id] = confidence
+        statuses[student_id] = status
+
+    parsed["statuses"] = statuses
+    parsed["confidences"] = confidences
+    return parsed, errors
+
+
+def _result(parsed, status, session=None, errors=None):
+    return {
+        "client_id": parsed.get("client_id"),
+        "submission_key": parsed.get("submission_key"),
+        "status": status,
+        "session_id": session.id if session else None,
+        "errors": errors or [],
+    }
+
+
+# =========================================================
+# BATCH SYNC
+# =========================================================
+def sync_attendance_batch(faculty, sessions_payload):
+    """
+    Validate and write queued attendance sessions from an offline device.
+
+    Every valid session is checked against the faculty's ClassSchedule and
+    the section roster, then all of them are written in one transaction
+    with bulk inserts. Returns one result per input session, in order, so
+    the client can retry only the INVALID ones.
+    """
+    results = [None] * len(sessions_payload)
+    parsed_sessions = []
+
+    for index, payload in enumerate(sessions_payload):
+        if not isinstance(payload, dict):
+            results[index] = _result({}, SYNC_INVALID, errors=["session must be an object."])
+            continue
+        parsed, errors = _parse_session(payload)
+        if errors:
+            results[index] = _result(parsed, SYNC_INVALID, errors=errors)
+            continue
+        parsed_sessions.append((index, parsed))
+
+    if not parsed_sessions:
+        return results
+
+    subject_ids = {parsed["subject_id"] for _, parsed in parsed_sessions}
+    section_ids = {parsed["section_id"] for _, parsed in parsed_sessions}
+
+    # ----------------------------
+    # Schedule + roster lookups (one query each)
+    # ----------------------------
+    slots = {}
+    for schedule in ClassSchedule.objects.filter(
+        faculty=faculty,
+        subject_id__in=subject_ids,
+        section_id__in=section_ids,
+    ).values("subject_id", "section_id", "day_of_week", "start_time", "end_time"):
+        key = (schedule["subject_id"], schedule["section_id"], schedule["day_of_week"])
+        slots.setdefault(key, []).append(schedule)
+
+    rosters = {}
+    for subject_id, section_id, student_id in Enrollment.objects.filter(
+        subject_id__in=subject_ids,
+        student__studentprofile__section_id__in=section_ids,
+    ).values_list("subject_id", "student__studentprofile__section_id", "student_id"):
+        rosters.setdefault((subject_id, section_id), set()).add(student_id)
+
+    valid = []
+    key_targets = {}
+    for index, parsed in parsed_sessions:
+        # A key names one class session; reusing it in the batch for a
+        # different class would collide on the unique submission_key.
+        target = (parsed["subject_id"], parsed["section_id"], parsed["date"])
+        if key_targets.setdefault(parsed["submission_key"], target) != target:
+            results[index] = _result(
+                parsed,
+                SYNC_INVALID,
+                errors=["submission_key is already used by another session in this batch."],
+            )
+            continue
+
+        day_code = day_code_for(parsed["date"])
+        candidates = slots.get((parsed["subject_id"], parsed["section_id"], day_code), [])
+        if parsed["start_time"]:
+            candidates = [slot for slot in candidates if slot["start_time"] == parsed["start_time"]]
+        if not candidates:
+            results[index] = _result(parsed, SYNC_INVALID, errors=["No matching class in your timetable."])
+            continue
+
+        roster = rosters.get((parsed["subject_id"], parsed["section_id"]), set())
+        unknown = sorted(set(parsed["statuses"]) - roster)
+        if unknown:
+            results[index] = _result(
+                parsed,
+                SYNC_INVALID,
+                errors=[f"Students not enrolled in this class: {', '.join(unknown)}"],
+            )
+            continue
+
+        # Students the device did not report are absent, as in the form.
+        parsed["statuses"] = {
+            student_id: parsed["statuses"].get(student_id, "ABSENT")
+            for student_id in sorted(roster)
+        }
+        parsed["slot"] = candidates[0]
+        valid.append((index, parsed))
+
+    if not valid:
+        return results
+
+    # ----------------------------
+    # One transaction for the whole batch
+    # ----------------------------
+    claimed = []
+    with transaction.atomic():
+        AttendanceSession.objects.bulk_create(
+            [
+                AttendanceSession(
+                    subject_id=parsed["subject_id"],
+                    section_id=parsed["section_id"],
+                    date=parsed["date"],
+                    start_time=parsed["slot"]["start_time"],
+                    end_time=parsed["slot"]["end_time"],
+                    marked_by=faculty,
+                    method=parsed["method"],
+                    confirmed=False,
+                )
+                for _, parsed in valid
+            ],
+            ignore_conflicts=True,
+        )
+
+        lookup = Q()
+        for _, parsed in valid:
+            lookup |= Q(subject_id=parsed["subject_id"], section_id=parsed["section_id"], date=parsed["date"])
+        sessions = {
+            (session.subject_id, session.section_id, session.date): session
+            for session in (
+                AttendanceSession.objects.select_for_update(of=("self",))
+                .select_related("subject")
+                .filter(lookup)
+            )
+        }
+        used_keys = {
+            submission_key: (subject_id, section_id, day)
+            for submission_key, subject_id, section_id, day in AttendanceSession.objects.filter(
+                submission_key__in={parsed["submission_key"] for _, parsed in valid}
+            ).values_list("submission_key", "subject_id", "section_id", "date")
+        }
+
+        for index, parsed in valid:
+            target = (parsed["subject_id"], parsed["section_id"], parsed["date"])
+            session = sessions[target]
+            if used_keys.get(parsed["submission_key"], target) != target:
+                results[index] = _result(
+                    parsed,
+                    SUBMISSION_CONFLICT,
+                    errors=["submission_key was already used for another session."],
+                )
+                continue
+            if session.confirmed:
+                outcome = (
+                    SUBMISSION_DUPLICATE
+                    if session.submission_key == parsed["submission_key"]
+                    else SUBMISSION_CONFLICT
+                )
+                results[index] = _result(parsed, outcome, session=session)
+                continue
+
+            session.confirmed = True
+            session.submission_key = parsed["submission_key"]
+            session.marked_by = faculty
+            session.method = parsed["method"]
+            claimed.append((index, parsed, session))
+
+        AttendanceSession.objects.bulk_update(
+            [session for _, _, session in claimed],
+            ["confirmed", "submission_key", "marked_by", "method"],
+        )
+        AttendanceRecord.objects.bulk_create(
+            [
+                AttendanceRecord(
+                    session=session,
+                    student_id=student_id,
+                    status=status,
+                    confidence_score=parsed["confidences"].get(student_id),
+                    verified_by_faculty=True,
+                )
+                for _, parsed, session in claimed
+                for student_id, status in parsed["statuses"].items()
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["session", "student"],
+            update_fields=["status", "confidence_score", "verified_by_faculty"],
+        )
+        for _, parsed, session in claimed:
+            present_ids = [student_id for student_id, status in parsed["statuses"].items() if status == "PRESENT"]
+            record_attendance_counts(
+                session.subject_id,
+                present_ids,
+                [student_id for student_id, status in parsed["statuses"].items() if status != "PRESENT"],
+            )
+            record_slot_counts(session, len(present_ids), len(parsed["statuses"]))
+        if claimed:
+            notify_attendance_changed(AttendanceSession, AttendanceRecord, AttendanceSummary, AttendanceSlotSummary)
+
+    for index, parsed, session in claimed:
+        results[index] = _result(parsed, SUBMISSION_CREATED, session=session)
+
+    _notify_absentees(claimed)
+    return results
+
+
+def _notify_absentees(claimed):
+    absent_ids = {
+        student_id
+        for _, parsed, _ in claimed
+        for student_id, status in parsed["statuses"].items()
+        if status == "ABSENT"
+    }
+    if not absent_ids:
+        return
+
+    students = {
+        student.user_id: student
+        for student in User.objects.filter(user_id__in=absent_ids).select_related("studentprofile")
+    }
+    for _, parsed, session in claimed:
+        for student_id, status in parsed["statuses"].items():
+            if status == "ABSENT":
+                send_absent_email(students[student_id], session.subject, session)
@@ -1,3 +1,986 @@
-from django.test import TestCase
+import csv
+import random
+import tempfile
+import threading
+import unittest
+from datetime import date, time, timedelta
+from functools import partial
+from io import StringIO
 
-# Create your tests here.
+import numpy as np
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import StudentProfile, User
+from academics.models import ClassSchedule, Course, Department, Enrollment, Section, Subject
+from core.dashboard import KPIS
+from core.query_assertions import QueryBudgetMixin, QueryPlanMixin
+from .anomalies import find_overlapping_presence
+from .archive import archive_closed_semesters, get_archived_low_attendance_standings, semester_for
+from .exports import EXPORT_HEADER, export_querysets, export_rows, parse_export_filters
+from .models import (
+    ArchivedAttendanceRecord,
+    ArchivedAttendanceSession,
+    ArchivedAttendanceSummary,
+    AttendanceRecord,
+    AttendanceSession,
+    AttendanceSlotSummary,
+    AttendanceSummary,
+)
+from .heatmaps import slot_heatmap
+from .risk import (
+    AttendanceHistory,
+    LogisticRiskModel,
+    build_features,
+    build_labels,
+    score_students,
+    train_risk_model,
+)
+from .snapshots import AttendanceMatrix, build_snapshots
+from .services import (
+    SUBMISSION_CONFLICT,
+    SUBMISSION_CREATED,
+    SUBMISSION_DUPLICATE,
+    adjust_present_counts,
+    classes_needed,
+    correct_attendance,
+    get_subject_standings,
+    rebuild_attendance_summary,
+    rebuild_slot_summary,
+    record_attendance_counts,
+    submit_attendance,
+)
+
+
+class ClassFixture:
+    """
+    One section, subject CS101 taught by FAC001 and students STU000..
+    """
+
+    def create_class(self, students=2):
+        self.department = Department.objects.create(name="Computer Science")
+        self.course = Course.objects.create(course_name="B.Tech CSE", department=self.department, duration_years=4)
+        self.section = Section.objects.create(name="SEC-A", course=self.course, year=1)
+        self.faculty = User.objects.create(user_id="FAC001", password="x", role="FACULTY")
+        self.subject = Subject.objects.create(
+            subject_code="CS101",
+            subject_name="Programming Fundamentals",
+            department=self.department,
+            course=self.course,
+            semester=1,
+            faculty=self.faculty,
+        )
+        self.student_ids = []
+        for index in range(students):
+            student = User.objects.create(user_id=f"STU{index:03d}", password="x", role="STUDENT")
+            StudentProfile.objects.create(
+                user=student,
+                name=f"Student {index}",
+                roll_no=index,
+                department=self.department,
+                course=self.course,
+                section=self.section,
+                admission_year=2025,
+                parent_contact="",
+            )
+            self.student_ids.append(student.user_id)
+
+    def submit(self, day, statuses, marked_by="default", start=time(9, 0), subject=None, section=None, **kwargs):
+        return submit_attendance(
+            subject=subject or self.subject,
+            section=section or self.section,
+            day=day,
+            marked_by=self.faculty if marked_by == "default" else marked_by,
+            method="MANUAL",
+            statuses=statuses,
+            start_time=start,
+            end_time=time(start.hour + 1, start.minute),
+            **kwargs,
+        )[0]
+
+
+class ConcurrentSubmissionTests(ClassFixture, TransactionTestCase):
+    THREADS = 6
+
+    def setUp(self):
+        self.create_class(students=5)
+
+    def _submit_concurrently(self, keys):
+        statuses = {
+            student_id: "PRESENT" if index % 2 == 0 else "ABSENT"
+            for index, student_id in enumerate(self.student_ids)
+        }
+        barrier = threading.Barrier(len(keys))
+        outcomes = []
+        errors = []
+
+        def worker(key):
+            try:
+                barrier.wait()
+                _, outcome = submit_attendance(
+                    subject=self.subject,
+                    section=self.section,
+                    day=date(2026, 3, 2),
+                    marked_by=self.faculty,
+                    method="MANUAL",
+                    statuses=statuses,
+                    submission_key=key,
+                    start_time=time(9, 0),
+                    end_time=time(10, 0),
+                )
+                outcomes.append(outcome)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(key,)) for key in keys]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        return outcomes
+
+    def _assert_single_session_recorded(self):
+        self.assertEqual(AttendanceSession.objects.count(), 1)
+        self.assertEqual(AttendanceRecord.objects.count(), len(self.student_ids))
+        self.assertEqual(
+            sorted(AttendanceSummary.objects.values_list("total_count", flat=True)),
+            [1] * len(self.student_ids),
+        )
+
+    def test_different_devices_resolve_to_one_session(self):
+        outcomes = self._submit_concurrently([f"device-{index}" for index in range(self.THREADS)])
+
+        self.assertEqual(outcomes.count(SUBMISSION_CREATED), 1)
+        self.assertEqual(outcomes.count(SUBMISSION_CONFLICT), self.THREADS - 1)
+        self._assert_single_session_recorded()
+
+    def test_double_click_replay_is_idempotent(self):
+        outcomes = self._submit_concurrently(["same-key"] * self.THREADS)
+
+        self.assertEqual(outcomes.count(SUBMISSION_CREATED), 1)
+        self.assertEqual(outcomes.count(SUBMISSION_DUPLICATE), self.THREADS - 1)
+        self._assert_single_session_recorded()
+
+
+class SemesterArchiveTests(ClassFixture, TestCase):
+    def setUp(self):
+        self.create_class()
+        # STU000 attends everything, STU001 nothing.
+        for day in (date(2025, 9, 1), date(2025, 10, 6), date(2025, 12, 1), date(2026, 3, 2)):
+            self.submit(day, {"STU000": "PRESENT", "STU001": "ABSENT"})
+
+    def test_semester_boundaries(self):
+        self.assertEqual(semester_for(date(2026, 1, 1)), ("2026-S1", date(2026, 1, 1), date(2026, 7, 1)))
+        self.assertEqual(semester_for(date(2025, 12, 31)), ("2025-S2", date(2025, 7, 1), date(2026, 1, 1)))
+        with self.settings(SEMESTER_START_MONTHS=(8, 1)):
+            self.assertEqual(semester_for(date(2026, 9, 1))[0], "2026-S2")
+
+    def test_closed_semesters_move_to_archive_in_chunks(self):
+        archived = archive_closed_semesters(today=date(2026, 3, 10), chunk_size=2)
+
+        self.assertEqual(archived, {"2025-S2": 3})
+        self.assertEqual(list(AttendanceSession.objects.values_list("date", flat=True)), [date(2026, 3, 2)])
+        self.assertEqual(AttendanceRecord.objects.count(), 2)
+        self.assertEqual(set(ArchivedAttendanceSession.objects.values_list("semester", flat=True)), {"2025-S2"})
+        self.assertEqual(ArchivedAttendanceRecord.objects.count(), 6)
+        self.assertEqual(
+            dict(ArchivedAttendanceSummary.objects.values_list("student_id", "present_count")),
+            {"STU000": 3, "STU001": 0},
+        )
+        # Live counters are rebuilt from the current semester only.
+        self.assertEqual(sorted(AttendanceSummary.objects.values_list("total_count", flat=True)), [1, 1])
+
+        self.assertEqual(archive_closed_semesters(today=date(2026, 3, 10)), {})
+
+    def test_archive_is_queried_only_when_asked(self):
+        archive_closed_semesters(today=date(2026, 3, 10))
+
+        standings = get_archived_low_attendance_standings("2025-S2")
+        self.assertEqual([(row["student_id"], row["total"]) for row in standings], [("STU001", 3)])
+
+        live_rows = list(export_rows(*export_querysets()))
+        all_rows = list(export_rows(*export_querysets(include_archive=True)))
+        self.assertEqual(len(live_rows), 1 + 2)
+        self.assertEqual(len(all_rows), 1 + 8)
+        dates = [row[0] for row in all_rows[1:]]
+        self.assertEqual(dates, sorted(dates))
+
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        session = self.client.session
+        session["user_id"] = "ADM001"
+        session["role"] = "ADMIN"
+        session.save()
+        response = self.client.get("/admin/attendance-monitoring/", {"semester": "2025-S2"})
+        self.assertEqual(response.context["archived_semesters"], ["2025-S2"])
+        self.assertEqual(len(response.context["low_attendance_students"]), 1)
+
+
+class SlotSummaryTests(ClassFixture, TestCase):
+    def setUp(self):
+        self.create_class()
+        self.statuses = {"STU000": "PRESENT", "STU001": "ABSENT"}
+
+    def _slots(self):
+        return sorted(
+            AttendanceSlotSummary.objects.values_list(
+                "faculty_id", "day_of_week", "start_time", "present_count", "total_count"
+            ),
+            key=lambda row: (row[0] or "", row[1], row[2]),
+        )
+
+    def test_sessions_without_faculty_share_one_bucket(self):
+        for day in (date(2026, 3, 2), date(2026, 3, 9), date(2026, 3, 16)):
+            self.submit(day, self.statuses, marked_by=None)
+
+        self.assertEqual(self._slots(), [(None, "MON", time(9, 0), 3, 6)])
+
+    def test_rebuild_matches_incremental_counts(self):
+        self.submit(date(2026, 3, 2), self.statuses)
+        self.submit(date(2026, 3, 9), {"STU000": "PRESENT", "STU001": "PRESENT"})
+        self.submit(date(2026, 3, 16), self.statuses, marked_by=None)
+        self.submit(date(2026, 3, 3), self.statuses, start=time(11, 0))
+        incremental = self._slots()
+
+        self.assertEqual(rebuild_slot_summary(), 3)
+        self.assertEqual(self._slots(), incremental)
+        self.assertEqual(
+            incremental,
+            [
+                (None, "MON", time(9, 0), 1, 2),
+                ("FAC001", "MON", time(9, 0), 3, 4),
+                ("FAC001", "TUE", time(11, 0), 1, 2),
+            ],
+        )
+
+    def test_deleting_faculty_keeps_their_history(self):
+        substitute = User.objects.create(user_id="FAC002", password="x", role="FACULTY")
+        self.submit(date(2026, 3, 2), self.statuses, marked_by=substitute)
+        self.submit(date(2026, 3, 9), self.statuses, marked_by=None)
+
+        substitute.delete()
+        self.submit(date(2026, 3, 16), self.statuses, marked_by=None)
+
+        # Two unassigned rows now; only one was counted, readers sum both.
+        self.assertEqual(sum(row[4] for row in self._slots()), 6)
+        cell = slot_heatmap(section_id=self.section.id)["rows"][0]["cells"][0]
+        self.assertEqual((cell["present"], cell["total"]), (3, 6))
+
+
+class SummaryCounterTests(ClassFixture, TestCase):
+    def setUp(self):
+        self.create_class(students=3)
+        self.lab = Subject.objects.create(
+            subject_code="CS102",
+            subject_name="Programming Lab",
+            department=self.department,
+            course=self.course,
+            semester=1,
+            faculty=self.faculty,
+        )
+
+    def _summaries(self):
+        return sorted(
+            AttendanceSummary.objects.values_list("student_id", "subject_id", "present_count", "total_count")
+        )
+
+    def test_incremental_counters_match_a_rebuild(self):
+        first = self.submit(date(2026, 3, 2), {"STU000": "PRESENT", "STU001": "ABSENT", "STU002": "PRESENT"})
+        self.submit(date(2026, 3, 3), {"STU000": "ABSENT", "STU001": "ABSENT", "STU002": "PRESENT"})
+        submit_attendance(
+            subject=self.lab,
+            section=self.section,
+            day=date(2026, 3, 2),
+            marked_by=self.faculty,
+            method="MANUAL",
+            statuses={"STU000": "PRESENT", "STU001": "PRESENT"},
+            start_time=time(11, 0),
+            end_time=time(12, 0),
+        )
+        correct_attendance(first, {"STU001", "STU002"})
+
+        incremental = self._summaries()
+        self.assertEqual(
+            incremental,
+            [
+                ("STU000", self.subject.id, 0, 2),
+                ("STU000", self.lab.id, 1, 1),
+                ("STU001", self.subject.id, 1, 2),
+                ("STU001", self.lab.id, 1, 1),
+                ("STU002", self.subject.id, 2, 2),
+            ],
+        )
+        self.assertEqual(rebuild_attendance_summary(), 5)
+        self.assertEqual(self._summaries(), incremental)
+
+    def test_rebuild_recovers_from_drift(self):
+        self.submit(date(2026, 3, 2), {"STU000": "PRESENT", "STU001": "ABSENT"})
+        expected = self._summaries()
+        # The same session counted twice: the counters drift from the records.
+        record_attendance_counts(self.subject.id, ["STU000"], ["STU001"])
+        self.assertNotEqual(self._summaries(), expected)
+
+        rebuild_attendance_summary()
+
+        self.assertEqual(self._summaries(), expected)
+
+
+class ClassesNeededTests(TestCase):
+    def test_classes_to_reach_the_threshold(self):
+        cases = [
+            ((0, 1, 80), 4),
+            ((1, 2, 80), 3),
+            ((3, 10, 80), 25),
+            ((7, 10, 90), 20),
+            ((2, 4, 75), 4),
+            ((0, 3, 50), 3),
+        ]
+        for (present, total, threshold), expected in cases:
+            with self.subTest(present=present, total=total, threshold=threshold):
+                self.assertEqual(classes_needed(present, total, threshold), expected)
+                attended = present + expected
+                self.assertGreaterEqual(100 * attended, threshold * (total + expected))
+                self.assertLess(100 * (attended - 1), threshold * (total + expected - 1))
+
+    def test_reached_or_unreachable(self):
+        self.assertEqual(classes_needed(0, 0, 75), 0)
+        self.assertEqual(classes_needed(8, 10, 80), 0)
+        self.assertEqual(classes_needed(10, 10, 100), 0)
+        self.assertIsNone(classes_needed(9, 10, 100))
+
+
+class SubjectStandingTests(ClassFixture, TestCase):
+    def setUp(self):
+        self.create_class()
+        Subject.objects.filter(pk=self.subject.pk).update(min_attendance_percentage=80)
+        self.other = Subject.objects.create(
+            subject_code="CS102",
+            subject_name="Data Structures",
+            department=self.department,
+            course=self.course,
+            semester=2,
+            faculty=self.faculty,
+        )
+        for subject in (self.subject, self.other):
+            Enrollment.objects.create(student_id="STU000", subject=subject)
+        Enrollment.objects.create(student_id="STU001", subject=self.subject)
+        for day, status in ((2, "PRESENT"), (3, "ABSENT"), (4, "ABSENT")):
+            self.submit(date(2026, 3, day), {"STU000": status, "STU001": "PRESENT"})
+
+    def test_standing_per_enrolled_subject(self):
+        student = User.objects.get(user_id="STU000")
+        with self.assertNumQueries(1):
+            standings = get_subject_standings(student)
+
+        self.assertEqual([standing["subject_code"] for standing in standings], ["CS101", "CS102"])
+        below, untaught = standings
+        self.assertEqual(
+            {key: below[key] for key in ("present", "total", "percentage", "threshold", "classes_needed")},
+            {"present": 1, "total": 3, "percentage": 33.33, "threshold": 80, "classes_needed": 7},
+        )
+        self.assertTrue(below["is_below_threshold"])
+        # No sessions yet: no summary row, nothing needed.
+        self.assertEqual((untaught["total"], untaught["classes_needed"]), (0, 0))
+        self.assertFalse(untaught["is_below_threshold"])
+
+    def test_full_attendance_needs_nothing(self):
+        (standing,) = get_subject_standings(User.objects.get(user_id="STU001"))
+
+        self.assertEqual((standing["percentage"], standing["classes_needed"]), (100.0, 0))
+        self.assertFalse(standing["is_below_threshold"])
+
+
+class ExportTests(ClassFixture, TestCase):
+    def setUp(self):
+        self.create_class()
+        self.lab = Subject.objects.create(
+            subject_code="CS102",
+            subject_name="Programming Lab",
+            department=self.department,
+            course=self.course,
+            semester=1,
+            faculty=self.faculty,
+        )
+        self.other_section = Section.objects.create(name="SEC-B", course=self.course, year=1)
+        User.objects.create(user_id="STU100", password="x", role="STUDENT")
+        self.submit(date(2026, 3, 2), {"STU000": "PRESENT", "STU001": "ABSENT"})
+        self.submit(date(2026, 3, 3), {"STU000": "ABSENT"}, subject=self.lab, start=time(11, 0))
+        self.submit(date(2026, 3, 4), {"STU100": "PRESENT"}, section=self.other_section)
+
+    def _exported(self, **params):
+        rows = export_rows(*export_querysets(**parse_export_filters(params)))
+        self.assertEqual(next(rows), EXPORT_HEADER)
+        return [(row[0], row[3], row[7]) for row in rows]
+
+    def test_rows(self):
+        rows = list(export_rows(*export_querysets()))
+
+        self.assertEqual(rows[0], EXPORT_HEADER)
+        self.assertEqual(
+            rows[1],
+            [
+                "2026-03-02",
+                "09:00",
+                "10:00",
+                "CS101",
+                "Programming Fundamentals",
+                str(self.section),
+                "FAC001",
+                "STU000",
+                "Student 0",
+                0,
+                "PRESENT",
+                "",
+                "MANUAL",
+            ],
+        )
+        # No profile: name and roll number are left blank.
+        self.assertEqual(rows[-1][7:10], ["STU100", "", ""])
+        self.assertEqual(len(rows), 5)
+
+    def test_filters(self):
+        cases = [
+            ({}, 4),
+            ({"subject": str(self.lab.id)}, [("2026-03-03", "CS102", "STU000")]),
+            ({"section": str(self.other_section.id)}, [("2026-03-04", "CS101", "STU100")]),
+            ({"date_from": "2026-03-03", "date_to": "2026-03-03"}, [("2026-03-03", "CS102", "STU000")]),
+            ({"date_from": "2026-03-03"}, 2),
+            ({"faculty": "FAC999"}, []),
+        ]
+        for params, expected in cases:
+            with self.subTest(params):
+                rows = self._exported(**params)
+                self.assertEqual(len(rows) if isinstance(expected, int) else rows, expected)
+
+        with self.assertRaises(ValueError):
+            parse_export_filters({"date_from": "03/03/2026"})
+
+    def test_view_streams_the_csv(self):
+        session = self.client.session
+        session["user_id"] = "ADM001"
+        session["role"] = "ADMIN"
+        session.save()
+
+        response = self.client.get(reverse("export_attendance_csv"), {"subject": self.lab.id})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("attachment", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(
+            [row[:8] for row in csv.reader(StringIO(content))],
+            [
+                EXPORT_HEADER[:8],
+                ["2026-03-03", "11:00", "12:00", "CS102", "Programming Lab", str(self.section), "FAC001", "STU000"],
+            ],
+        )
+        self.assertEqual(self.client.get(reverse("export_attendance_csv"), {"section": "x"}).status_code, 400)
+
+    def test_view_requires_an_admin(self):
+        response = self.client.get(reverse("export_attendance_csv"))
+
+        self.assertRedirects(response, reverse("login"), fetch_redirect_response=False)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("export_attendance", "--section", str(self.other_section.id), stdout=out)
+
+        self.assertEqual(
+            [row[7] for row in csv.reader(StringIO(out.getvalue()))],
+            ["student_id", "STU100"],
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/export.csv"
+            err = StringIO()
+            call_command("export_attendance", "--from", "2026-03-03", "--output", path, stderr=err)
+            with open(path, newline="", encoding="utf-8") as handle:
+                self.assertEqual(len(list(csv.reader(handle))), 3)
+        self.assertIn("Exported 2 records", err.getvalue())
+
+
+class CorrectionTests(ClassFixture, TestCase):
+    def setUp(self):
+        self.create_class(students=3)
+        StudentProfile.objects.filter(user_id="STU000").update(parent_contact="parent@example.com")
+        self.session = self.submit(
+            date(2026, 3, 2), {"STU000": "PRESENT", "STU001": "ABSENT", "STU002": "PRESENT"}
+        )
+
+    def _state(self):
+        records = dict(AttendanceRecord.objects.filter(session=self.session).values_list("student_id", "status"))
+        summaries = {
+            summary.student_id: (summary.present_count, summary.total_count)
+            for summary in AttendanceSummary.objects.filter(subject=self.subject)
+        }
+        slot = AttendanceSlotSummary.objects.get()
+        return records, summaries, (slot.present_count, slot.total_count)
+
+    def test_present_to_absent_and_absent_to_present(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = correct_attendance(self.session, {"STU001", "STU002"})
+
+        self.assertEqual(result, (["STU001"], ["STU000"]))
+        records, summaries, slot = self._state()
+        self.assertEqual(records, {"STU000": "ABSENT", "STU001": "PRESENT", "STU002": "PRESENT"})
+        self.assertEqual(summaries, {"STU000": (0, 1), "STU001": (1, 1), "STU002": (1, 1)})
+        self.assertEqual(slot, (2, 3))
+        self.assertEqual([message.to for message in mail.outbox], [["parent@example.com"]])
+        self.assertTrue(
+            AttendanceRecord.objects.get(session=self.session, student_id="STU000").verified_by_faculty
+        )
+
+    def test_absent_to_present_only_moves_present_counts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = correct_attendance(self.session, {"STU000", "STU001", "STU002"})
+
+        self.assertEqual(result, (["STU001"], []))
+        records, summaries, slot = self._state()
+        self.assertEqual(set(records.values()), {"PRESENT"})
+        self.assertEqual(summaries, {"STU000": (1, 1), "STU001": (1, 1), "STU002": (1, 1)})
+        self.assertEqual(slot, (3, 3))
+        self.assertEqual(mail.outbox, [])
+
+    def test_unchanged_present_set_writes_nothing(self):
+        before = self._state()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks, CaptureQueriesContext(connection) as queries:
+            result = correct_attendance(self.session, {"STU000", "STU002", "STU999"})
+
+        self.assertEqual(result, ([], []))
+        # The locked read of the records, nothing else.
+        self.assertEqual([query["sql"].split()[0] for query in queries], ["SAVEPOINT", "SELECT", "RELEASE"])
+        self.assertEqual(self._state(), before)
+        self.assertEqual(callbacks, [])
+
+
+class SyncBatchTests(ClassFixture, TestCase):
+    MONDAY = date(2026, 3, 2)
+
+    def setUp(self):
+        self.create_class()
+        for day in ("MON", "TUE", "WED"):
+            ClassSchedule.objects.create(
+                subject=self.subject,
+                faculty=self.faculty,
+                section=self.section,
+                day_of_week=day,
+                start_time=time(9, 0),
+                end_time=time(10, 0),
+                room="Room-101",
+            )
+        Enrollment.objects.bulk_create(
+            [Enrollment(student_id=student_id, subject=self.subject) for student_id in self.student_ids]
+        )
+        session = self.client.session
+        session["user_id"] = "FAC001"
+        session["role"] = "FACULTY"
+        session.save()
+
+    def _session(self, key, days_after_monday=0, **overrides):
+        payload = {
+            "client_id": key,
+            "submission_key": key,
+            "subject": self.subject.id,
+            "section": self.section.id,
+            "date": (self.MONDAY + timedelta(days=days_after_monday)).isoformat(),
+            "records": [{"student": "STU000", "status": "PRESENT"}],
+        }
+        payload.update(overrides)
+        return payload
+
+    def _sync(self, *sessions):
+        response = self.client.post("/attendance/sync/", {"sessions": list(sessions)}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return [(result["status"], result["errors"]) for result in response.json()["results"]]
+
+    def test_replayed_batch_is_reported_duplicate(self):
+        batch = [self._session("k-mon"), self._session("k-tue", 1)]
+        self.assertEqual([status for status, _ in self._sync(*batch)], ["CREATED", "CREATED"])
+        self.assertEqual([status for status, _ in self._sync(*batch)], ["DUPLICATE", "DUPLICATE"])
+
+        self.assertEqual(AttendanceRecord.objects.count(), 4)
+        self.assertEqual(AttendanceSummary.objects.get(student_id="STU000").present_count, 2)
+        # Students the device left out are recorded absent.
+        self.assertEqual(AttendanceSummary.objects.get(student_id="STU001").present_count, 0)
+
+    def test_reused_submission_keys_are_reported_per_session(self):
+        results = self._sync(self._session("k"), self._session("k", 1), self._session("k"))
+        self.assertEqual([status for status, _ in results], ["CREATED", "INVALID", "DUPLICATE"])
+
+        # The key already belongs to Monday's session.
+        (status, errors), = self._sync(self._session("k", 2))
+        self.assertEqual(status, "CONFLICT")
+        self.assertEqual(errors, ["submission_key was already used for another session."])
+        self.assertEqual(AttendanceSession.objects.filter(confirmed=True).count(), 1)
+
+    def test_mixed_batch_writes_only_valid_sessions(self):
+        results = self._sync(
+            self._session("ok"),
+            self._session("stranger", 1, records=[{"student": "STU999", "status": "PRESENT"}]),
+            self._session("future", date=(date.today() + timedelta(days=7)).isoformat()),
+            self._session("thursday", 3),
+            "not an object",
+            self._session("bad-status", 2, records=[{"student": "STU000", "status": "LATE"}]),
+        )
+
+        self.assertEqual(
+            [status for status, _ in results],
+            ["CREATED", "INVALID", "INVALID", "INVALID", "INVALID", "INVALID"],
+        )
+        self.assertEqual(results[3][1], ["No matching class in your timetable."])
+        self.assertEqual(
+            list(AttendanceSession.objects.filter(confirmed=True).values_list("submission_key", flat=True)),
+            ["ok"],
+        )
+
+
+class RiskFeatureTests(ClassFixture, TestCase):
+    CUTOFF = date(2026, 3, 31)
+
+    def _history(self, thresholds=None):
+        # (student, subject, day, present), sorted by student then day.
+        rows = [
+            (0, 1, date(2026, 2, 2), True),
+            (0, 1, date(2026, 2, 9), False),
+            (0, 2, date(2026, 2, 10), False),
+            (0, 1, date(2026, 2, 16), False),
+            (0, 1, date(2026, 3, 9), True),
+            (0, 2, date(2026, 3, 10), False),
+            (0, 1, date(2026, 3, 16), False),
+            (0, 1, date(2026, 4, 6), True),
+            (1, 1, date(2026, 3, 9), False),
+            (1, 1, date(2026, 3, 16), False),
+        ]
+        students, subjects, days, present = zip(*rows)
+        return AttendanceHistory(
+            student_ids=["STU000", "STU001", "STU002"],
+            students=students,
+            subjects=subjects,
+            days=days,
+            present=present,
+            student_sections=[10, 10, 20],
+            remedial_sections=[10, 10, 10],
+            remedial_days=[date(2026, 3, 5), date(2026, 3, 12), date(2026, 4, 2)],
+            remedial_students=[0],
+            remedial_attended_days=[date(2026, 3, 5)],
+            thresholds=thresholds,
+        )
+
+    def _seeded_history(self, n_students=40, n_days=60, seed=7):
+        rng = np.random.default_rng(seed)
+        start = np.datetime64("2026-01-05")
+        attendance = rng.uniform(0.4, 1.0, n_students)
+        rows = [
+            (student, day % 3, start + np.timedelta64(day, "D"), rng.random() < attendance[student])
+            for student in range(n_students)
+            for day in range(n_days)
+        ]
+        students, subjects, days, present = zip(*rows)
+        return AttendanceHistory(
+            student_ids=[f"STU{index:03d}" for index in range(n_students)],
+            students=students,
+            subjects=subjects,
+            days=days,
+            present=present,
+            student_sections=[student % 2 for student in range(n_students)],
+            remedial_sections=[],
+            remedial_days=[],
+            remedial_students=[],
+            remedial_attended_days=[],
+        )
+
+    def test_features_on_a_small_history(self):
+        features = build_features(self._history(), cutoff=self.CUTOFF)
+
+        np.testing.assert_allclose(
+            features,
+            [
+                # 2/7 overall; 1/3 in the last 28 days against 1/4 before;
+                # three absences across subjects, then two trailing.
+                [2 / 7, 1 / 3 - 1 / 4, 3, 2, 0.0, 0.5],
+                # Only recent records, so no trend; the streak does not
+                # run on from STU000's trailing absences.
+                [0.0, 0.0, 2, 2, 0.0, 0.0],
+                # No records and no remedial sessions offered.
+                [1.0, 0.0, 0, 0, 1.0, 1.0],
+            ],
+        )
+
+    def test_cutoff_bounds_records_and_remedials(self):
+        features = build_features(self._history())
+
+        # The April record ends STU000's streak; the April remedial counts.
+        self.assertEqual(features[0][2:4].tolist(), [3, 0])
+        np.testing.assert_allclose(features[:2, 5], [1 / 3, 0.0])
+
+    def test_labels_cover_students_with_records_after_the_cutoff(self):
+        labels, has_label = build_labels(self._history(), date(2026, 3, 3))
+
+        self.assertEqual(has_label.tolist(), [True, True, False])
+        self.assertEqual(labels[has_label].tolist(), [1.0, 1.0])
+
+    def test_labels_use_each_subject_minimum(self):
+        # Subject 1 needs 60%, subject 2 nothing.
+        history = self._history(thresholds=[60 if subject == 1 else 0 for subject in self._history().subjects])
+        labels, has_label = build_labels(history, date(2026, 3, 3))
+
+        # STU000 attended 2/3 of subject 1; STU001 none of it.
+        self.assertEqual(labels[has_label].tolist(), [0.0, 1.0])
+
+    def test_history_reads_subject_minimums(self):
+        self.create_class()
+        Subject.objects.filter(pk=self.subject.pk).update(min_attendance_percentage=80)
+        for day in range(2, 6):
+            self.submit(date(2026, 3, day), {"STU000": "PRESENT", "STU001": "ABSENT" if day == 5 else "PRESENT"})
+
+        history = AttendanceHistory.load()
+        labels, has_label = build_labels(history, date(2026, 3, 1))
+
+        self.assertEqual(history.thresholds.tolist(), [80.0] * 8)
+        # STU001 attended 75%: enough for the default, not for this subject.
+        self.assertEqual(labels.tolist(), [0.0, 1.0])
+        self.assertEqual(has_label.tolist(), [True, True])
+
+    def test_training_and_scoring_are_deterministic(self):
+        history = self._seeded_history()
+        first = train_risk_model(history)
+        second = train_risk_model(self._seeded_history())
+
+        np.testing.assert_array_equal(first.weights, second.weights)
+        self.assertEqual(first.bias, second.bias)
+        features = build_features(history)
+        np.testing.assert_array_equal(first.predict_proba(features), second.predict_proba(features))
+
+        with tempfile.TemporaryDirectory() as directory:
+            loaded = LogisticRiskModel.load(first.save(f"{directory}/model.npz"))
+            np.testing.assert_array_equal(loaded.predict_proba(features), first.predict_proba(features))
+
+    def test_students_without_history(self):
+        self.create_class()
+        history = AttendanceHistory.load()
+
+        self.assertEqual(history.student_ids.tolist(), ["STU000", "STU001"])
+        self.assertEqual(build_features(history).tolist(), [[1.0, 0.0, 0, 0, 1.0, 1.0]] * 2)
+        self.assertIsNone(train_risk_model(history))
+        with tempfile.TemporaryDirectory() as directory, self.assertRaises(ValueError):
+            score_students(directory=directory)
+
+
+class SnapshotMatrixTests(ClassFixture, TestCase):
+    """
+    The vectorized matrix queries against a per-row walk of the records.
+    """
+
+    def setUp(self):
+        self.create_class(students=6)
+        rng = random.Random(28)
+        days = sorted(rng.sample([date(2026, 2, 2) + timedelta(days=offset) for offset in range(40)], 22))
+        for day in days:
+            session = AttendanceSession.objects.create(
+                subject=self.subject,
+                section=self.section,
+                date=day,
+                start_time=time(9, 0),
+                end_time=time(10, 0),
+                marked_by=self.faculty,
+                method="MANUAL",
+                confirmed=day != days[-1],
+            )
+            AttendanceRecord.objects.bulk_create(
+                [
+                    AttendanceRecord(
+                        session=session,
+                        student_id=student_id,
+                        status="PRESENT" if rng.random() < 0.4 + 0.1 * index else "ABSENT",
+                    )
+                    for index, student_id in enumerate(self.student_ids)
+                    # Some students have no record for some sessions.
+                    if rng.random() > 0.1
+                ]
+            )
+
+        with tempfile.TemporaryDirectory() as directory:
+            build_snapshots(directory=directory)
+            self.matrix = AttendanceMatrix.for_class(self.section.id, self.subject.id, directory)
+
+        self.dates = list(
+            AttendanceSession.objects.filter(confirmed=True).order_by("date").values_list("date", flat=True)
+        )
+        self.rows = {student_id: [None] * len(self.dates) for student_id in self.student_ids}
+        column = {day: index for index, day in enumerate(self.dates)}
+        for student_id, day, status in AttendanceRecord.objects.filter(session__confirmed=True).values_list(
+            "student_id", "session__date", "status"
+        ):
+            self.rows[student_id][column[day]] = status
+
+    @staticmethod
+    def _percentage(statuses):
+        recorded = [status for status in statuses if status is not None]
+        if not recorded:
+            return np.nan
+        return recorded.count("PRESENT") * 100.0 / len(recorded)
+
+    def test_matrix_matches_records(self):
+        self.assertEqual(self.matrix.student_ids.tolist(), self.student_ids)
+        self.assertEqual(self.matrix.session_dates.tolist(), self.dates)
+        np.testing.assert_allclose(
+            self.matrix.attendance_percentage(),
+            [self._percentage(self.rows[student_id]) for student_id in self.student_ids],
+        )
+
+    def test_absence_streaks_match_per_row_walk(self):
+        expected = []
+        for student_id in self.student_ids:
+            longest = run = 0
+            for status in self.rows[student_id]:
+                run = run + 1 if status == "ABSENT" else 0
+                longest = max(longest, run)
+            expected.append(longest)
+
+        self.assertEqual(self.matrix.longest_absence_streaks().tolist(), expected)
+        self.assertEqual(
+            self.matrix.students_with_absence_streak(3),
+            {student_id: longest for student_id, longest in zip(self.student_ids, expected) if longest >= 3},
+        )
+
+    def test_weekly_buckets_match_per_row_grouping(self):
+        weeks = {}
+        for index, day in enumerate(self.dates):
+            weeks.setdefault(day - timedelta(days=day.weekday()), []).append(index)
+
+        week_starts, percentages = self.matrix.weekly_percentage()
+
+        self.assertEqual(week_starts.tolist(), list(weeks))
+        np.testing.assert_allclose(
+            percentages,
+            [
+                [self._percentage([self.rows[student_id][index] for index in columns]) for columns in weeks.values()]
+                for student_id in self.student_ids
+            ],
+        )
+
+    def test_rolling_windows_match_per_row_slices(self):
+        for window in (1, 5, len(self.dates)):
+            np.testing.assert_allclose(
+                self.matrix.rolling_percentage(window),
+                [
+                    [
+                        self._percentage(self.rows[student_id][start:start + window])
+                        for start in range(len(self.dates) - window + 1)
+                    ]
+                    for student_id in self.student_ids
+                ],
+            )
+        self.assertEqual(self.matrix.rolling_percentage(len(self.dates) + 1).shape, (6, 0))
+
+
+class OverlappingPresenceTests(ClassFixture, TestCase):
+    def setUp(self):
+        self.create_class()
+        self.day = date(2026, 3, 2)
+
+    def _present(self, start, end, student_id="STU000", day=None, status="PRESENT", confirmed=True):
+        # A separate subject per session keeps (subject, date, section) unique.
+        subject = Subject.objects.create(
+            subject_code=f"CS{Subject.objects.count() + 101}",
+            subject_name="Elective",
+            department=self.department,
+            course=self.course,
+            semester=1,
+            faculty=self.faculty,
+        )
+        session = AttendanceSession.objects.create(
+            subject=subject,
+            section=self.section,
+            date=day or self.day,
+            start_time=start,
+            end_time=end,
+            marked_by=self.faculty,
+            method="MANUAL",
+            confirmed=confirmed,
+        )
+        AttendanceRecord.objects.create(session=session, student_id=student_id, status=status)
+        return session
+
+    def _pairs(self):
+        return [
+            (anomaly["student_id"], anomaly["first"]["session_id"], anomaly["second"]["session_id"])
+            for anomaly in find_overlapping_presence()
+        ]
+
+    def test_no_records(self):
+        self.assertEqual(self._pairs(), [])
+
+    def test_overlapping_windows_are_paired(self):
+        first = self._present(time(9, 0), time(10, 0))
+        second = self._present(time(9, 30), time(10, 30))
+        # Overlaps the second only; the first has closed by 10:00.
+        third = self._present(time(10, 0), time(11, 0))
+
+        self.assertEqual(self._pairs(), [("STU000", first.id, second.id), ("STU000", second.id, third.id)])
+
+    def test_windows_inside_a_long_session_all_overlap_it(self):
+        lab = self._present(time(9, 0), time(12, 0))
+        first = self._present(time(9, 0), time(10, 0))
+        second = self._present(time(11, 0), time(12, 0))
+
+        self.assertEqual(self._pairs(), [("STU000", lab.id, first.id), ("STU000", lab.id, second.id)])
+
+    def test_adjacent_and_unrelated_windows_are_not_paired(self):
+        self._present(time(9, 0), time(10, 0))
+        self._present(time(10, 0), time(11, 0))
+        # Same times on another day, for another student, absent or unconfirmed.
+        self._present(time(9, 30), time(10, 30), day=date(2026, 3, 3))
+        self._present(time(9, 30), time(10, 30), student_id="STU001")
+        self._present(time(9, 30), time(10, 30), status="ABSENT")
+        self._present(time(9, 30), time(10, 30), confirmed=False)
+
+        self.assertEqual(self._pairs(), [])
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    REQUESTS = [
+        ("mark_attendance", "FACULTY", {}, ["", "?subject={subject}&section={section}"]),
+        ("auto_detect_attendance", "FACULTY", {}, {"post": {}}),
+        ("export_attendance_csv", "ADMIN", {}, [""]),
+        ("sync_attendance", "FACULTY", {}, {"json": {"sessions": []}}),
+        ("correct_attendance", "FACULTY", {"session_id": "{session}"}, [""]),
+    ]
+    ADMIN_APPS = ("attendance",)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTests(ClassFixture, QueryPlanMixin, TestCase):
+    # Django's name for the unique_together ('student', 'subject') index.
+    SUMMARY_INDEX = "attendance_attendancesummary_student_id_subject_id_8eac4604_uniq"
+
+    def setUp(self):
+        self.create_class()
+        self.day = date(2026, 3, 2)
+        self.submit(self.day, {"STU000": "PRESENT", "STU001": "ABSENT"})
+
+    def test_summary_counters(self):
+        present, absent = self.student_ids
+        Enrollment.objects.create(student_id=present, subject=self.subject)
+
+        for run in (
+            partial(record_attendance_counts, self.subject.id, [present], [absent]),
+            partial(adjust_present_counts, self.subject.id, [absent], [present]),
+            partial(get_subject_standings, present),
+        ):
+            self.assertUsesIndex(run, "attendance_attendancesummary", self.SUMMARY_INDEX)
+
+    def test_sessions_today(self):
+        sessions_today = next(kpi for kpi in KPIS if kpi.name == "attendance_sessions_today")
+        self.assertUsesIndex(
+            partial(sessions_today.compute, self.day),
+            "attendance_attendancesession",
+            "session_date_confirmed_idx",
+        )
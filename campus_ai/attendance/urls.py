@@ -1,7 +1,16 @@
 from django.urls import path
-from .views import mark_attendance, auto_detect_attendance
+from .views import (
+    mark_attendance,
+    auto_detect_attendance,
+    correct_attendance_view,
+    export_attendance_csv,
+    sync_attendance,
+)
 
 urlpatterns = [
     path('mark/', mark_attendance, name='mark_attendance'),
     path('auto-detect/', auto_detect_attendance, name='auto_detect_attendance'),
+    path('export/', export_attendance_csv, name='export_attendance_csv'),
+    path('sync/', sync_attendance, name='sync_attendance'),
+    path('correct/<int:session_id>/', correct_attendance_view, name='correct_attendance'),
 ]
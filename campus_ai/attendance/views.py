@@ -1,17 +1,23 @@
 import base64
+import json
 import os
 import uuid
 from datetime import date
 
 from django.conf import settings
-from django.shortcuts import render, redirect
+from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 
 from accounts.models import User
-from academics.models import ClassSchedule, Subject, Enrollment, Section
-from .models import AttendanceSession, AttendanceRecord
+from academics.models import Subject, Enrollment, Section
+from academics.timetable import get_timetable_index
+from core.db_router import reporting_iterator
+from .exports import export_querysets, export_rows, parse_export_filters, stream_csv
+from .sync import MAX_SYNC_BATCH, sync_attendance_batch
+from .models import AttendanceRecord, AttendanceSession
+from .services import SUBMISSION_CONFLICT, SUBMISSION_DUPLICATE, correct_attendance, submit_attendance
 from ml.utils import get_present_students
 from notifications.utils import send_absent_email
 
@@ -29,44 +35,32 @@ def mark_attendance(request):
     """
 
     # Keep existing flow, but prefer session faculty when available.
-    faculty = None
-    session_user_id = request.session.get("user_id")
-    session_role = request.session.get("role")
-    if session_user_id and session_role == "FACULTY":
-        faculty = User.objects.filter(user_id=session_user_id, role="FACULTY", is_active=True).first()
+    faculty = request.current_user if request.session.get("role") == "FACULTY" else None
     if not faculty:
         faculty = User.objects.get(user_id='FAC001')
 
-    weekday_map = {
-        0: "MON",
-        1: "TUE",
-        2: "WED",
-        3: "THU",
-        4: "FRI",
-        5: "SAT",
-        6: "SUN",
-    }
-    today_code = weekday_map[date.today().weekday()]
-    today_schedules = ClassSchedule.objects.filter(
-        faculty=faculty,
-        day_of_week=today_code,
-    ).select_related("subject", "section").order_by("start_time")
+    timetable = get_timetable_index(date.today())
+    today_code = timetable.day_code
+    today_schedules = timetable.for_faculty(faculty.user_id)
 
     current_time = timezone.localtime(timezone.now()).time()
-    active_class = today_schedules.filter(
-        start_time__lte=current_time,
-        end_time__gte=current_time,
-    ).first()
+    active_class = timetable.active_for_faculty(faculty.user_id, current_time)
 
-    subjects = Subject.objects.filter(
-        id__in=today_schedules.values_list("subject_id", flat=True).distinct()
-    ).select_related("course")
+    subjects = list({schedule.subject_id: schedule.subject for schedule in today_schedules}.values())
+
+    def scheduled_sections(subject):
+        # Distinct sections for this subject from today's scheduled classes
+        return list({
+            schedule.section_id: schedule.section
+            for schedule in today_schedules
+            if schedule.subject_id == subject.id
+        }.values())
 
     selected_subject = None
     selected_section = None
     sections = []
     enrollments = []
-    no_classes_today = not today_schedules.exists()
+    no_classes_today = not today_schedules
 
     # ==============================
     # GET REQUEST (Load Subject + Section)
@@ -76,11 +70,7 @@ def mark_attendance(request):
 
     if subject_id:
         selected_subject = Subject.objects.get(id=subject_id)
-
-        # Get distinct sections for this subject from today's scheduled classes
-        sections = Section.objects.filter(
-            id__in=today_schedules.filter(subject=selected_subject).values_list("section_id", flat=True).distinct()
-        )
+        sections = scheduled_sections(selected_subject)
 
         if section_id:
             selected_section = Section.objects.get(id=section_id)
@@ -95,9 +85,7 @@ def mark_attendance(request):
     elif active_class:
         selected_subject = active_class.subject
         selected_section = active_class.section
-        sections = Section.objects.filter(
-            id__in=today_schedules.filter(subject=selected_subject).values_list("section_id", flat=True).distinct()
-        )
+        sections = scheduled_sections(selected_subject)
         enrollments = Enrollment.objects.filter(
             subject=selected_subject,
             student__studentprofile__section=selected_section
@@ -117,6 +105,20 @@ def mark_attendance(request):
         selected_subject = Subject.objects.get(id=subject_id)
         selected_section = Section.objects.get(id=section_id)
 
+        scheduled_slot = next(
+            (
+                schedule for schedule in today_schedules
+                if schedule.subject_id == selected_subject.id and schedule.section_id == selected_section.id
+            ),
+            None,
+        )
+        if not scheduled_slot:
+            messages.error(
+                request,
+                "This class is not in your timetable today."
+            )
+            return redirect(request.path)
+
         enrollments = Enrollment.objects.filter(
             subject=selected_subject,
             student__studentprofile__section=selected_section
@@ -165,72 +167,68 @@ def mark_attendance(request):
             # format: {'STU001': 0.91}
 
         # ----------------------------
-        # 3️⃣ Duplicate Session Protection
+        # 3️⃣ Build Attendance Statuses
         # ----------------------------
-        existing_session = AttendanceSession.objects.filter(
-            subject=selected_subject,
-            section=selected_section,
-            date=date.today()
-        ).first()
-
-        if existing_session:
-            messages.warning(
-                request,
-                "Attendance already marked for this subject & section today."
-            )
-            return redirect(
-                f"{request.path}?subject={subject_id}&section={section_id}"
-            )
-
-        # ----------------------------
-        # 4️⃣ Create Attendance Session
-        # ----------------------------
-        session = AttendanceSession.objects.create(
-            subject=selected_subject,
-            section=selected_section,
-            date=date.today(),
-            start_time="09:00",
-            end_time="10:00",
-            marked_by=faculty,
-            method=attendance_method,
-            confirmed=True
-        )
+        statuses = {}
+        confidences = {}
+        students = {}
 
-        # ----------------------------
-        # 5️⃣ Save Attendance Records
-        # ----------------------------
         for enrollment in enrollments:
             student = enrollment.student
+            students[student.user_id] = student
 
             status = "ABSENT"
-            confidence = None
 
             # Auto detection result
             if student.user_id in auto_present_students:
                 status = "PRESENT"
-                confidence = auto_present_students[student.user_id]
+                confidences[student.user_id] = auto_present_students[student.user_id]
 
             # Manual override
             if request.POST.get(student.user_id):
                 status = "PRESENT"
 
-            AttendanceRecord.objects.create(
-                session=session,
-                student=student,
-                status=status,
-                confidence_score=confidence,
-                verified_by_faculty=True
-            )
-
-            # Email notification
-            if status == "ABSENT":
-                send_absent_email(student, selected_subject, session)
+            statuses[student.user_id] = status
 
-        messages.success(
-            request,
-            f"Attendance saved successfully ({attendance_method} mode)"
+        # ----------------------------
+        # 4️⃣ Idempotent Session + Records
+        # ----------------------------
+        session, outcome = submit_attendance(
+            subject=selected_subject,
+            section=selected_section,
+            day=date.today(),
+            marked_by=faculty,
+            method=attendance_method,
+            statuses=statuses,
+            confidences=confidences,
+            submission_key=request.POST.get("submission_key") or uuid.uuid4().hex,
+            start_time=scheduled_slot.start_time,
+            end_time=scheduled_slot.end_time,
         )
 
+        if outcome == SUBMISSION_CONFLICT:
+            messages.warning(
+                request,
+                "Attendance already marked for this subject & section today."
+            )
+        elif outcome == SUBMISSION_DUPLICATE:
+            messages.info(
+                request,
+                "This attendance submission was already saved."
+            )
+        else:
+            # ----------------------------
+            # 5️⃣ Email notification
+            # ----------------------------
+            for student_id, status in statuses.items():
+                if status == "ABSENT":
+                    send_absent_email(students[student_id], selected_subject, session)
+
+            messages.success(
+                request,
+                f"Attendance saved successfully ({attendance_method} mode)"
+            )
+
         return redirect(
             f"{request.path}?subject={subject_id}&section={section_id}"
         )
@@ -238,6 +236,15 @@ def mark_attendance(request):
     # ==============================
     # Render Page
     # ==============================
+    marked_session = None
+    if selected_subject and selected_section:
+        marked_session = AttendanceSession.objects.filter(
+            subject=selected_subject,
+            section=selected_section,
+            date=date.today(),
+            confirmed=True,
+        ).first()
+
     return render(request, "attendance/mark_attendance.html", {
         "subjects": subjects,
         "selected_subject": selected_subject,
@@ -247,6 +254,57 @@ def mark_attendance(request):
         "today_code": today_code,
         "no_classes_today": no_classes_today,
         "active_class": active_class,
+        "submission_key": uuid.uuid4().hex,
+        "marked_session": marked_session,
+    })
+
+
+# =========================================================
+# EDIT-IN-PLACE CORRECTION OF A MARKED SESSION
+# =========================================================
+def correct_attendance_view(request, session_id):
+    """
+    Faculty who marked (or teach) a session submit the final present
+    set; only flipped records are written.
+    """
+
+    faculty = request.current_user
+    if request.session.get("role") != "FACULTY" or not faculty:
+        return redirect("login")
+
+    session = get_object_or_404(
+        AttendanceSession.objects.select_related("subject", "section"),
+        id=session_id,
+        confirmed=True,
+    )
+    if faculty.user_id not in (session.marked_by_id, session.subject.faculty_id):
+        messages.error(request, "You can only correct attendance for your own classes.")
+        return redirect("mark_attendance")
+
+    if request.method == "POST":
+        marked_present, marked_absent = correct_attendance(
+            session,
+            request.POST.getlist("present"),
+        )
+        if marked_present or marked_absent:
+            messages.success(
+                request,
+                f"Attendance corrected: {len(marked_present)} marked present, "
+                f"{len(marked_absent)} marked absent."
+            )
+        else:
+            messages.info(request, "No changes to save.")
+        return redirect("correct_attendance", session_id=session.id)
+
+    records = (
+        AttendanceRecord.objects.filter(session=session)
+        .select_related("student__studentprofile")
+        .order_by("student__studentprofile__roll_no", "student_id")
+    )
+
+    return render(request, "attendance/correct_attendance.html", {
+        "session": session,
+        "records": records,
     })
 
 # =========================================================
@@ -284,3 +342,53 @@ def auto_detect_attendance(request):
         "present_students": list(detected.keys()),
         "confidence": detected
     })
+
+
+# =========================================================
+# CSV EXPORT — Streams any date range without buffering
+# =========================================================
+def export_attendance_csv(request):
+    if request.session.get("role") != "ADMIN":
+        return redirect("login")
+
+    try:
+        filters = parse_export_filters(request.GET)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid export filters")
+
+    rows = export_rows(*export_querysets(**filters))
+    response = StreamingHttpResponse(reporting_iterator(stream_csv(rows)), content_type="text/csv")
+    response["Content-Disposition"] = 'attachment; filename="attendance_export.csv"'
+    return response
+
+
+# =========================================================
+# JSON BATCH SYNC — Offline queued sessions from faculty devices
+# =========================================================
+def sync_attendance(request):
+    """
+    Accepts {"sessions": [...]} where each session carries subject,
+    section, date, optional start_time, method, submission_key and
+    records [{"student", "status", "confidence"}]. Responds with one
+    result per session so the device can retry only the failures.
+    """
+
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request"}, status=400)
+
+    faculty = request.current_user
+    if request.session.get("role") != "FACULTY" or not faculty:
+        return JsonResponse({"error": "Faculty login required"}, status=403)
+
+    try:
+        payload = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    sessions = payload.get("sessions") if isinstance(payload, dict) else None
+    if not isinstance(sessions, list):
+        return JsonResponse({"error": "sessions must be a list"}, status=400)
+    if len(sessions) > MAX_SYNC_BATCH:
+        return JsonResponse({"error": f"At most {MAX_SYNC_BATCH} sessions per batch"}, status=400)
+
+    return JsonResponse({"results": sync_attendance_batch(faculty, sessions)})
@@ -49,7 +49,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
+    'core.middleware.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'accounts.middleware.CurrentUserMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -84,9 +87,80 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Take the write lock at BEGIN and wait for it, so concurrent
+        # attendance submissions queue instead of failing "database is locked".
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        'TEST': {
+            # File-backed so threaded tests get independent connections.
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    },
+    # Read-only copy of the primary for reporting pages, refreshed by
+    # `python manage.py sync_replica`. Only used when READ_REPLICA is set.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['core.db_router.ReadReplicaRouter']
+
+# Alias that reads inside core.db_router.reporting_database() go to
+# (admin dashboards, monitoring pages, the attendance CSV export). Set to
+# 'replica' once sync_replica is running; None keeps every read on the
+# primary. A request that writes reads from the primary for the rest of
+# the request.
+
+READ_REPLICA = None
+
+
+# Cache
+# Shared by every worker on the host, so version stamps (e.g. the
+# timetable index) stay consistent across processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.django_cache',
     }
 }
 
+# `manage.py test` swaps this for a LocMemCache (core.test_runner).
+
+TEST_RUNNER = 'core.test_runner.CampusTestRunner'
+
+
+# Dashboards
+# When serving through asgi.py, route the admin / faculty / student
+# dashboards to their async views, which run independent queries
+# concurrently (each on its own database connection).
+
+ASYNC_DASHBOARDS = False
+
+
+# Query budget
+# core.middleware.QueryBudgetMiddleware logs a warning for requests that
+# run more queries than this (outside DEBUG, where it sets headers).
+
+QUERY_BUDGET = 50
+
+
+# Semesters
+# Months on whose first day a semester starts. attendance.archive moves
+# sessions and records dated before the current semester into the
+# archive tables, so the live tables hold about one semester.
+
+SEMESTER_START_MONTHS = (1, 7)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
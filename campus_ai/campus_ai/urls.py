@@ -22,6 +22,7 @@ from core import views as core_views
 
 urlpatterns = [
     path("admin/attendance-monitoring/", core_views.admin_attendance_monitoring, name="admin_attendance_monitoring"),
+    path("admin/attendance-heatmap/", core_views.admin_attendance_heatmap, name="admin_attendance_heatmap"),
     path("admin/operations-monitoring/", core_views.admin_operations_monitoring, name="admin_operations_monitoring"),
     path('admin/', admin.site.urls),
     path('', include('core.urls')),
@@ -18,6 +18,7 @@ class StallAdmin(admin.ModelAdmin):
 @admin.register(MenuItem)
 class MenuItemAdmin(admin.ModelAdmin):
     list_display = ("name", "stall", "price", "is_available")
+    list_select_related = ("stall",)
     list_filter = ("stall", "is_available")
     search_fields = ("name",)
 
@@ -56,5 +57,6 @@ class OrderAdmin(admin.ModelAdmin):
         "recommendation_used",
     )
     list_filter = ("status", "stall", "timeslot", "recommendation_used")
+    list_select_related = ("student", "stall", "timeslot")
     search_fields = ("student__user_id",)
     inlines = [OrderItemInline]
@@ -95,8 +95,22 @@ class Order(models.Model):
 
     recommendation_used = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Active load of every stall in a timeslot, grouped by stall
+            # (StallRecommendationEngine).
+            models.Index(fields=['timeslot', 'status', 'stall'], name='order_slot_status_stall_idx'),
+            # A student's orders, newest first (student dashboard, my orders).
+            models.Index(fields=['student', 'order_time'], name='order_student_time_idx'),
+            # A student's pending orders (student dashboard count). Without it
+            # SQLite answers the count from order_status_stall_idx.
+            models.Index(fields=['student', 'status'], name='order_student_status_idx'),
+            # Pending / active orders across stalls (admin operations page).
+            models.Index(fields=['status', 'stall'], name='order_status_stall_idx'),
+        ]
+
     def __str__(self):
-        return f"Order #{self.id} - {self.student.user_id}"
+        return f"Order #{self.id} - {self.student_id}"
 
 
 # =====================================================
@@ -19,16 +19,31 @@ class StallRecommendationEngine:
     def __init__(self, timeslot):
         self.timeslot = timeslot
         self.stalls = Stall.objects.filter(is_active=True)
+        self._loads = None
 
     # ------------------------------------------------------
     # Current Load
     # ------------------------------------------------------
-    def get_current_load(self, stall):
-        return Order.objects.filter(
-            stall=stall,
-            timeslot=self.timeslot,
-            status__in=self.ACTIVE_STATUSES
-        ).count()
+    def get_current_loads(self, refresh=False):
+        """
+        {stall_id: active orders in this timeslot} for every stall with
+        any, from one grouped query. Kept on the instance until `refresh`.
+        """
+        if self._loads is None or refresh:
+            self._loads = dict(
+                Order.objects.filter(
+                    timeslot=self.timeslot,
+                    status__in=self.ACTIVE_STATUSES
+                )
+                .values("stall_id")
+                .annotate(load=Count("id"))
+                .order_by()
+                .values_list("stall_id", "load")
+            )
+        return self._loads
+
+    def get_current_load(self, stall, refresh=False):
+        return self.get_current_loads(refresh=refresh).get(stall.id, 0)
 
     # ------------------------------------------------------
     # Estimated Wait Time
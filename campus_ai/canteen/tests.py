@@ -1,3 +1,95 @@
-from django.test import TestCase
+import unittest
+from datetime import time
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from core.query_assertions import QueryBudgetMixin, QueryPlanMixin
+from .models import MenuItem, Order, Stall, TimeSlot
+from .services import StallRecommendationEngine
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class StallRecommendationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.timeslot = TimeSlot.objects.create(start_time=time(12, 0), end_time=time(12, 45), break_type="LUNCH")
+        self.student = User.objects.create(user_id="STU001", password="x", role="STUDENT")
+        self.stalls = [
+            Stall.objects.create(
+                name=f"Stall {index}",
+                location="Block A",
+                max_orders_per_slot=10,
+                average_prep_time=5,
+            )
+            for index in range(4)
+        ]
+        for stall, orders in zip(self.stalls, (3, 1, 0, 2)):
+            for _ in range(orders):
+                Order.objects.create(student=self.student, stall=stall, timeslot=self.timeslot)
+        Order.objects.create(student=self.student, stall=self.stalls[2], timeslot=self.timeslot, status="COMPLETED")
+
+    def test_loads_for_every_stall_come_from_one_query(self):
+        engine = StallRecommendationEngine(self.timeslot)
+        # Active stalls, then the grouped load query.
+        with self.assertNumQueries(2):
+            recommendations = engine.generate_recommendations()
+
+        loads = {item["stall"].name: item["current_load"] for item in recommendations}
+        self.assertEqual(loads, {"Stall 0": 3, "Stall 1": 1, "Stall 2": 0, "Stall 3": 2})
+        with self.assertNumQueries(0):
+            self.assertEqual(engine.get_current_load(self.stalls[0]), 3)
+
+    def test_placed_order_wait_includes_the_new_order(self):
+        item = MenuItem.objects.create(stall=self.stalls[1], name="Thali", price="40.00", category="Meals")
+        session = self.client.session
+        session["user_id"] = "STU001"
+        session["role"] = "STUDENT"
+        session.save()
+
+        self.client.post(
+            "/canteen/order/",
+            {"timeslot": self.timeslot.id, "stall": self.stalls[1].id, f"qty_{item.id}": "1"},
+        )
+
+        order = Order.objects.latest("id")
+        self.assertEqual(order.stall_id, self.stalls[1].id)
+        # Two active orders out of ten, five minutes each.
+        self.assertEqual(order.estimated_wait_time, 1.0)
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    REQUESTS = [
+        ("test_recommendation", "STUDENT", {}, ["?timeslot={timeslot}"]),
+        ("place_order", "STUDENT", {}, ["", "?timeslot={timeslot}&stall={stall}"]),
+        ("my_orders", "STUDENT", {}, [""]),
+    ]
+    ADMIN_APPS = ("canteen",)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        self.timeslot = TimeSlot.objects.create(start_time=time(12, 0), end_time=time(12, 45), break_type="LUNCH")
+        student = User.objects.create(user_id="STU001", password="x", role="STUDENT")
+        stall = Stall.objects.create(name="Stall 0", location="Block A", max_orders_per_slot=10, average_prep_time=5)
+        Order.objects.create(student=student, stall=stall, timeslot=self.timeslot)
+
+    def test_stall_loads(self):
+        engine = StallRecommendationEngine(self.timeslot)
+        self.assertUsesIndex(engine.get_current_loads, "canteen_order", "order_slot_status_stall_idx")
+
+    def test_my_orders(self):
+        session = self.client.session
+        session["user_id"] = "STU001"
+        session["role"] = "STUDENT"
+        session.save()
+
+        self.assertUsesIndex(
+            lambda: self.client.get(reverse("my_orders")),
+            "canteen_order",
+            "order_student_time_idx",
+        )
@@ -3,7 +3,6 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from decimal import Decimal
 
-from accounts.models import User
 from .models import MenuItem, Order, OrderItem, Stall, TimeSlot
 from .services import StallRecommendationEngine
 
@@ -39,16 +38,10 @@ def _get_session_user(request):
     if not user_id or role not in {"STUDENT", "FACULTY"}:
         return None, redirect("login")
 
-    user = User.objects.filter(
-        user_id=user_id,
-        role=role,
-        is_active=True,
-    ).first()
-
-    if not user:
+    if not request.current_user:
         return None, redirect("login")
 
-    return user, None
+    return request.current_user, None
 
 
 def place_order(request):
@@ -118,8 +111,9 @@ def place_order(request):
                         ]
                     )
 
-                    engine = StallRecommendationEngine(selected_timeslot)
-                    current_load = engine.get_current_load(selected_stall)
+                    # Same engine as the recommendations; refresh so the
+                    # load includes this order.
+                    current_load = engine.get_current_load(selected_stall, refresh=True)
                     estimated_wait = engine.estimate_wait_time(selected_stall, current_load)
                     order.estimated_wait_time = estimated_wait
                     order.save(update_fields=["estimated_wait_time"])
@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from .models import KPISnapshot
+
+
+@admin.register(KPISnapshot)
+class KPISnapshotAdmin(admin.ModelAdmin):
+    list_display = (
+        "captured_at",
+        "low_attendance_count",
+        "inactive_faculty_count",
+        "overloaded_sections_count",
+        "orders_today",
+        "attendance_sessions_today",
+    )
+    date_hierarchy = "captured_at"
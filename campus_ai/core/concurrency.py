@@ -0,0 +1,50 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+# Bounded so one process never holds more than this many extra
+# database connections for dashboard fan-out.
+QUERY_POOL_SIZE = 8
+_query_pool = ThreadPoolExecutor(max_workers=QUERY_POOL_SIZE, thread_name_prefix="dashboard-query")
+
+
+def run_queries(queries):
+    """
+    Evaluate {name: callable} one after another; the synchronous
+    counterpart of gather_queries().
+    """
+    return {name: query() for name, query in queries.items()}
+
+
+def _on_own_connection(query):
+    def run():
+        try:
+            return query()
+        finally:
+            # Worker threads keep their own connection; release it.
+            close_old_connections()
+
+    return run
+
+
+async def gather_queries(queries):
+    """
+    Evaluate {name: callable} concurrently, each on a pool thread with
+    its own database connection, and return {name: result}. Callables
+    must be independent and return fully evaluated values (lists,
+    counts, instances), never lazy querysets.
+
+    Django's a*() ORM methods all run on the single thread-sensitive
+    executor, so they would still execute one at a time.
+    """
+    names = list(queries)
+    results = await asyncio.gather(
+        *(
+            sync_to_async(_on_own_connection(queries[name]), thread_sensitive=False, executor=_query_pool)()
+            for name in names
+        )
+    )
+    return dict(zip(names, results))
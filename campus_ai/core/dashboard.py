@@ -0,0 +1,320 @@
+from datetime import timedelta
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Max
+from django.utils import timezone
+
+from accounts.models import StudentProfile, User
+from academics.models import ClassSchedule, Section, Subject
+from attendance.models import AttendanceRiskScore, AttendanceSession, AttendanceSummary
+from attendance.risk import at_risk_students
+from attendance.services import below_threshold_summaries
+from canteen.models import Order, Stall
+from .concurrency import gather_queries, run_queries
+from .models import KPISnapshot
+from .services import get_inactive_faculty
+
+
+KPI_CACHE_PREFIX = "dashboard:kpi:"
+KPI_STATS_PREFIX = "dashboard:stats:"
+KPI_TTL = 300
+KPI_SNAPSHOT_MAX_AGE = timedelta(minutes=15)
+
+
+# =========================================================
+# KPI DEFINITIONS
+# =========================================================
+def _overloaded_sections_count(day):
+    return (
+        Section.objects.annotate(
+            enrolled_students=Count("studentprofile"),
+            section_capacity=F("capacity"),
+        )
+        .filter(section_capacity__gt=0)
+        .annotate(
+            utilization_percentage=ExpressionWrapper(
+                (F("enrolled_students") * 100.0) / F("section_capacity"),
+                output_field=FloatField(),
+            )
+        )
+        .filter(utilization_percentage__gt=90)
+        .count()
+    )
+
+
+def _busiest_stall(day):
+    busiest = (
+        Order.objects.filter(status__in=["PENDING", "PREPARING"])
+        .values("stall__name")
+        .annotate(active_load=Count("id"))
+        .order_by("-active_load")
+        .first()
+    )
+    if not busiest:
+        return {"name": "No active orders", "load": 0}
+    return {"name": busiest["stall__name"], "load": busiest["active_load"]}
+
+
+class KPI:
+    """
+    One dashboard figure: how to compute it and which models feed it.
+    `per_day` figures are cached under a key that includes the date.
+    """
+
+    def __init__(self, name, compute, depends_on, per_day=False, ttl=KPI_TTL):
+        self.name = name
+        self.compute = compute
+        self.depends_on = depends_on
+        self.per_day = per_day
+        self.ttl = ttl
+
+    def key(self, day):
+        if self.per_day:
+            return f"{KPI_CACHE_PREFIX}{self.name}:{day.isoformat()}"
+        return f"{KPI_CACHE_PREFIX}{self.name}"
+
+
+KPIS = [
+    KPI("total_students", lambda day: User.objects.filter(role="STUDENT").count(), (User,)),
+    KPI("total_faculty", lambda day: User.objects.filter(role="FACULTY").count(), (User,)),
+    KPI("total_subjects", lambda day: Subject.objects.count(), (Subject,)),
+    KPI(
+        "total_attendance_sessions",
+        lambda day: AttendanceSession.objects.filter(confirmed=True).count(),
+        (AttendanceSession,),
+    ),
+    KPI(
+        "attendance_sessions_today",
+        lambda day: AttendanceSession.objects.filter(date=day, confirmed=True).count(),
+        (AttendanceSession,),
+        per_day=True,
+    ),
+    KPI("total_food_orders", lambda day: Order.objects.count(), (Order,)),
+    KPI(
+        "orders_today",
+        lambda day: Order.objects.filter(order_time__date=day).count(),
+        (Order,),
+        per_day=True,
+    ),
+    KPI(
+        "low_attendance_count",
+        lambda day: below_threshold_summaries().values("student").distinct().count(),
+        (AttendanceSummary, Subject),
+    ),
+    KPI(
+        "inactive_faculty_count",
+        lambda day: len(get_inactive_faculty(day)),
+        (ClassSchedule, AttendanceSession, User, Subject),
+        per_day=True,
+    ),
+    KPI("at_risk_count", lambda day: at_risk_students().count(), (AttendanceRiskScore,)),
+    KPI("overloaded_sections_count", _overloaded_sections_count, (Section, StudentProfile)),
+    KPI("busiest_stall", _busiest_stall, (Order, Stall)),
+]
+
+KPI_MODELS = {model for kpi in KPIS for model in kpi.depends_on}
+
+
+# =========================================================
+# READ / INVALIDATE
+# =========================================================
+def _cached_kpis(day):
+    """
+    ({name: value} of the cached KPIs for `day`, [KPIs still missing]).
+    """
+    keys = {kpi.name: kpi.key(day) for kpi in KPIS}
+    cached = cache.get_many(list(keys.values()))
+    values = {kpi.name: cached[keys[kpi.name]] for kpi in KPIS if keys[kpi.name] in cached}
+    return values, [kpi for kpi in KPIS if kpi.name not in values]
+
+
+def _store_kpis(day, values, computed):
+    for kpi in KPIS:
+        if kpi.name in computed:
+            cache.set(kpi.key(day), computed[kpi.name], kpi.ttl)
+    _record_stats(list(computed))
+    values.update(computed)
+    return {kpi.name: values[kpi.name] for kpi in KPIS}
+
+
+def _compute_queries(kpis, day):
+    return {kpi.name: partial(kpi.compute, day) for kpi in kpis}
+
+
+def get_dashboard_kpis(day=None):
+    """
+    Every KPI for `day` (default: today) as {name: value}. Cached KPIs
+    come back in one cache round trip; only missing ones are computed.
+    """
+    day = day or timezone.localdate()
+    values, missing = _cached_kpis(day)
+    return _store_kpis(day, values, run_queries(_compute_queries(missing, day)))
+
+
+async def aget_dashboard_kpis(day=None):
+    """
+    get_dashboard_kpis() for async views: the missing KPIs are computed
+    concurrently, each on its own connection (see gather_queries).
+    """
+    day = day or timezone.localdate()
+    values, missing = await sync_to_async(_cached_kpis)(day)
+    computed = await gather_queries(_compute_queries(missing, day))
+    return await sync_to_async(_store_kpis)(day, values, computed)
+
+
+def compute_kpis(day=None):
+    """
+    Every KPI computed fresh, bypassing the cache.
+    """
+    day = day or timezone.localdate()
+    return {kpi.name: kpi.compute(day) for kpi in KPIS}
+
+
+def invalidate_kpis(models, day=None):
+    """
+    Drop the cached KPIs fed by any of `models`.
+    """
+    day = day or timezone.localdate()
+    keys = [kpi.key(day) for kpi in KPIS if any(model in kpi.depends_on for model in models)]
+    if keys:
+        cache.delete_many(keys)
+    return keys
+
+
+# =========================================================
+# HIT / MISS STATS (shared across workers via the cache)
+# =========================================================
+def _incr(key, delta=1):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+def _record_stats(missed):
+    # Every read touches every KPI, so hits = reads - misses per KPI.
+    _incr(f"{KPI_STATS_PREFIX}reads")
+    for name in missed:
+        _incr(f"{KPI_STATS_PREFIX}misses:{name}")
+
+
+def get_kpi_cache_stats():
+    names = [kpi.name for kpi in KPIS]
+    stats = cache.get_many(
+        [f"{KPI_STATS_PREFIX}reads"] + [f"{KPI_STATS_PREFIX}misses:{name}" for name in names]
+    )
+    reads = stats.get(f"{KPI_STATS_PREFIX}reads", 0)
+
+    per_kpi = {}
+    for name in names:
+        misses = stats.get(f"{KPI_STATS_PREFIX}misses:{name}", 0)
+        per_kpi[name] = {
+            "hits": reads - misses,
+            "misses": misses,
+            "hit_rate": round((reads - misses) / reads, 4) if reads else None,
+        }
+
+    lookups = reads * len(names)
+    total_misses = sum(row["misses"] for row in per_kpi.values())
+    return {
+        "reads": reads,
+        "hits": lookups - total_misses,
+        "misses": total_misses,
+        "hit_rate": round((lookups - total_misses) / lookups, 4) if lookups else None,
+        "kpis": per_kpi,
+    }
+
+
+def reset_kpi_cache_stats():
+    cache.delete_many(
+        [f"{KPI_STATS_PREFIX}reads"] + [f"{KPI_STATS_PREFIX}misses:{kpi.name}" for kpi in KPIS]
+    )
+
+
+# =========================================================
+# SNAPSHOTS (history for trends)
+# =========================================================
+SNAPSHOT_KPIS = [kpi.name for kpi in KPIS if kpi.name != "busiest_stall"]
+TREND_KPIS = [
+    "low_attendance_count",
+    "inactive_faculty_count",
+    "at_risk_count",
+    "overloaded_sections_count",
+    "attendance_sessions_today",
+    "orders_today",
+]
+
+
+def take_kpi_snapshot(now=None):
+    """
+    Compute every KPI fresh and append it as a KPISnapshot row.
+    """
+    now = now or timezone.now()
+    day = timezone.localdate(now)
+    kpis = compute_kpis(day)
+    busiest_stall = kpis.pop("busiest_stall")
+    return KPISnapshot.objects.create(
+        captured_at=now,
+        day=day,
+        busiest_stall_name=busiest_stall["name"],
+        busiest_stall_load=busiest_stall["load"],
+        **kpis,
+    )
+
+
+def snapshot_kpis(snapshot):
+    """
+    A snapshot in the same shape as get_dashboard_kpis().
+    """
+    kpis = {name: getattr(snapshot, name) for name in SNAPSHOT_KPIS}
+    kpis["busiest_stall"] = {"name": snapshot.busiest_stall_name, "load": snapshot.busiest_stall_load}
+    return kpis
+
+
+def latest_kpi_snapshot(max_age=KPI_SNAPSHOT_MAX_AGE, now=None):
+    """
+    Newest snapshot of today, or None when it is older than `max_age`.
+    """
+    now = now or timezone.now()
+    return KPISnapshot.objects.filter(
+        day=timezone.localdate(now),
+        captured_at__gte=now - max_age,
+    ).first()
+
+
+def kpi_trends(days=14, today=None):
+    """
+    {kpi: [value per day]} from the last snapshot of each of the past
+    `days` days that has one, oldest first. One query.
+    """
+    today = today or timezone.localdate()
+    last_per_day = (
+        KPISnapshot.objects.filter(day__gt=today - timedelta(days=days))
+        .values("day")
+        .annotate(last_id=Max("id"))
+        .values("last_id")
+    )
+    rows = list(
+        KPISnapshot.objects.filter(id__in=last_per_day)
+        .order_by("day")
+        .values("day", *TREND_KPIS)
+    )
+    return {name: [row[name] for row in rows] for name in TREND_KPIS}
+
+
+def sparkline_points(values, width=120, height=28):
+    """
+    SVG polyline points for `values`, or "" with fewer than two values.
+    """
+    if len(values) < 2:
+        return ""
+    low, high = min(values), max(values)
+    spread = (high - low) or 1
+    step = width / (len(values) - 1)
+    return " ".join(
+        f"{index * step:.1f},{height - (value - low) / spread * (height - 2) - 1:.1f}"
+        for index, value in enumerate(values)
+    )
@@ -0,0 +1,116 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+
+
+_reporting = ContextVar("reporting_reads", default=False)
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+def replica_alias():
+    """
+    Alias reporting reads go to, or None when READ_REPLICA is unset.
+    """
+    return getattr(settings, "READ_REPLICA", None)
+
+
+@contextmanager
+def reporting_database():
+    """
+    Route reads inside the block to the read replica, unless this
+    request (or primary_scope) has already written.
+    """
+    token = _reporting.set(True)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+def reporting_view(view):
+    """
+    Decorator running a view, sync or async, inside reporting_database().
+    The lazy session and request.current_user are resolved first, so
+    the view's session check never reads them from a lagging replica.
+    """
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            await sync_to_async(_load_session_user)(request)
+            with reporting_database():
+                return await view(request, *args, **kwargs)
+
+    else:
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            _load_session_user(request)
+            with reporting_database():
+                return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def _load_session_user(request):
+    bool(getattr(request, "current_user", None))
+
+
+def reporting_iterator(iterable):
+    """
+    Iterate `iterable` inside reporting_database(), for streaming
+    responses whose queries run after the view (and its primary_scope)
+    has returned.
+    """
+    with primary_scope(), reporting_database():
+        yield from iterable
+
+
+@contextmanager
+def primary_scope():
+    """
+    Scope for write pinning: a write inside pins later reads to the
+    primary until the block ends. Entered per request by
+    ReplicaPinningMiddleware and per iteration by long-running commands.
+    """
+    token = _pinned.set(False)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def pin_to_primary():
+    _pinned.set(True)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+class ReadReplicaRouter:
+    """
+    Reads inside reporting_database() go to READ_REPLICA; everything
+    else, and every write, goes to the default database. The replica is
+    a copy of the primary (see the sync_replica command), so it is never
+    migrated directly.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if alias and _reporting.get() and not _pinned.get():
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
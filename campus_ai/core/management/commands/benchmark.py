@@ -0,0 +1,302 @@
+import json
+import random
+import statistics
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from academics.models import ClassSchedule
+from academics.timetable import day_code_for
+from canteen.models import MenuItem, Stall, TimeSlot
+from planner.models import RemedialSession
+
+
+BENCHMARK_HOST = "testserver"
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "campus-ai-benchmark",
+    }
+}
+WRITE_ENDPOINTS = ("place_order_submit", "mark_attendance_submit", "join_remedial_submit")
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database at a chosen scale, then drive the main pages and form submissions "
+        "as sampled admin, faculty and student users from a thread pool and report requests/sec and "
+        "latency percentiles as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1, help="seed_university_data --scale (default: 1).")
+        parser.add_argument(
+            "--no-seed",
+            action="store_true",
+            help="Benchmark the configured database as it is instead of a seeded scratch database. "
+            "Only pages are requested unless --allow-writes is given.",
+        )
+        parser.add_argument(
+            "--allow-writes",
+            action="store_true",
+            help="With --no-seed, also submit orders, attendance and remedial codes.",
+        )
+        parser.add_argument("--keepdb", action="store_true", help="Keep the scratch database for the next run.")
+        parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint (default: 50).")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent client threads (default: 8).")
+        parser.add_argument("--users", type=int, default=5, help="Users sampled per role (default: 5).")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 2 or options["workers"] < 1 or options["users"] < 1:
+            raise CommandError("--requests must be at least 2; --workers and --users at least 1.")
+
+        if options["allow_writes"] and not options["no_seed"]:
+            raise CommandError("--allow-writes only applies with --no-seed.")
+
+        # The test client sends Host: testserver; without it every request
+        # fails ALLOWED_HOSTS validation once DEBUG is off. Absence emails
+        # from mark_attendance must not go out.
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, BENCHMARK_HOST],
+            EMAIL_BACKEND="django.core.mail.backends.dummy.EmailBackend",
+        ):
+            if options["no_seed"]:
+                report = self._benchmark(options, writes=options["allow_writes"])
+            else:
+                with self._scratch_database(options["keepdb"]):
+                    call_command("seed_university_data", scale=options["scale"], stdout=self.stderr)
+                    self._prepare_scratch_data()
+                    report = self._benchmark(options, writes=True)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}."))
+        else:
+            self.stdout.write(output)
+
+    def _benchmark(self, options, writes):
+        users = self._sample_users(options["users"])
+        endpoints = self._endpoints(users)
+        if not writes:
+            endpoints.update(dict.fromkeys(WRITE_ENDPOINTS))
+        self._clients = threading.local()
+
+        report = {
+            "commit": self._git_commit(),
+            "database": "existing" if options["no_seed"] else "scratch",
+            "scale": None if options["no_seed"] else options["scale"],
+            "workers": options["workers"],
+            "requests_per_endpoint": options["requests"],
+            "endpoints": {},
+            "skipped": sorted(name for name, spec in endpoints.items() if not spec),
+        }
+        total_requests = 0
+        total_elapsed = 0.0
+        with ThreadPoolExecutor(max_workers=options["workers"], thread_name_prefix="benchmark") as pool:
+            for name, spec in endpoints.items():
+                if not spec:
+                    continue
+                role, user_ids, build_request = spec
+                jobs = [(random.choice(user_ids), role, build_request) for _ in range(options["requests"])]
+                started = time.perf_counter()
+                results = list(pool.map(self._timed_request, jobs))
+                elapsed = time.perf_counter() - started
+
+                report["endpoints"][name] = self._summarise(results, elapsed)
+                total_requests += len(results)
+                total_elapsed += elapsed
+
+        report["total_requests"] = total_requests
+        report["requests_per_second"] = round(total_requests / total_elapsed, 2) if total_elapsed else None
+        return report
+
+    # ------------------------------------------------------
+    # Scratch database
+    # ------------------------------------------------------
+    @contextmanager
+    def _scratch_database(self, keepdb):
+        """
+        Run the block against a freshly migrated copy of the default
+        database's schema (its TEST name, as the test runner would),
+        with its own cache and no read replica, then drop it.
+        """
+        connection = connections["default"]
+        if connection.vendor == "sqlite" and not connection.settings_dict["TEST"]["NAME"]:
+            # The default in-memory test database cannot take concurrent writes.
+            connection.settings_dict["TEST"]["NAME"] = str(settings.BASE_DIR / "benchmark.sqlite3")
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES, READ_REPLICA=None):
+                yield
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+    def _prepare_scratch_data(self):
+        """
+        What seed_university_data leaves out: an admin for the admin
+        pages and a remedial code that join_remedial accepts today.
+        """
+        User.objects.get_or_create(user_id="BENCHADMIN", defaults={"password": "!", "role": "ADMIN"})
+
+        today = timezone.localdate()
+        schedule = ClassSchedule.objects.order_by("id").first()
+        if schedule and not RemedialSession.objects.filter(scheduled_date=today).exists():
+            RemedialSession.objects.create(
+                subject_id=schedule.subject_id,
+                section_id=schedule.section_id,
+                scheduled_date=today,
+                code=uuid.uuid4().hex[:8].upper(),
+                created_by_id=schedule.faculty_id,
+            )
+
+    # ------------------------------------------------------
+    # Users and endpoints
+    # ------------------------------------------------------
+    def _sample_users(self, count):
+        users = {}
+        for role in ("ADMIN", "FACULTY", "STUDENT"):
+            user_ids = list(User.objects.filter(role=role, is_active=True).values_list("user_id", flat=True))
+            users[role] = random.sample(user_ids, min(count, len(user_ids)))
+        return users
+
+    def _endpoints(self, users):
+        """
+        {name: (role, user ids, request builder)}, or None when no user
+        can make the request or the page has nothing to show. A builder
+        takes a user id and returns (method, url, POST data).
+        """
+        today = timezone.localdate()
+        today_classes = {}
+        for faculty_id, subject_id, section_id in ClassSchedule.objects.filter(
+            day_of_week=day_code_for(today),
+            faculty_id__in=users["FACULTY"],
+        ).values_list("faculty_id", "subject_id", "section_id"):
+            today_classes.setdefault(faculty_id, (subject_id, section_id))
+        timeslot = TimeSlot.objects.filter(is_active=True).order_by("start_time").first()
+        stall = Stall.objects.filter(is_active=True).order_by("id").first()
+        item = MenuItem.objects.filter(stall=stall, is_available=True).order_by("id").first() if stall else None
+        remedial_code = (
+            RemedialSession.objects.filter(scheduled_date=today).order_by("id").values_list("code", flat=True).first()
+        )
+
+        def page(url):
+            return lambda user_id: ("GET", url, None)
+
+        def mark_page(user_id):
+            if user_id not in today_classes:
+                return "GET", "/attendance/mark/", None
+            subject_id, section_id = today_classes[user_id]
+            return "GET", f"/attendance/mark/?subject={subject_id}&section={section_id}", None
+
+        def mark_submit(user_id):
+            # The first submission per class confirms the session; the
+            # rest take the already-marked (conflict) path.
+            subject_id, section_id = today_classes[user_id]
+            return "POST", "/attendance/mark/", {"subject": subject_id, "section": section_id}
+
+        admins, faculty, students = users["ADMIN"], users["FACULTY"], users["STUDENT"]
+        endpoints = {
+            "admin_dashboard": ("ADMIN", admins, page("/admin-dashboard/")),
+            "admin_attendance_monitoring": ("ADMIN", admins, page("/admin/attendance-monitoring/")),
+            "faculty_dashboard": ("FACULTY", faculty, page("/faculty-dashboard/")),
+            "faculty_timetable": ("FACULTY", faculty, page("/faculty-timetable/")),
+            "mark_attendance": ("FACULTY", faculty, mark_page),
+            "student_dashboard": ("STUDENT", students, page("/student-dashboard/")),
+            "student_timetable": ("STUDENT", students, page("/student-timetable/")),
+            "place_order": None,
+            "join_remedial": ("STUDENT", students, page("/planner/join-remedial/")),
+            "place_order_submit": None,
+            "mark_attendance_submit": ("FACULTY", list(today_classes), mark_submit),
+            "join_remedial_submit": None,
+        }
+        if timeslot and stall:
+            endpoints["place_order"] = (
+                "STUDENT",
+                students,
+                page(f"/canteen/order/?timeslot={timeslot.id}&stall={stall.id}"),
+            )
+        if timeslot and item:
+            order = {"timeslot": timeslot.id, "stall": stall.id, f"qty_{item.id}": "1"}
+            endpoints["place_order_submit"] = (
+                "STUDENT",
+                students,
+                lambda user_id: ("POST", "/canteen/order/", order),
+            )
+        if remedial_code:
+            endpoints["join_remedial_submit"] = (
+                "STUDENT",
+                students,
+                lambda user_id: ("POST", "/planner/join-remedial/", {"code": remedial_code}),
+            )
+        return {name: spec if spec and spec[1] else None for name, spec in endpoints.items()}
+
+    # ------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------
+    def _client_for(self, user_id, role):
+        # Test clients are not thread-safe: one per (thread, user).
+        clients = getattr(self._clients, "by_user", None)
+        if clients is None:
+            clients = self._clients.by_user = {}
+        client = clients.get(user_id)
+        if client is None:
+            client = clients[user_id] = Client(HTTP_HOST=BENCHMARK_HOST)
+            session = client.session
+            session["user_id"] = user_id
+            session["role"] = role
+            session.save()
+        return client
+
+    def _timed_request(self, job):
+        user_id, role, build_request = job
+        client = self._client_for(user_id, role)
+        method, url, data = build_request(user_id)
+        started = time.perf_counter()
+        response = client.post(url, data) if method == "POST" else client.get(url)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        # Pages render with 200; form submissions redirect.
+        failed = response.status_code != (302 if method == "POST" else 200)
+        return time.perf_counter() - started, failed
+
+    def _summarise(self, results, elapsed):
+        latencies = sorted(duration * 1000 for duration, _ in results)
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        return {
+            "requests": len(results),
+            "errors": sum(1 for _, failed in results if failed),
+            "requests_per_second": round(len(results) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "p50_ms": round(cuts[49], 2),
+            "p95_ms": round(cuts[94], 2),
+            "p99_ms": round(cuts[98], 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+
+    def _git_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.dashboard import take_kpi_snapshot
+from core.db_router import primary_scope, reporting_database
+
+
+class Command(BaseCommand):
+    help = "Append a KPISnapshot every --interval seconds (or once with --once) for the admin dashboard."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=int, default=300, help="Seconds between snapshots (default: 300).")
+        parser.add_argument("--once", action="store_true", help="Take a single snapshot and exit.")
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        if interval <= 0:
+            raise CommandError("--interval must be a positive number of seconds.")
+
+        while True:
+            started = time.monotonic()
+            with primary_scope(), reporting_database():
+                snapshot = take_kpi_snapshot()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Snapshot {snapshot.pk} at {snapshot.captured_at:%Y-%m-%d %H:%M:%S} "
+                    f"({time.monotonic() - started:.2f}s)."
+                )
+            )
+            if options["once"]:
+                return
+            time.sleep(max(interval - (time.monotonic() - started), 0))
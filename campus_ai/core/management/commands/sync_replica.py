@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database to the read replica every --interval seconds "
+        "(or once with --once). Reporting pages read from it when READ_REPLICA is set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=int, default=60, help="Seconds between copies (default: 60).")
+        parser.add_argument("--once", action="store_true", help="Copy once and exit.")
+        parser.add_argument("--replica", default="replica", help="Database alias to refresh (default: replica).")
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        if interval <= 0:
+            raise CommandError("--interval must be a positive number of seconds.")
+
+        alias = options["replica"]
+        if alias not in settings.DATABASES:
+            raise CommandError(f"No database alias {alias!r} in DATABASES.")
+        primary = settings.DATABASES["default"]
+        replica = settings.DATABASES[alias]
+        for config in (primary, replica):
+            if config["ENGINE"] != "django.db.backends.sqlite3":
+                raise CommandError(
+                    "sync_replica copies SQLite files only; use the database's own replication otherwise."
+                )
+
+        while True:
+            started = time.monotonic()
+            self._copy(str(primary["NAME"]), str(replica["NAME"]))
+            self.stdout.write(
+                self.style.SUCCESS(f"Replica {alias!r} refreshed ({time.monotonic() - started:.2f}s).")
+            )
+            if options["once"]:
+                return
+            time.sleep(max(interval - (time.monotonic() - started), 0))
+
+    def _copy(self, source_path, replica_path):
+        # Back up into a temporary file and swap it in, so readers keep the
+        # old replica open until the new one is complete.
+        temp_path = f"{replica_path}.tmp"
+        source = sqlite3.connect(source_path)
+        try:
+            target = sqlite3.connect(temp_path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+        os.replace(temp_path, replica_path)
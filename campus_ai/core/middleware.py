@@ -0,0 +1,102 @@
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .db_router import primary_scope
+
+
+logger = logging.getLogger("core.queries")
+
+
+class QueryStats:
+    """
+    execute_wrapper that counts, times and fingerprints every query run
+    on the wrapped connections. Duplicates are repeats of the same SQL
+    text (parameters excluded), the usual shape of an N+1.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(times - 1 for times in self.statements.values() if times > 1)
+
+    def most_repeated(self):
+        sql, times = self.statements.most_common(1)[0] if self.statements else ("", 0)
+        return sql, times
+
+
+class QueryBudgetMiddleware:
+    """
+    Records query count, time and duplicate SQL for each request. Adds
+    X-Query-Count / X-Query-Time-Ms / X-Query-Duplicates headers when
+    DEBUG is on; otherwise logs to "core.queries", as a warning once a
+    request goes over QUERY_BUDGET queries.
+
+    Queries run on gather_queries() worker threads are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        request.query_stats = stats
+        duration_ms = round(stats.duration * 1000, 2)
+        if settings.DEBUG:
+            response["X-Query-Count"] = str(stats.count)
+            response["X-Query-Time-Ms"] = str(duration_ms)
+            response["X-Query-Duplicates"] = str(stats.duplicates)
+            return response
+
+        budget = getattr(settings, "QUERY_BUDGET", 50)
+        level = logging.WARNING if stats.count > budget else logging.INFO
+        if logger.isEnabledFor(level):
+            sql, times = stats.most_repeated()
+            logger.log(
+                level,
+                "%s %s: %d queries in %.2f ms, %d duplicates (most repeated x%d: %.200s)",
+                request.method,
+                request.path,
+                stats.count,
+                duration_ms,
+                stats.duplicates,
+                times,
+                sql,
+            )
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Scopes read-replica pinning to one request: once the request writes,
+    its later reporting reads go to the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with primary_scope():
+            return self.get_response(request)
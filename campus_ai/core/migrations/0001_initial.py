@@ -0,0 +1,41 @@
+# Generated by Django 6.0.1 on 2026-10-19 02:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KPISnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('captured_at', models.DateTimeField(db_index=True)),
+                ('day', models.DateField(db_index=True)),
+                ('total_students', models.PositiveIntegerField(default=0)),
+                ('total_faculty', models.PositiveIntegerField(default=0)),
+                ('total_subjects', models.PositiveIntegerField(default=0)),
+                ('total_attendance_sessions', models.PositiveIntegerField(default=0)),
+                ('attendance_sessions_today', models.PositiveIntegerField(default=0)),
+                ('total_food_orders', models.PositiveIntegerField(default=0)),
+                ('orders_today', models.PositiveIntegerField(default=0)),
+                ('low_attendance_count', models.PositiveIntegerField(default=0)),
+                ('inactive_faculty_count', models.PositiveIntegerField(default=0)),
+                ('at_risk_count', models.PositiveIntegerField(default=0)),
+                ('overloaded_sections_count', models.PositiveIntegerField(default=0)),
+                ('busiest_stall_name', models.CharField(blank=True, max_length=100)),
+                ('busiest_stall_load', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'KPI Snapshot',
+                'verbose_name_plural': 'KPI Snapshots',
+                'ordering': ['-captured_at'],
+                'get_latest_by': 'captured_at',
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import models
+
+
+class KPISnapshot(models.Model):
+    """
+    Admin dashboard KPIs as computed at one point in time.
+    Appended on an interval by the snapshot_kpis command so the
+    dashboard can read the latest row and draw trends from history.
+    """
+
+    captured_at = models.DateTimeField(db_index=True)
+    day = models.DateField(db_index=True)
+
+    total_students = models.PositiveIntegerField(default=0)
+    total_faculty = models.PositiveIntegerField(default=0)
+    total_subjects = models.PositiveIntegerField(default=0)
+    total_attendance_sessions = models.PositiveIntegerField(default=0)
+    attendance_sessions_today = models.PositiveIntegerField(default=0)
+    total_food_orders = models.PositiveIntegerField(default=0)
+    orders_today = models.PositiveIntegerField(default=0)
+    low_attendance_count = models.PositiveIntegerField(default=0)
+    inactive_faculty_count = models.PositiveIntegerField(default=0)
+    at_risk_count = models.PositiveIntegerField(default=0)
+    overloaded_sections_count = models.PositiveIntegerField(default=0)
+
+    busiest_stall_name = models.CharField(max_length=100, blank=True)
+    busiest_stall_load = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-captured_at"]
+        get_latest_by = "captured_at"
+        verbose_name = "KPI Snapshot"
+        verbose_name_plural = "KPI Snapshots"
+
+    def __str__(self):
+        return f"KPIs @ {self.captured_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,246 @@
+import json
+import re
+from datetime import time
+
+from django.contrib import admin
+from django.contrib.auth.models import User as AuthUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import FacultyProfile, StudentProfile, User
+from academics.models import ClassSchedule, Course, Department, Enrollment, Section, Subject
+from academics.timetable import day_code_for
+from attendance.models import AttendanceRecord, AttendanceRiskScore, AttendanceSession
+from attendance.services import rebuild_attendance_summary, rebuild_slot_summary
+from canteen.models import MenuItem, Order, OrderItem, Stall, TimeSlot
+from ml.models import FaceEmbedding
+from notifications.models import NotificationLog
+from planner.models import RemedialSession
+from .dashboard import take_kpi_snapshot
+
+
+# =========================================================
+# QUERY BUDGETS
+# =========================================================
+class QueryBudgetMixin:
+    """
+    Requests every entry of REQUESTS, and the admin changelists of
+    ADMIN_APPS, at two data scales with caching disabled; no request may
+    run more queries on the larger data. Each app's QueryBudgetTests
+    lists its own URLs; core checks that together they cover the URLconf.
+    """
+
+    # (url name, role, kwargs, query strings or POST payload)
+    REQUESTS = []
+    ADMIN_APPS = ()
+
+    def setUp(self):
+        # Caching would hide queries that grow with the data.
+        caches_off = override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+        caches_off.enable()
+        self.addCleanup(caches_off.disable)
+        self.department = Department.objects.create(name="Computer Science")
+        self.course = Course.objects.create(course_name="B.Tech CSE", department=self.department, duration_years=4)
+        self.timeslot = TimeSlot.objects.create(start_time=time(12, 0), end_time=time(12, 45), break_type="LUNCH")
+        self.stalls = []
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        self.superuser = AuthUser.objects.create_superuser("root", "root@example.com", "x")
+        self.units = 0
+        self.student_count = 0
+
+    def _add_stall(self):
+        index = len(self.stalls)
+        stall = Stall.objects.create(
+            name=f"Stall {index}",
+            location="Block A",
+            max_orders_per_slot=20,
+            average_prep_time=5,
+        )
+        stall.menu_item = MenuItem.objects.create(stall=stall, name=f"Item {index}", price="40.00", category="Meals")
+        self.stalls.append(stall)
+
+    def _add_student(self, section, user_id=None):
+        self.student_count += 1
+        user_id = user_id or f"STU{self.student_count + 100:03d}"
+        student = User.objects.create(user_id=user_id, password="x", role="STUDENT")
+        StudentProfile.objects.create(
+            user=student,
+            name=f"Student {self.student_count}",
+            roll_no=self.student_count,
+            department=self.department,
+            course=self.course,
+            section=section,
+            admission_year=2025,
+            parent_contact="",
+        )
+        AttendanceRiskScore.objects.create(
+            student=student,
+            score=0.9,
+            attendance_percentage=60,
+            recent_trend=-5,
+            longest_absence_streak=3,
+            current_absence_streak=2,
+            lowest_subject_percentage=50,
+            remedial_attendance_percentage=100,
+            computed_at=timezone.now(),
+        )
+        NotificationLog.objects.create(student=student, message="Low attendance", notification_type="WARNING")
+        FaceEmbedding.objects.create(student=student, face_image="faces/x.png", embedding_path="x.npy")
+        return student
+
+    def _grow(self, units):
+        """
+        Each unit adds a section with students, a faculty member, one
+        subject each for them and for FAC001, today's classes and
+        confirmed sessions, remedials, a stall and orders.
+        """
+        today = timezone.localdate()
+        day_code = day_code_for(today)
+        for _ in range(units):
+            self.units += 1
+            k = self.units
+            section = Section.objects.create(name=f"SEC-{k}", course=self.course, year=1)
+            if k == 1:
+                self.home_section = section
+                self.student = self._add_student(section, "STU001")
+            students = [self._add_student(section) for _ in range(2)] + [self._add_student(self.home_section)]
+
+            faculty = User.objects.create(user_id=f"FAC{k:03d}", password="x", role="FACULTY")
+            FacultyProfile.objects.create(user=faculty, name=f"Faculty {k}", department=self.department)
+            if k == 1:
+                self.faculty = faculty
+
+            own = Subject.objects.create(
+                subject_code=f"CS{k}A", subject_name=f"Subject {k}A", department=self.department,
+                course=self.course, semester=1, faculty=faculty,
+            )
+            shared = Subject.objects.create(
+                subject_code=f"CS{k}B", subject_name=f"Subject {k}B", department=self.department,
+                course=self.course, semester=1, faculty=self.faculty,
+            )
+            for subject, class_section, minute in ((own, section, 0), (shared, self.home_section, 30)):
+                ClassSchedule.objects.create(
+                    subject=subject, faculty=subject.faculty, section=class_section,
+                    day_of_week=day_code, start_time=time(7 + k, minute), end_time=time(8 + k, minute),
+                    room=f"Room-{k}",
+                )
+                members = [
+                    student for student in [self.student] + students
+                    if student.studentprofile.section_id == class_section.id
+                ]
+                Enrollment.objects.bulk_create([Enrollment(student=student, subject=subject) for student in members])
+                session = AttendanceSession.objects.create(
+                    subject=subject, section=class_section, date=today,
+                    start_time=time(7 + k, minute), end_time=time(8 + k, minute),
+                    marked_by=subject.faculty, method="MANUAL", confirmed=True,
+                )
+                AttendanceRecord.objects.bulk_create(
+                    [
+                        AttendanceRecord(session=session, student=student, status="PRESENT" if i % 2 else "ABSENT")
+                        for i, student in enumerate(members)
+                    ]
+                )
+                if k == 1 and subject is shared:
+                    self.session = session
+                    self.subject = subject
+
+            RemedialSession.objects.create(
+                subject=shared, section=self.home_section, scheduled_date=today,
+                start_time=time(16, 0), end_time=time(17, 0), code=f"REM{k:03d}", created_by=self.faculty,
+            )
+            self._add_stall()
+            for stall in self.stalls:
+                order = Order.objects.create(
+                    student=self.student, stall=stall, timeslot=self.timeslot, total_price="40.00",
+                )
+                OrderItem.objects.create(order=order, menu_item=stall.menu_item)
+
+        rebuild_attendance_summary()
+        rebuild_slot_summary()
+        take_kpi_snapshot()
+
+    def _request(self, role, url, spec):
+        client = self.client
+        if url.startswith("/admin/") and "/admin/attendance" not in url and "/admin/operations" not in url:
+            client.force_login(self.superuser)
+        if role:
+            session = client.session
+            session["user_id"] = {"ADMIN": "ADM001", "FACULTY": "FAC001", "STUDENT": "STU001"}[role]
+            session["role"] = role
+            session.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            if isinstance(spec, dict) and "json" in spec:
+                response = client.post(url, data=json.dumps(spec["json"]), content_type="application/json")
+            elif isinstance(spec, dict):
+                response = client.post(url, spec["post"])
+            else:
+                response = client.get(url + spec)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(response.status_code, 500, url)
+        return len(queries.captured_queries)
+
+    def _measure(self):
+        placeholders = {
+            "section": self.home_section.id,
+            "subject": self.subject.id,
+            "session": self.session.id,
+            "timeslot": self.timeslot.id,
+            "stall": self.stalls[0].id,
+        }
+        counts = {}
+        for name, role, kwargs, specs in self.REQUESTS:
+            url = reverse(name, kwargs={key: str(value).format(**placeholders) for key, value in kwargs.items()})
+            for spec in specs if isinstance(specs, list) else [specs]:
+                if isinstance(spec, str):
+                    spec = spec.format(**placeholders)
+                counts[(url, str(spec))] = self._request(role, url, spec)
+        for model in admin.site._registry:
+            if model._meta.app_label not in self.ADMIN_APPS:
+                continue
+            url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+            counts[(url, "")] = self._request(None, url, "")
+        return counts
+
+    def test_query_counts_do_not_grow_with_data(self):
+        self._grow(1)
+        small = self._measure()
+        self._grow(3)
+        large = self._measure()
+
+        grown = {key: (small[key], large[key]) for key in small if large[key] != small[key]}
+        self.assertEqual(grown, {})
+
+
+# =========================================================
+# QUERY PLANS (SQLite EXPLAIN QUERY PLAN)
+# =========================================================
+class QueryPlanMixin:
+    """
+    assertUsesIndex() runs real code and EXPLAINs the statements it sent
+    to one table, so plan tests follow the queries the views and services
+    actually issue. None may scan the table; with `index`, each must use
+    that index.
+    """
+
+    def assertUsesIndex(self, run, table, index=None):
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        # Inserts have no plan to check.
+        statements = [
+            query["sql"]
+            for query in queries.captured_queries
+            if f'"{table}"' in query["sql"] and not query["sql"].startswith("INSERT")
+        ]
+        self.assertNotEqual(statements, [], f"no query on {table}")
+
+        for sql in statements:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = "\n".join(row[-1] for row in cursor.fetchall())
+            self.assertIsNone(re.search(rf"\bSCAN {table}\b", plan), f"{sql}\n{plan}")
+            if index:
+                self.assertIn(f"INDEX {index}", plan.replace("COVERING INDEX", "INDEX"), f"{sql}\n{plan}")
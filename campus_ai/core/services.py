@@ -0,0 +1,125 @@
+from datetime import time
+
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounts.models import User
+from academics.models import ClassSchedule, Enrollment, Subject
+from academics.timetable import day_code_for
+from attendance.models import AttendanceSession
+
+
+def _count_by(queryset, field):
+    """
+    Correlated COUNT(*) of `queryset` rows whose `field` matches the
+    outer faculty, usable as an annotation.
+    """
+    counts = (
+        queryset.filter(**{field: OuterRef("user_id")})
+        .order_by()
+        .values(field)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts[:1]), Value(0), output_field=IntegerField())
+
+
+# =========================================================
+# FACULTY WORKLOAD
+# =========================================================
+def get_faculty_workloads(active_only=False):
+    """
+    Every faculty member with subjects assigned, students enrolled in
+    those subjects and confirmed sessions marked, in a single query.
+
+    Each user carries `subjects_assigned`, `students_enrolled`,
+    `attendance_sessions` and `faculty_name` (profile name or user id).
+    """
+    faculty_users = User.objects.filter(role="FACULTY")
+    if active_only:
+        faculty_users = faculty_users.filter(is_active=True)
+
+    faculty_users = (
+        faculty_users.select_related("facultyprofile")
+        .annotate(
+            subjects_assigned=_count_by(Subject.objects.all(), "faculty_id"),
+            students_enrolled=_count_by(Enrollment.objects.all(), "subject__faculty_id"),
+            attendance_sessions=_count_by(AttendanceSession.objects.filter(confirmed=True), "marked_by_id"),
+        )
+        .order_by("user_id")
+    )
+
+    workloads = list(faculty_users)
+    for faculty in workloads:
+        profile = getattr(faculty, "facultyprofile", None)
+        faculty.faculty_name = profile.name if profile else faculty.user_id
+    return workloads
+
+
+# =========================================================
+# INACTIVE FACULTY (any date)
+# =========================================================
+def _due_by(day, now=None):
+    """
+    Latest start time on `day` of a class that should have been marked
+    by `now` (default: the current time): every class of a past day,
+    those already started today, None for a future day.
+    """
+    now = timezone.localtime(now)
+    if day < now.date():
+        return time.max
+    if day == now.date():
+        return now.time()
+    return None
+
+
+def get_inactive_faculty(day, now=None):
+    """
+    Active faculty with at least one class on `day` that has started by
+    `now` (default: the current time) and has no confirmed attendance
+    session, in two queries.
+
+    Reads the timetable rather than pending sessions, so it also holds
+    for days create_pending_sessions never ran for. Returns dicts with
+    faculty_id, faculty_name, subjects (names), scheduled_classes and
+    unmarked_classes (overdue only), ordered by faculty_id.
+    """
+    latest_start = _due_by(day, now)
+    confirmed = AttendanceSession.objects.filter(
+        date=day,
+        confirmed=True,
+        subject_id=OuterRef("subject_id"),
+        section_id=OuterRef("section_id"),
+    )
+    schedule = (
+        ClassSchedule.objects.filter(day_of_week=day_code_for(day), faculty__is_active=True)
+        .annotate(marked=Exists(confirmed))
+        .values_list("faculty_id", "faculty__facultyprofile__name", "start_time", "marked")
+    )
+
+    report = {}
+    for faculty_id, faculty_name, start_time, marked in schedule:
+        row = report.setdefault(
+            faculty_id,
+            {
+                "faculty_id": faculty_id,
+                "faculty_name": faculty_name or faculty_id,
+                "subjects": [],
+                "scheduled_classes": 0,
+                "unmarked_classes": 0,
+            },
+        )
+        row["scheduled_classes"] += 1
+        if not marked and latest_start is not None and start_time <= latest_start:
+            row["unmarked_classes"] += 1
+
+    inactive = {faculty_id: row for faculty_id, row in report.items() if row["unmarked_classes"]}
+    for faculty_id, subject_name in (
+        Subject.objects.filter(faculty_id__in=inactive)
+        .order_by("subject_name")
+        .values_list("faculty_id", "subject_name")
+    ):
+        inactive[faculty_id]["subjects"].append(subject_name)
+
+    return [inactive[faculty_id] for faculty_id in sorted(inactive)]
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+
+from attendance.signals import attendance_changed
+from .dashboard import KPI_MODELS, invalidate_kpis
+
+
+def invalidate_dashboard(sender, **kwargs):
+    invalidate_kpis([sender])
+
+
+def invalidate_dashboard_after_bulk_write(sender, models=(), **kwargs):
+    invalidate_kpis(models)
+
+
+for model in KPI_MODELS:
+    post_save.connect(invalidate_dashboard, sender=model, dispatch_uid=f"dashboard_kpis_save_{model._meta.label}")
+    post_delete.connect(invalidate_dashboard, sender=model, dispatch_uid=f"dashboard_kpis_delete_{model._meta.label}")
+
+attendance_changed.connect(invalidate_dashboard_after_bulk_write, dispatch_uid="dashboard_kpis_bulk")
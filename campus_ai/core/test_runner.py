@@ -0,0 +1,27 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "campus-ai-tests",
+    }
+}
+
+
+class CampusTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that swaps the shared file cache for a process-local
+    LocMemCache, so tests never read or write the developer's
+    .django_cache (timetable and user version stamps, KPIs, grids).
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_override = override_settings(CACHES=TEST_CACHES)
+        self._cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_override.disable()
+        super().teardown_test_environment(**kwargs)
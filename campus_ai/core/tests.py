@@ -0,0 +1,693 @@
+import json
+import threading
+import unittest
+from datetime import date, datetime, time, timedelta
+from functools import partial
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.contrib import admin
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections, router
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, include, path, reverse
+from django.utils import timezone
+
+import academics.tests
+import accounts.tests
+import attendance.tests
+import canteen.tests
+import ml.tests
+import notifications.tests
+import planner.tests
+from accounts.models import FacultyProfile, StudentProfile, User
+from academics.models import ClassSchedule, Course, Department, Enrollment, Section, Subject
+from academics.timetable import day_code_for
+from attendance.models import AttendanceSession, AttendanceSummary
+from attendance.services import create_pending_sessions
+from attendance.signals import attendance_changed
+from canteen.models import MenuItem, Order, Stall, TimeSlot
+from planner.models import RemedialAttendance, RemedialSession
+from . import views
+from .dashboard import (
+    KPIS,
+    aget_dashboard_kpis,
+    get_dashboard_kpis,
+    get_kpi_cache_stats,
+    kpi_trends,
+    take_kpi_snapshot,
+)
+from .db_router import primary_scope, reporting_database
+from .models import KPISnapshot
+from .query_assertions import QueryBudgetMixin, QueryPlanMixin
+from .services import get_faculty_workloads, get_inactive_faculty
+
+
+# Async dashboards mounted over the normal URLconf, for AsyncDashboardTests.
+urlpatterns = [
+    path("async/admin-dashboard/", views.admin_dashboard_async),
+    path("async/faculty-dashboard/", views.faculty_dashboard_async),
+    path("async/student-dashboard/", views.student_dashboard_async),
+    path("", include("campus_ai.urls")),
+]
+
+
+class FacultyWorkloadQueryTests(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(name="Computer Science")
+        self.course = Course.objects.create(course_name="B.Tech CSE", department=self.department, duration_years=4)
+        self.section = Section.objects.create(name="SEC-A", course=self.course, year=1)
+        self.students = []
+        for index in range(3):
+            student = User.objects.create(user_id=f"STU00{index}", password="x", role="STUDENT")
+            StudentProfile.objects.create(
+                user=student,
+                name=f"Student {index}",
+                roll_no=index,
+                department=self.department,
+                course=self.course,
+                section=self.section,
+                admission_year=2025,
+                parent_contact="",
+            )
+            self.students.append(student)
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        self.faculty_count = 0
+
+    def _add_faculty(self, count):
+        for _ in range(count):
+            self.faculty_count += 1
+            faculty = User.objects.create(user_id=f"FAC{self.faculty_count:03d}", password="x", role="FACULTY")
+            FacultyProfile.objects.create(user=faculty, name=f"Faculty {self.faculty_count}", department=self.department)
+            for semester in (1, 2):
+                subject = Subject.objects.create(
+                    subject_code=f"CS{self.faculty_count}{semester}",
+                    subject_name=f"Subject {self.faculty_count}-{semester}",
+                    department=self.department,
+                    course=self.course,
+                    semester=semester,
+                    faculty=faculty,
+                )
+                Enrollment.objects.bulk_create(
+                    [Enrollment(student=student, subject=subject) for student in self.students]
+                )
+                AttendanceSession.objects.create(
+                    subject=subject,
+                    section=self.section,
+                    date=date(2026, 3, semester),
+                    start_time=time(9, 0),
+                    end_time=time(10, 0),
+                    marked_by=faculty,
+                    method="MANUAL",
+                    confirmed=semester == 1,
+                )
+
+    def _count_queries(self, func):
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        return len(queries.captured_queries)
+
+    def _admin_client(self):
+        session = self.client.session
+        session["user_id"] = "ADM001"
+        session["role"] = "ADMIN"
+        session.save()
+        return self.client
+
+    def test_workload_figures(self):
+        self._add_faculty(2)
+
+        workloads = get_faculty_workloads()
+
+        self.assertEqual([faculty.user_id for faculty in workloads], ["FAC001", "FAC002"])
+        for faculty in workloads:
+            self.assertEqual(faculty.subjects_assigned, 2)
+            self.assertEqual(faculty.students_enrolled, 6)
+            self.assertEqual(faculty.attendance_sessions, 1)
+            self.assertEqual(faculty.faculty_name, f"Faculty {int(faculty.user_id[3:])}")
+
+    def test_service_query_count_is_constant(self):
+        self._add_faculty(2)
+        small = self._count_queries(get_faculty_workloads)
+        self._add_faculty(8)
+        large = self._count_queries(get_faculty_workloads)
+
+        self.assertEqual(small, 1)
+        self.assertEqual(large, small)
+
+    def test_admin_views_query_count_is_constant(self):
+        client = self._admin_client()
+        for url in ("/admin-resources/", "/admin/operations-monitoring/"):
+            with self.subTest(url=url):
+                self._add_faculty(2)
+                small = self._count_queries(lambda: client.get(url))
+                self._add_faculty(8)
+                large = self._count_queries(lambda: client.get(url))
+                self.assertEqual(large, small)
+
+
+class InactiveFacultyReportTests(TestCase):
+    DAY = date(2026, 3, 2)  # Monday
+
+    def setUp(self):
+        self.department = Department.objects.create(name="Computer Science")
+        self.course = Course.objects.create(course_name="B.Tech CSE", department=self.department, duration_years=4)
+        self.sections = [
+            Section.objects.create(name=f"SEC-{index}", course=self.course, year=1)
+            for index in range(2)
+        ]
+        self.faculty_count = 0
+
+    def _add_faculty(self, count, marked=False):
+        for _ in range(count):
+            self.faculty_count += 1
+            faculty = User.objects.create(user_id=f"FAC{self.faculty_count:03d}", password="x", role="FACULTY")
+            FacultyProfile.objects.create(user=faculty, name=f"Faculty {self.faculty_count}", department=self.department)
+            subject = Subject.objects.create(
+                subject_code=f"CS{self.faculty_count}",
+                subject_name=f"Subject {self.faculty_count}",
+                department=self.department,
+                course=self.course,
+                semester=1,
+                faculty=faculty,
+            )
+            for section in self.sections:
+                ClassSchedule.objects.create(
+                    subject=subject,
+                    faculty=faculty,
+                    section=section,
+                    day_of_week="MON",
+                    start_time=time(8 + self.faculty_count, 0),
+                    end_time=time(9 + self.faculty_count, 0),
+                    room="Room-101",
+                )
+            if marked:
+                AttendanceSession.objects.create(
+                    subject=subject,
+                    section=self.sections[0],
+                    date=self.DAY,
+                    start_time=time(9, 0),
+                    end_time=time(10, 0),
+                    marked_by=faculty,
+                    method="MANUAL",
+                    confirmed=True,
+                )
+
+    def test_report_for_past_date(self):
+        self._add_faculty(1)
+        self._add_faculty(1, marked=True)
+
+        report = get_inactive_faculty(self.DAY)
+
+        self.assertEqual(
+            [(row["faculty_id"], row["scheduled_classes"], row["unmarked_classes"]) for row in report],
+            [("FAC001", 2, 2), ("FAC002", 2, 1)],
+        )
+        self.assertEqual(report[0]["subjects"], ["Subject 1"])
+        self.assertEqual(get_inactive_faculty(date(2026, 3, 3)), [])
+
+    def _report(self, now):
+        return [
+            (row["faculty_id"], row["scheduled_classes"], row["unmarked_classes"])
+            for row in get_inactive_faculty(self.DAY, now=now)
+        ]
+
+    def test_classes_not_started_yet_are_not_unmarked(self):
+        # Classes at 09:00, 10:00 and 11:00.
+        self._add_faculty(3)
+        now = timezone.make_aware(datetime(2026, 3, 2, 10, 30))
+
+        self.assertEqual(self._report(now), [("FAC001", 2, 2), ("FAC002", 2, 2)])
+        self.assertEqual(self._report(now - timedelta(days=1)), [])
+
+    def test_unconfirmed_sessions_still_count_as_unmarked(self):
+        self._add_faculty(3)
+        now = timezone.make_aware(datetime(2026, 3, 2, 10, 30))
+        # Without create_pending_sessions the timetable still has the classes.
+        without_sessions = self._report(now)
+
+        create_pending_sessions(self.DAY)
+
+        self.assertEqual(self._report(now), without_sessions)
+
+    def test_query_count_is_constant(self):
+        self._add_faculty(2)
+        with self.assertNumQueries(2):
+            self.assertEqual(len(get_inactive_faculty(self.DAY)), 2)
+        self._add_faculty(6)
+        with self.assertNumQueries(2):
+            self.assertEqual(len(get_inactive_faculty(self.DAY)), 8)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class DashboardKpiCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        department = Department.objects.create(name="Computer Science")
+        self.course = Course.objects.create(course_name="B.Tech CSE", department=department, duration_years=4)
+        self.department = department
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        session = self.client.session
+        session["user_id"] = "ADM001"
+        session["role"] = "ADMIN"
+        session.save()
+
+    def test_cache_hit_needs_no_kpi_queries(self):
+        self.client.get("/admin-dashboard/")
+        # Session, latest snapshot and trend history only.
+        with self.assertNumQueries(3):
+            response = self.client.get("/admin-dashboard/")
+        self.assertEqual(response.status_code, 200)
+
+        stats = get_kpi_cache_stats()
+        self.assertEqual(stats["reads"], 2)
+        self.assertEqual(stats["kpis"]["total_subjects"], {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_model_signals_invalidate_only_dependent_kpis(self):
+        self.assertEqual(get_dashboard_kpis()["total_subjects"], 0)
+
+        Subject.objects.create(
+            subject_code="CS101",
+            subject_name="Programming Fundamentals",
+            department=self.department,
+            course=self.course,
+            semester=1,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            kpis = get_dashboard_kpis()
+
+        self.assertEqual(kpis["total_subjects"], 1)
+        misses = {name for name, row in get_kpi_cache_stats()["kpis"].items() if row["misses"] == 2}
+        self.assertEqual(misses, {"total_subjects", "low_attendance_count", "inactive_faculty_count"})
+        self.assertLess(len(queries.captured_queries), 5)
+
+    def test_bulk_attendance_writes_invalidate_through_custom_signal(self):
+        get_dashboard_kpis()
+        attendance_changed.send(sender=AttendanceSummary, models=(AttendanceSummary,))
+        get_dashboard_kpis()
+
+        misses = {name for name, row in get_kpi_cache_stats()["kpis"].items() if row["misses"] == 2}
+        self.assertEqual(misses, {"low_attendance_count"})
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class KpiSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        session = self.client.session
+        session["user_id"] = "ADM001"
+        session["role"] = "ADMIN"
+        session.save()
+
+    def test_dashboard_reads_snapshot_without_touching_live_tables(self):
+        take_kpi_snapshot()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/admin-dashboard/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["kpi_snapshot"], KPISnapshot.objects.get())
+        self.assertEqual(response.context["total_students"], 0)
+        tables = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn("attendance_attendancerecord", tables)
+        self.assertNotIn("canteen_order", tables)
+
+    def test_trends_use_last_snapshot_per_day(self):
+        now = timezone.now()
+        for days_ago, count in ((2, 5), (1, 3), (1, 4), (0, 6)):
+            snapshot = take_kpi_snapshot(now - timedelta(days=days_ago))
+            KPISnapshot.objects.filter(pk=snapshot.pk).update(low_attendance_count=count)
+
+        with self.assertNumQueries(1):
+            trends = kpi_trends(today=timezone.localdate(now))
+
+        self.assertEqual(trends["low_attendance_count"], [5, 4, 6])
+
+
+@override_settings(
+    ROOT_URLCONF="core.tests",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class AsyncDashboardTests(TransactionTestCase):
+    # Concurrent queries run on other connections, so the data must be
+    # committed: TransactionTestCase rather than TestCase.
+
+    def setUp(self):
+        cache.clear()
+        department = Department.objects.create(name="Computer Science")
+        course = Course.objects.create(course_name="B.Tech CSE", department=department, duration_years=4)
+        section = Section.objects.create(name="SEC-A", course=course, year=1)
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        faculty = User.objects.create(user_id="FAC001", password="x", role="FACULTY")
+        FacultyProfile.objects.create(user=faculty, name="Faculty One", department=department)
+        student = User.objects.create(user_id="STU001", password="x", role="STUDENT")
+        StudentProfile.objects.create(
+            user=student,
+            name="Student One",
+            roll_no=1,
+            department=department,
+            course=course,
+            section=section,
+            admission_year=2025,
+            parent_contact="",
+        )
+        subject = Subject.objects.create(
+            subject_code="CS101",
+            subject_name="Programming Fundamentals",
+            department=department,
+            course=course,
+            semester=1,
+            faculty=faculty,
+        )
+        Enrollment.objects.create(student=student, subject=subject)
+        AttendanceSession.objects.create(
+            subject=subject,
+            section=section,
+            date=timezone.localdate(),
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            marked_by=faculty,
+            method="MANUAL",
+            confirmed=True,
+        )
+
+    def _login(self, user_id, role):
+        session = self.client.session
+        session["user_id"] = user_id
+        session["role"] = role
+        session.save()
+
+    def test_async_dashboards_match_sync_ones(self):
+        cases = (
+            ("ADM001", "ADMIN", "/admin-dashboard/", ("total_students", "total_attendance_sessions", "orders_today")),
+            ("FAC001", "FACULTY", "/faculty-dashboard/", ("my_subjects_count", "sessions_today_count")),
+            ("STU001", "STUDENT", "/student-dashboard/", ("total_sessions", "pending_orders_count")),
+        )
+        for user_id, role, url, keys in cases:
+            with self.subTest(url=url):
+                self._login(user_id, role)
+                sync_response = self.client.get(url)
+                async_response = self.client.get(f"/async{url}")
+
+                self.assertEqual(async_response.status_code, 200)
+                for key in keys:
+                    self.assertEqual(async_response.context[key], sync_response.context[key])
+
+    def test_missing_kpis_are_computed_concurrently(self):
+        threads = {}
+        for kpi in KPIS:
+            def compute(day, kpi=kpi, compute=kpi.compute):
+                threads[kpi.name] = threading.current_thread().name
+                return compute(day)
+
+            self.addCleanup(setattr, kpi, "compute", kpi.compute)
+            kpi.compute = compute
+
+        kpis = async_to_sync(aget_dashboard_kpis)()
+
+        self.assertEqual(kpis, get_dashboard_kpis())
+        self.assertEqual(set(threads), {kpi.name for kpi in KPIS})
+        self.assertTrue(all(name.startswith("dashboard-query") for name in threads.values()))
+        self.assertEqual(get_kpi_cache_stats()["misses"], len(KPIS))
+
+    def test_async_dashboard_redirects_other_roles(self):
+        self._login("STU001", "STUDENT")
+        self.assertRedirects(
+            self.client.get("/async/admin-dashboard/"),
+            "/student-dashboard/",
+            fetch_redirect_response=False,
+        )
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    REQUESTS = [
+        ("home", "STUDENT", {}, [""]),
+        ("login", None, {}, [""]),
+        ("logout", "STUDENT", {}, [""]),
+        ("admin_dashboard", "ADMIN", {}, [""]),
+        ("admin_dashboard_cache_stats", "ADMIN", {}, [""]),
+        ("admin_resources", "ADMIN", {}, [""]),
+        ("admin_attendance_monitoring", "ADMIN", {}, ["", "?mode=students", "?mode=faculty", "?mode=risk"]),
+        ("admin_attendance_heatmap", "ADMIN", {}, ["", "?section={section}", "?faculty=FAC001"]),
+        ("admin_operations_monitoring", "ADMIN", {}, ["", "?mode=sections", "?mode=faculty", "?mode=canteen"]),
+        ("faculty_dashboard", "FACULTY", {}, [""]),
+        ("faculty_timetable", "FACULTY", {}, [""]),
+        ("student_dashboard", "STUDENT", {}, [""]),
+        ("student_timetable", "STUDENT", {}, [""]),
+    ]
+    ADMIN_APPS = ("auth", "core")
+
+    def test_every_url_and_admin_is_covered(self):
+        def names(patterns):
+            for pattern in patterns:
+                if isinstance(pattern, URLResolver):
+                    if pattern.app_name != "admin":
+                        yield from names(pattern.url_patterns)
+                elif pattern.name:
+                    yield pattern.name
+
+        budgets = [type(self)] + [
+            module.QueryBudgetTests
+            for module in (
+                academics.tests,
+                accounts.tests,
+                attendance.tests,
+                canteen.tests,
+                ml.tests,
+                notifications.tests,
+                planner.tests,
+            )
+        ]
+        self.assertEqual(
+            set(names(get_resolver().url_patterns)),
+            {name for budget in budgets for name, *_ in budget.REQUESTS},
+        )
+        self.assertEqual(
+            {model._meta.app_label for model in admin.site._registry},
+            {app for budget in budgets for app in budget.ADMIN_APPS},
+        )
+
+    def test_middleware_records_query_stats(self):
+        self._grow(1)
+        session = self.client.session
+        session["user_id"] = "STU001"
+        session["role"] = "STUDENT"
+        session.save()
+
+        response = self.client.get(reverse("student_dashboard"))
+
+        stats = response.wsgi_request.query_stats
+        self.assertGreater(stats.count, 0)
+        self.assertGreaterEqual(stats.duration, 0)
+        with self.settings(DEBUG=True):
+            response = self.client.get(reverse("student_dashboard"))
+        self.assertEqual(response["X-Query-Count"], str(response.wsgi_request.query_stats.count))
+        self.assertIn("X-Query-Duplicates", response)
+
+
+@override_settings(
+    READ_REPLICA="replica",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class ReadReplicaRoutingTests(TestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        session = self.client.session
+        session["user_id"] = "ADM001"
+        session["role"] = "ADMIN"
+        session.save()
+
+    def test_only_reporting_reads_go_to_replica(self):
+        with primary_scope():
+            self.assertEqual(router.db_for_read(User), "default")
+            with reporting_database():
+                self.assertEqual(router.db_for_read(User), "replica")
+                self.assertEqual(router.db_for_write(User), "default")
+                # Read-your-writes: after a write the scope stays on the primary.
+                self.assertEqual(router.db_for_read(User), "default")
+
+        with self.settings(READ_REPLICA=None), primary_scope(), reporting_database():
+            self.assertEqual(router.db_for_read(User), "default")
+
+    def test_reporting_page_reads_from_replica(self):
+        with CaptureQueriesContext(connections["replica"]) as replica_queries, CaptureQueriesContext(
+            connections["default"]
+        ) as primary_queries:
+            response = self.client.get(reverse("admin_resources"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(replica_queries.captured_queries), 0)
+        # The session and the current user are still read from the primary.
+        for table in ('"django_session"', '"accounts_user"."user_id" = \'ADM001\''):
+            self.assertTrue(any(table in query["sql"] for query in primary_queries.captured_queries), table)
+            self.assertFalse(any(table in query["sql"] for query in replica_queries.captured_queries), table)
+
+    def test_non_reporting_page_stays_on_primary(self):
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            self.client.get(reverse("faculty_dashboard"))
+
+        self.assertEqual(replica_queries.captured_queries, [])
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        department = Department.objects.create(name="Computer Science")
+        course = Course.objects.create(course_name="B.Tech CSE", department=department, duration_years=4)
+        section = Section.objects.create(name="SEC-A", course=course, year=1)
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        faculty = User.objects.create(user_id="FAC001", password="x", role="FACULTY")
+        self.student = User.objects.create(user_id="STU001", password="x", role="STUDENT")
+        StudentProfile.objects.create(
+            user=self.student,
+            name="Student One",
+            roll_no=1,
+            department=department,
+            course=course,
+            section=section,
+            admission_year=2025,
+            parent_contact="",
+        )
+        subject = Subject.objects.create(
+            subject_code="CS101",
+            subject_name="Programming Fundamentals",
+            department=department,
+            course=course,
+            semester=1,
+            faculty=faculty,
+        )
+        ClassSchedule.objects.create(
+            subject=subject,
+            faculty=faculty,
+            section=section,
+            day_of_week=day_code_for(self.today),
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            room="A101",
+        )
+        RemedialSession.objects.create(
+            subject=subject, section=section, scheduled_date=self.today, code="REM001", created_by=faculty
+        )
+        timeslot = TimeSlot.objects.create(start_time=time(12, 0), end_time=time(12, 45), break_type="LUNCH")
+        stall = Stall.objects.create(name="Stall 0", location="Block A", max_orders_per_slot=20, average_prep_time=5)
+        Order.objects.create(student=self.student, stall=stall, timeslot=timeslot)
+
+    def test_student_dashboard(self):
+        self.student.profile = self.student.studentprofile
+        queries = views._student_dashboard_queries(self.student, self.today)
+
+        self.assertUsesIndex(queries["last_order"], "canteen_order", "order_student_time_idx")
+        self.assertUsesIndex(queries["pending_orders_count"], "canteen_order", "order_student_status_idx")
+        self.assertUsesIndex(queries["upcoming_remedials"], "planner_remedialsession", "remedial_section_date_idx")
+        self.assertUsesIndex(queries["subject_standings"], "attendance_attendancesummary")
+
+    def test_canteen_figures(self):
+        session = self.client.session
+        session["user_id"] = "ADM001"
+        session["role"] = "ADMIN"
+        session.save()
+
+        self.assertUsesIndex(
+            lambda: self.client.get(reverse("admin_operations_monitoring"), {"mode": "canteen"}),
+            "canteen_order",
+            "order_status_stall_idx",
+        )
+        busiest_stall = next(kpi for kpi in KPIS if kpi.name == "busiest_stall")
+        self.assertUsesIndex(partial(busiest_stall.compute, self.today), "canteen_order", "order_status_stall_idx")
+
+    def test_inactive_faculty(self):
+        report = partial(get_inactive_faculty, self.today)
+        self.assertUsesIndex(report, "academics_classschedule", "schedule_day_start_idx")
+        self.assertUsesIndex(report, "attendance_attendancesession")
+
+
+@override_settings(ALLOWED_HOSTS=["campus.example.edu"])
+class BenchmarkCommandTests(TransactionTestCase):
+    # The benchmark's clients run on worker threads with their own
+    # connections, so the fixture must be committed.
+
+    def setUp(self):
+        department = Department.objects.create(name="Computer Science")
+        course = Course.objects.create(course_name="B.Tech CSE", department=department, duration_years=4)
+        section = Section.objects.create(name="SEC-A", course=course, year=1)
+        User.objects.create(user_id="ADM001", password="x", role="ADMIN")
+        faculty = User.objects.create(user_id="FAC001", password="x", role="FACULTY")
+        FacultyProfile.objects.create(user=faculty, name="Faculty One", department=department)
+        student = User.objects.create(user_id="STU001", password="x", role="STUDENT")
+        StudentProfile.objects.create(
+            user=student,
+            name="Student One",
+            roll_no=1,
+            department=department,
+            course=course,
+            section=section,
+            admission_year=2025,
+            parent_contact="parent@example.com",
+        )
+        subject = Subject.objects.create(
+            subject_code="CS101",
+            subject_name="Programming Fundamentals",
+            department=department,
+            course=course,
+            semester=1,
+            faculty=faculty,
+        )
+        Enrollment.objects.create(student=student, subject=subject)
+        ClassSchedule.objects.create(
+            subject=subject,
+            faculty=faculty,
+            section=section,
+            day_of_week=day_code_for(timezone.localdate()),
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            room="A101",
+        )
+        RemedialSession.objects.create(
+            subject=subject,
+            section=section,
+            scheduled_date=timezone.localdate(),
+            code="REM001",
+            created_by=faculty,
+        )
+        TimeSlot.objects.create(start_time=time(12, 0), end_time=time(12, 45), break_type="LUNCH")
+        stall = Stall.objects.create(name="Stall 0", location="Block A", max_orders_per_slot=20, average_prep_time=5)
+        MenuItem.objects.create(stall=stall, name="Thali", price="40.00", category="Meals")
+
+    def _benchmark(self, *args):
+        stdout = StringIO()
+        call_command("benchmark", "--no-seed", "--requests", "3", "--workers", "2", *args, stdout=stdout)
+        return json.loads(stdout.getvalue())
+
+    def test_pages_only_on_an_existing_database(self):
+        report = self._benchmark()
+
+        self.assertEqual(report["database"], "existing")
+        self.assertEqual(report["skipped"], ["join_remedial_submit", "mark_attendance_submit", "place_order_submit"])
+        # Host validation passes although testserver is not an allowed host.
+        self.assertEqual({name: row["errors"] for name, row in report["endpoints"].items() if row["errors"]}, {})
+        self.assertEqual(len(report["endpoints"]), 9)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(AttendanceSession.objects.exists())
+
+    def test_form_submissions_with_allow_writes(self):
+        report = self._benchmark("--allow-writes")
+
+        self.assertEqual(report["skipped"], [])
+        self.assertEqual({name: row["errors"] for name, row in report["endpoints"].items() if row["errors"]}, {})
+        self.assertEqual(Order.objects.count(), 3)
+        self.assertEqual(AttendanceSession.objects.get().confirmed, True)
+        self.assertEqual(RemedialAttendance.objects.count(), 1)
+        self.assertEqual(mail.outbox, [])
+
+    def test_writes_need_an_existing_database(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark", "--allow-writes")
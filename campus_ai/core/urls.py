@@ -1,16 +1,28 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
 
+if settings.ASYNC_DASHBOARDS:
+    admin_dashboard = views.admin_dashboard_async
+    faculty_dashboard = views.faculty_dashboard_async
+    student_dashboard = views.student_dashboard_async
+else:
+    admin_dashboard = views.admin_dashboard
+    faculty_dashboard = views.faculty_dashboard
+    student_dashboard = views.student_dashboard
+
+
 urlpatterns = [
     path("", views.home_view, name="home"),
     path("login/", views.login_view, name="login"),
     path("logout/", views.logout_view, name="logout"),
-    path("admin-dashboard/", views.admin_dashboard, name="admin_dashboard"),
+    path("admin-dashboard/", admin_dashboard, name="admin_dashboard"),
+    path("admin-dashboard/cache-stats/", views.admin_dashboard_cache_stats, name="admin_dashboard_cache_stats"),
     path("admin-resources/", views.admin_resources, name="admin_resources"),
-    path("faculty-dashboard/", views.faculty_dashboard, name="faculty_dashboard"),
+    path("faculty-dashboard/", faculty_dashboard, name="faculty_dashboard"),
     path("faculty-timetable/", views.faculty_timetable_view, name="faculty_timetable"),
-    path("student-dashboard/", views.student_dashboard, name="student_dashboard"),
+    path("student-dashboard/", student_dashboard, name="student_dashboard"),
     path("student-timetable/", views.student_timetable_view, name="student_timetable"),
 ]
@@ -1,14 +1,34 @@
+from datetime import date
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
-from django.db.models import Count, ExpressionWrapper, F, FloatField, Q
+from django.db.models import Count
+from django.http import JsonResponse
 from django.shortcuts import redirect, render
 from django.utils import timezone
-from math import ceil
 
 from accounts.models import FacultyProfile, StudentProfile, User
-from academics.models import ClassSchedule, Enrollment, Section, Subject
-from attendance.models import AttendanceRecord, AttendanceSession
+from academics.models import Section, Subject
+from academics.timetable import WORKING_DAYS, get_timetable_index, get_weekly_grid
+from attendance.archive import archived_semesters, get_archived_low_attendance_standings
+from attendance.heatmaps import slot_heatmap, worst_slots
+from attendance.models import AttendanceSession
+from attendance.risk import at_risk_students
+from attendance.services import get_low_attendance_standings, get_subject_standings
 from canteen.models import Order
 from planner.models import RemedialSession
+from .concurrency import gather_queries, run_queries
+from .dashboard import (
+    aget_dashboard_kpis,
+    get_dashboard_kpis,
+    get_kpi_cache_stats,
+    kpi_trends,
+    latest_kpi_snapshot,
+    snapshot_kpis,
+    sparkline_points,
+)
+from .db_router import reporting_view
+from .services import get_faculty_workloads, get_inactive_faculty
 
 
 ROLE_TO_DASHBOARD = {
@@ -17,16 +37,6 @@ ROLE_TO_DASHBOARD = {
     "STUDENT": "/student-dashboard/",
 }
 
-WEEKDAY_CODE_MAP = {
-    0: "MON",
-    1: "TUE",
-    2: "WED",
-    3: "THU",
-    4: "FRI",
-    5: "SAT",
-    6: "SUN",
-}
-
 
 def login_view(request):
     if request.session.get("user_id") and request.session.get("role") in ROLE_TO_DASHBOARD:
@@ -73,95 +83,89 @@ def _session_check(request, required_role):
     if role != required_role:
         return None, redirect(ROLE_TO_DASHBOARD.get(role, "/login/"))
 
+    if not request.current_user:
+        return None, redirect("login")
+
     return {"user_id": user_id, "role": role}, None
 
 
+# =========================================================
+# DASHBOARDS
+# Each dashboard lists its independent queries as {name: callable};
+# the sync views run them in turn, the async views (ASYNC_DASHBOARDS,
+# for ASGI deployments) run them concurrently.
+# =========================================================
+def _admin_dashboard_queries(today):
+    return {
+        "snapshot": latest_kpi_snapshot,
+        "trends": lambda: kpi_trends(today=today),
+        "kpi_cache_stats": get_kpi_cache_stats,
+    }
+
+
+def _admin_dashboard_context(context, results, kpis, today):
+    busiest_stall = kpis.pop("busiest_stall")
+    context.update(kpis)
+    context.update(
+        {
+            "busiest_stall_name": busiest_stall["name"],
+            "busiest_stall_load": busiest_stall["load"],
+            "today_date": today,
+            "kpi_snapshot": results["snapshot"],
+            "kpi_trends": {name: sparkline_points(values) for name, values in results["trends"].items()},
+            "kpi_cache_stats": results["kpi_cache_stats"],
+            # Backward-compatible aliases for current template bindings.
+            "low_attendance_students": kpis["low_attendance_count"],
+            "inactive_faculty_today": kpis["inactive_faculty_count"],
+            "overloaded_sections": kpis["overloaded_sections_count"],
+        }
+    )
+    return context
+
+
+def _snapshot_or_live_kpis(snapshot, today):
+    # The snapshot_kpis command keeps a recent row; fall back to the
+    # cached live figures when it is not running.
+    return snapshot_kpis(snapshot) if snapshot else get_dashboard_kpis(today)
+
+
+@reporting_view
 def admin_dashboard(request):
     context, response = _session_check(request, "ADMIN")
     if response:
         return response
 
-    low_attendance_count = (
-        AttendanceRecord.objects.values("student")
-        .annotate(
-            total_sessions=Count("id"),
-            present_sessions=Count("id", filter=Q(status="PRESENT")),
-        )
-        .filter(total_sessions__gt=0)
-        .annotate(
-            attendance_percentage=ExpressionWrapper(
-                (F("present_sessions") * 100.0) / F("total_sessions"),
-                output_field=FloatField(),
-            )
-        )
-        .filter(attendance_percentage__lt=75)
-        .count()
-    )
-
-    overloaded_sections_count = (
-        Section.objects.annotate(
-            enrolled_students=Count("studentprofile"),
-            section_capacity=F("capacity"),
-        )
-        .filter(section_capacity__gt=0)
-        .annotate(
-            utilization_percentage=ExpressionWrapper(
-                (F("enrolled_students") * 100.0) / F("section_capacity"),
-                output_field=FloatField(),
-            )
-        )
-        .filter(utilization_percentage__gt=90)
-        .count()
-    )
-
     today = timezone.localdate()
-    today_code = WEEKDAY_CODE_MAP[today.weekday()]
+    results = run_queries(_admin_dashboard_queries(today))
+    kpis = _snapshot_or_live_kpis(results["snapshot"], today)
+    _admin_dashboard_context(context, results, kpis, today)
+    return render(request, "core/admin_dashboard.html", context)
 
-    scheduled_faculty_ids = ClassSchedule.objects.filter(
-        day_of_week=today_code
-    ).values_list("faculty_id", flat=True).distinct()
 
-    faculty_marked_today_ids = AttendanceSession.objects.filter(
-        date=today,
-        marked_by__isnull=False,
-    ).values_list("marked_by_id", flat=True).distinct()
+@reporting_view
+async def admin_dashboard_async(request):
+    context, response = await sync_to_async(_session_check)(request, "ADMIN")
+    if response:
+        return response
 
-    inactive_faculty_count = User.objects.filter(
-        role="FACULTY",
-        is_active=True,
-        user_id__in=scheduled_faculty_ids,
-    ).exclude(user_id__in=faculty_marked_today_ids).count()
+    today = timezone.localdate()
+    results = await gather_queries(_admin_dashboard_queries(today))
+    if results["snapshot"]:
+        kpis = snapshot_kpis(results["snapshot"])
+    else:
+        kpis = await aget_dashboard_kpis(today)
+    _admin_dashboard_context(context, results, kpis, today)
+    return await sync_to_async(render)(request, "core/admin_dashboard.html", context)
 
-    busiest_stall = (
-        Order.objects.filter(status__in=["PENDING", "PREPARING"])
-        .values("stall__name")
-        .annotate(active_load=Count("id"))
-        .order_by("-active_load")
-        .first()
-    )
 
-    context.update(
-        {
-            "total_students": User.objects.filter(role="STUDENT").count(),
-            "total_faculty": User.objects.filter(role="FACULTY").count(),
-            "total_subjects": Subject.objects.count(),
-            "total_attendance_sessions": AttendanceSession.objects.count(),
-            "total_food_orders": Order.objects.count(),
-            "low_attendance_count": low_attendance_count,
-            "inactive_faculty_count": inactive_faculty_count,
-            "overloaded_sections_count": overloaded_sections_count,
-            "busiest_stall_name": busiest_stall["stall__name"] if busiest_stall else "No active orders",
-            "busiest_stall_load": busiest_stall["active_load"] if busiest_stall else 0,
-            "today_date": today,
-            # Backward-compatible aliases for current template bindings.
-            "low_attendance_students": low_attendance_count,
-            "inactive_faculty_today": inactive_faculty_count,
-            "overloaded_sections": overloaded_sections_count,
-        }
-    )
-    return render(request, "core/admin_dashboard.html", context)
+def admin_dashboard_cache_stats(request):
+    context, response = _session_check(request, "ADMIN")
+    if response:
+        return response
+    return JsonResponse(get_kpi_cache_stats())
 
 
+@reporting_view
 def admin_resources(request):
     context, response = _session_check(request, "ADMIN")
     if response:
@@ -195,16 +199,14 @@ def admin_resources(request):
             }
         )
 
-    faculty_users = User.objects.filter(role="FACULTY").order_by("user_id")
     faculty_rows = []
-    for faculty in faculty_users:
-        assigned_subjects_qs = Subject.objects.filter(faculty=faculty)
+    for faculty in get_faculty_workloads():
         faculty_rows.append(
             {
                 "faculty": faculty,
-                "subjects_assigned_count": assigned_subjects_qs.count(),
-                "students_enrolled_count": Enrollment.objects.filter(subject__in=assigned_subjects_qs).count(),
-                "attendance_sessions_count": AttendanceSession.objects.filter(marked_by=faculty).count(),
+                "subjects_assigned_count": faculty.subjects_assigned,
+                "students_enrolled_count": faculty.students_enrolled,
+                "attendance_sessions_count": faculty.attendance_sessions,
             }
         )
 
@@ -217,90 +219,91 @@ def admin_resources(request):
     return render(request, "core/admin_resources.html", context)
 
 
+@reporting_view
 def admin_attendance_monitoring(request):
     context, response = _session_check(request, "ADMIN")
     if response:
         return response
     mode = request.GET.get("mode", "").strip().lower()
+    semester = request.GET.get("semester", "").strip()
 
-    low_attendance_qs = (
-        AttendanceRecord.objects.values("student")
-        .annotate(
-            total_classes=Count("id"),
-            total_present=Count("id", filter=Q(status="PRESENT")),
-        )
-        .filter(total_classes__gt=0)
-        .annotate(
-            attendance_percentage=ExpressionWrapper(
-                (F("total_present") * 100.0) / F("total_classes"),
-                output_field=FloatField(),
-            )
-        )
-        .filter(attendance_percentage__lt=75)
-        .order_by("attendance_percentage")
-    )
+    if semester:
+        low_attendance_rows = get_archived_low_attendance_standings(semester)
+    else:
+        low_attendance_rows = get_low_attendance_standings()
 
-    student_ids = [row["student"] for row in low_attendance_qs]
+    student_ids = {row["student_id"] for row in low_attendance_rows}
     profile_map = {
         profile.user_id: profile
-        for profile in StudentProfile.objects.filter(user_id__in=student_ids).select_related("section")
+        for profile in StudentProfile.objects.filter(user_id__in=student_ids).select_related("section__course")
     }
 
     low_attendance_students = []
-    for row in low_attendance_qs:
-        profile = profile_map.get(row["student"])
+    for row in low_attendance_rows:
+        profile = profile_map.get(row["student_id"])
         low_attendance_students.append(
             {
-                "student_name": profile.name if profile else row["student"],
+                "student_name": profile.name if profile else row["student_id"],
+                "section": str(profile.section) if profile and profile.section else "-",
+                "subject_name": row["subject_name"],
+                "attendance_percentage": row["percentage"],
+                "required_percentage": row["threshold"],
+                "classes_needed": row["classes_needed"],
+            }
+        )
+
+    at_risk_rows = []
+    for risk in at_risk_students()[:50]:
+        profile = getattr(risk.student, "studentprofile", None)
+        at_risk_rows.append(
+            {
+                "student_name": profile.name if profile else risk.student_id,
                 "section": str(profile.section) if profile and profile.section else "-",
-                "attendance_percentage": round(row["attendance_percentage"], 2),
+                "risk_percentage": round(risk.score * 100),
+                "attendance_percentage": risk.attendance_percentage,
+                "recent_trend": risk.recent_trend,
+                "current_absence_streak": risk.current_absence_streak,
+                "lowest_subject_percentage": risk.lowest_subject_percentage,
+                "computed_at": risk.computed_at,
             }
         )
 
     today = timezone.localdate()
-    today_code = WEEKDAY_CODE_MAP[today.weekday()]
-    scheduled_today = ClassSchedule.objects.filter(day_of_week=today_code).select_related("faculty")
-    scheduled_faculty_ids = scheduled_today.values_list("faculty_id", flat=True).distinct()
-    faculty_marked_today_ids = AttendanceSession.objects.filter(
-        date=today,
-        marked_by__isnull=False,
-    ).values_list("marked_by_id", flat=True).distinct()
-
-    inactive_faculties = User.objects.filter(
-        role="FACULTY",
-        is_active=True,
-        user_id__in=scheduled_faculty_ids,
-    ).exclude(user_id__in=faculty_marked_today_ids)
-
-    faculty_profile_map = {
-        profile.user_id: profile.name
-        for profile in FacultyProfile.objects.filter(user_id__in=inactive_faculties.values_list("user_id", flat=True))
-    }
+    try:
+        report_date = date.fromisoformat(request.GET.get("date", "").strip())
+    except ValueError:
+        report_date = today
 
     inactive_faculty_rows = []
-    for faculty in inactive_faculties:
-        subjects = list(Subject.objects.filter(faculty=faculty).values_list("subject_name", flat=True))
-        scheduled_count = scheduled_today.filter(faculty=faculty).count()
+    for row in get_inactive_faculty(report_date):
         inactive_faculty_rows.append(
             {
-                "faculty_name": faculty_profile_map.get(faculty.user_id, faculty.user_id),
-                "subjects": ", ".join(subjects) if subjects else "-",
-                "scheduled_classes_today": scheduled_count,
+                "faculty_name": row["faculty_name"],
+                "subjects": ", ".join(row["subjects"]) if row["subjects"] else "-",
+                "scheduled_classes": row["scheduled_classes"],
+                "unmarked_classes": row["unmarked_classes"],
             }
         )
 
     context.update(
         {
             "mode": mode,
+            "semester": semester,
+            "archived_semesters": archived_semesters(),
             "show_students": mode in ("", "students"),
             "show_faculty": mode in ("", "faculty"),
+            "show_risk": mode in ("", "risk"),
             "low_attendance_students": low_attendance_students,
+            "at_risk_rows": at_risk_rows,
             "inactive_faculty_rows": inactive_faculty_rows,
+            "report_date": report_date,
+            "is_today": report_date == today,
         }
     )
     return render(request, "core/admin_attendance_monitoring.html", context)
 
 
+@reporting_view
 def admin_operations_monitoring(request):
     context, response = _session_check(request, "ADMIN")
     if response:
@@ -331,19 +334,13 @@ def admin_operations_monitoring(request):
         )
 
     faculty_workload_rows = []
-    faculty_users = User.objects.filter(role="FACULTY", is_active=True).order_by("user_id")
-    faculty_profile_map = {
-        profile.user_id: profile.name
-        for profile in FacultyProfile.objects.filter(user_id__in=faculty_users.values_list("user_id", flat=True))
-    }
-    for faculty in faculty_users:
-        assigned_subjects = Subject.objects.filter(faculty=faculty)
+    for faculty in get_faculty_workloads(active_only=True):
         faculty_workload_rows.append(
             {
-                "faculty_name": faculty_profile_map.get(faculty.user_id, faculty.user_id),
-                "subjects_assigned": assigned_subjects.count(),
-                "students_covered": Enrollment.objects.filter(subject__in=assigned_subjects).count(),
-                "attendance_sessions": AttendanceSession.objects.filter(marked_by=faculty).count(),
+                "faculty_name": faculty.faculty_name,
+                "subjects_assigned": faculty.subjects_assigned,
+                "students_covered": faculty.students_enrolled,
+                "attendance_sessions": faculty.attendance_sessions,
             }
         )
 
@@ -372,222 +369,154 @@ def admin_operations_monitoring(request):
     return render(request, "core/admin_operations_monitoring.html", context)
 
 
-def faculty_dashboard(request):
-    context, response = _session_check(request, "FACULTY")
+@reporting_view
+def admin_attendance_heatmap(request):
+    context, response = _session_check(request, "ADMIN")
     if response:
         return response
 
-    faculty_user = User.objects.filter(
-        user_id=context["user_id"],
-        role="FACULTY",
-        is_active=True,
-    ).first()
-    if not faculty_user:
-        return redirect("login")
+    section_id = request.GET.get("section", "").strip()
+    faculty_id = request.GET.get("faculty", "").strip()
+    section_id = int(section_id) if section_id.isdigit() else None
+    faculty_id = faculty_id or None
 
-    assigned_subjects = Subject.objects.filter(faculty=faculty_user).select_related("department", "course")
-    sessions_by_faculty = AttendanceSession.objects.filter(marked_by=faculty_user)
-    today = timezone.localdate()
-    today_code = WEEKDAY_CODE_MAP[today.weekday()]
-    today_classes = (
-        ClassSchedule.objects.filter(
-            faculty=faculty_user,
-            day_of_week=today_code,
-        )
-        .select_related("subject", "section")
-        .order_by("start_time")
+    context.update(
+        {
+            "sections": Section.objects.select_related("course").order_by("course__course_name", "year", "name"),
+            "faculty_options": FacultyProfile.objects.order_by("name").values("user_id", "name"),
+            "selected_section_id": section_id,
+            "selected_faculty_id": faculty_id,
+            "heatmap": slot_heatmap(section_id=section_id, faculty_id=faculty_id),
+            "worst_section_slots": worst_slots("section"),
+            "worst_faculty_slots": worst_slots("faculty"),
+        }
     )
+    return render(request, "core/admin_attendance_heatmap.html", context)
+
+
+def _faculty_dashboard_queries(faculty_user, today):
+    sessions_by_faculty = AttendanceSession.objects.filter(marked_by=faculty_user, confirmed=True)
+    return {
+        "assigned_subjects": lambda: list(
+            Subject.objects.filter(faculty=faculty_user).select_related("department", "course")
+        ),
+        "sessions_conducted_count": sessions_by_faculty.count,
+        "sessions_today_count": sessions_by_faculty.filter(date=today).count,
+        "today_classes": lambda: get_timetable_index(today).for_faculty(faculty_user.user_id),
+    }
+
 
+def _faculty_dashboard_context(context, results, today):
+    context.update(results)
     context.update(
         {
-            "assigned_subjects": assigned_subjects,
-            "my_subjects_count": assigned_subjects.count(),
-            "sessions_conducted_count": sessions_by_faculty.count(),
-            "sessions_today_count": sessions_by_faculty.filter(date=today).count(),
+            "my_subjects_count": len(results["assigned_subjects"]),
             "today_date": today,
-            "today_classes": today_classes,
         }
     )
+    return context
+
+
+def faculty_dashboard(request):
+    context, response = _session_check(request, "FACULTY")
+    if response:
+        return response
+
+    today = timezone.localdate()
+    results = run_queries(_faculty_dashboard_queries(request.current_user, today))
+    _faculty_dashboard_context(context, results, today)
     return render(request, "core/faculty_dashboard.html", context)
 
 
-def student_dashboard(request):
-    context, response = _session_check(request, "STUDENT")
+async def faculty_dashboard_async(request):
+    context, response = await sync_to_async(_session_check)(request, "FACULTY")
     if response:
         return response
 
-    student_user = User.objects.filter(
-        user_id=context["user_id"],
-        role="STUDENT",
-        is_active=True,
-    ).first()
-    if not student_user:
-        return redirect("login")
-
-    total_sessions = AttendanceRecord.objects.filter(student=student_user).count()
-    present_sessions = AttendanceRecord.objects.filter(
-        student=student_user,
-        status="PRESENT",
-    ).count()
-
-    required_percentage = 75
-    attendance_percentage = (present_sessions / total_sessions * 100) if total_sessions > 0 else 0
-    is_below_threshold = total_sessions > 0 and attendance_percentage < required_percentage
-    needed_classes = 0
-    if is_below_threshold:
-        needed_classes = ceil(
-            ((required_percentage / 100.0) * total_sessions - present_sessions)
-            / (1 - (required_percentage / 100.0))
-        )
-        needed_classes = max(needed_classes, 0)
+    today = timezone.localdate()
+    results = await gather_queries(_faculty_dashboard_queries(request.current_user, today))
+    _faculty_dashboard_context(context, results, today)
+    return await sync_to_async(render)(request, "core/faculty_dashboard.html", context)
 
-    enrolled_subjects = (
-        Enrollment.objects.filter(student=student_user)
-        .select_related("subject", "subject__faculty")
-        .order_by("subject__semester", "subject__subject_code")
-    )
 
-    student_profile = StudentProfile.objects.filter(user=student_user).select_related("section").first()
-    upcoming_remedials = RemedialSession.objects.none()
-    today_classes = ClassSchedule.objects.none()
-    if student_profile and student_profile.section_id:
-        today_code = WEEKDAY_CODE_MAP[timezone.localdate().weekday()]
-        today_classes = (
-            ClassSchedule.objects.filter(
-                section=student_profile.section,
-                day_of_week=today_code,
-            )
-            .select_related("subject", "faculty")
-            .order_by("start_time")
-        )
-        upcoming_remedials = (
-            RemedialSession.objects.filter(
-                section=student_profile.section,
-                scheduled_date__gte=timezone.localdate(),
-            )
+def _student_dashboard_queries(student_user, today):
+    student_profile = student_user.profile
+    section_id = student_profile.section_id if student_profile else None
+    my_orders = Order.objects.filter(student=student_user).order_by("-order_time")
+    queries = {
+        "subject_standings": lambda: get_subject_standings(student_user),
+        "upcoming_remedials": list,
+        "today_classes": list,
+        "pending_orders_count": my_orders.filter(status="PENDING").count,
+        "last_order": my_orders.first,
+    }
+    if section_id:
+        queries["upcoming_remedials"] = lambda: list(
+            RemedialSession.objects.filter(section_id=section_id, scheduled_date__gte=today)
             .select_related("subject", "created_by")
             .order_by("scheduled_date", "start_time")
         )
+        queries["today_classes"] = lambda: get_timetable_index(today).for_section(section_id)
+    return queries
 
-    my_orders = Order.objects.filter(student=student_user).order_by("-order_time")
-    pending_orders_count = my_orders.filter(status="PENDING").count()
-    last_order = my_orders.first()
+
+def _student_dashboard_context(context, results):
+    subject_standings = results["subject_standings"]
+    total_sessions = sum(standing["total"] for standing in subject_standings)
+    present_sessions = sum(standing["present"] for standing in subject_standings)
+    attendance_percentage = (present_sessions / total_sessions * 100) if total_sessions > 0 else 0
+    subjects_below_threshold = [standing for standing in subject_standings if standing["is_below_threshold"]]
+    last_order = results["last_order"]
 
     context.update(
         {
             "attendance_percentage": round(attendance_percentage, 2),
             "total_sessions": total_sessions,
             "present_sessions": present_sessions,
-            "required_percentage": required_percentage,
-            "is_below_threshold": is_below_threshold,
-            "needed_classes": needed_classes,
-            "enrolled_subjects": enrolled_subjects,
-            "upcoming_remedials": upcoming_remedials,
-            "today_classes": today_classes,
-            "pending_orders_count": pending_orders_count,
+            "subject_standings": subject_standings,
+            "subjects_below_threshold": subjects_below_threshold,
+            "is_below_threshold": bool(subjects_below_threshold),
+            "upcoming_remedials": results["upcoming_remedials"],
+            "today_classes": results["today_classes"],
+            "pending_orders_count": results["pending_orders_count"],
             "last_order_status": last_order.status if last_order else "No orders yet",
         }
     )
-    return render(request, "core/student_dashboard.html", context)
+    return context
 
 
-def student_timetable_view(request):
+def student_dashboard(request):
     context, response = _session_check(request, "STUDENT")
     if response:
         return response
 
-    student_user = User.objects.filter(
-        user_id=context["user_id"],
-        role="STUDENT",
-        is_active=True,
-    ).first()
-    if not student_user:
-        return redirect("login")
-
-    student_profile = StudentProfile.objects.filter(user=student_user).select_related("section").first()
-    day_columns = ["MON", "TUE", "WED", "THU", "FRI"]
-    time_slots = [
-        ("09:00", "10:00"),
-        ("10:00", "11:00"),
-        ("11:00", "12:00"),
-        ("14:00", "15:00"),
-        ("15:00", "16:00"),
-    ]
-
-    slot_rows = [
-        {
-            "start_str": start_str,
-            "end_str": end_str,
-            "label": f"{start_str} - {end_str}",
-            "cells": {day: None for day in day_columns},
-            "ordered_cells": [],
-        }
-        for start_str, end_str in time_slots
-    ]
-    slot_index = {(row["start_str"], row["end_str"]): row for row in slot_rows}
+    results = run_queries(_student_dashboard_queries(request.current_user, timezone.localdate()))
+    _student_dashboard_context(context, results)
+    return render(request, "core/student_dashboard.html", context)
 
-    if student_profile and student_profile.section_id:
-        schedules = (
-            ClassSchedule.objects.filter(
-                section=student_profile.section,
-                day_of_week__in=day_columns,
-            )
-            .select_related("subject", "faculty")
-            .order_by("day_of_week", "start_time")
-        )
 
-        for schedule in schedules:
-            key = (
-                schedule.start_time.strftime("%H:%M"),
-                schedule.end_time.strftime("%H:%M"),
-            )
-            row = slot_index.get(key)
-            if not row:
-                continue
-            row["cells"][schedule.day_of_week] = {
-                "type": "CLASS",
-                "subject_name": schedule.subject.subject_name,
-                "faculty_name": schedule.faculty.user_id,
-                "room": schedule.room,
-            }
+async def student_dashboard_async(request):
+    context, response = await sync_to_async(_session_check)(request, "STUDENT")
+    if response:
+        return response
 
-        upcoming_remedials = RemedialSession.objects.filter(
-            section=student_profile.section,
-            scheduled_date__gte=timezone.localdate(),
-            start_time__isnull=False,
-            end_time__isnull=False,
-        ).select_related("subject", "created_by")
-
-        weekday_map = {0: "MON", 1: "TUE", 2: "WED", 3: "THU", 4: "FRI"}
-        for remedial in upcoming_remedials:
-            day_code = weekday_map.get(remedial.scheduled_date.weekday())
-            if day_code not in day_columns:
-                continue
-            key = (
-                remedial.start_time.strftime("%H:%M"),
-                remedial.end_time.strftime("%H:%M"),
-            )
-            row = slot_index.get(key)
-            if not row:
-                continue
-            if row["cells"][day_code] is None:
-                row["cells"][day_code] = {
-                    "type": "REMEDIAL",
-                    "subject_name": remedial.subject.subject_name,
-                    "faculty_name": remedial.created_by.user_id,
-                    "room": "Remedial",
-                }
-
-    for row in slot_rows:
-        row["ordered_cells"] = [row["cells"][day] for day in day_columns]
+    results = await gather_queries(_student_dashboard_queries(request.current_user, timezone.localdate()))
+    _student_dashboard_context(context, results)
+    return await sync_to_async(render)(request, "core/student_dashboard.html", context)
 
-    context.update(
-        {
-            "section": student_profile.section if student_profile else None,
-            "day_columns": day_columns,
-            "slot_rows": slot_rows,
-        }
-    )
+
+def student_timetable_view(request):
+    context, response = _session_check(request, "STUDENT")
+    if response:
+        return response
+
+    student_profile = request.current_user.profile
+    if student_profile and student_profile.section_id:
+        context.update(get_weekly_grid(section_id=student_profile.section_id))
+    else:
+        context.update({"day_columns": WORKING_DAYS, "slot_rows": []})
+
+    context["section"] = student_profile.section if student_profile else None
     return render(request, "core/student_timetable.html", context)
 
 
@@ -596,65 +525,5 @@ def faculty_timetable_view(request):
     if response:
         return response
 
-    faculty_user = User.objects.filter(
-        user_id=context["user_id"],
-        role="FACULTY",
-        is_active=True,
-    ).first()
-    if not faculty_user:
-        return redirect("login")
-
-    day_columns = ["MON", "TUE", "WED", "THU", "FRI"]
-    time_slots = [
-        ("09:00", "10:00"),
-        ("10:00", "11:00"),
-        ("11:00", "12:00"),
-        ("14:00", "15:00"),
-        ("15:00", "16:00"),
-    ]
-
-    slot_rows = [
-        {
-            "start_str": start_str,
-            "end_str": end_str,
-            "label": f"{start_str} - {end_str}",
-            "cells": {day: None for day in day_columns},
-            "ordered_cells": [],
-        }
-        for start_str, end_str in time_slots
-    ]
-    slot_index = {(row["start_str"], row["end_str"]): row for row in slot_rows}
-
-    schedules = (
-        ClassSchedule.objects.filter(
-            faculty=faculty_user,
-            day_of_week__in=day_columns,
-        )
-        .select_related("subject", "section")
-        .order_by("day_of_week", "start_time")
-    )
-
-    for schedule in schedules:
-        key = (
-            schedule.start_time.strftime("%H:%M"),
-            schedule.end_time.strftime("%H:%M"),
-        )
-        row = slot_index.get(key)
-        if not row:
-            continue
-        row["cells"][schedule.day_of_week] = {
-            "subject_name": schedule.subject.subject_name,
-            "section_name": schedule.section.name,
-            "room": schedule.room,
-        }
-
-    for row in slot_rows:
-        row["ordered_cells"] = [row["cells"][day] for day in day_columns]
-
-    context.update(
-        {
-            "day_columns": day_columns,
-            "slot_rows": slot_rows,
-        }
-    )
+    context.update(get_weekly_grid(faculty_id=context["user_id"]))
     return render(request, "core/faculty_timetable.html", context)
@@ -11,4 +11,4 @@ class FaceEmbedding(models.Model):
     embedding_path = models.CharField(max_length=255)
 
     def __str__(self):
-        return self.student.user_id
+        return self.student_id
@@ -24,4 +24,4 @@ class NotificationLog(models.Model):
     )
 
     def __str__(self):
-        return f"{self.notification_type} - {self.student.user_id}"
+        return f"{self.notification_type} - {self.student_id}"
@@ -1,3 +1,7 @@
 from django.test import TestCase
 
-# Create your tests here.
+from core.query_assertions import QueryBudgetMixin
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    ADMIN_APPS = ("notifications",)
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0006_classschedule_schedule_faculty_day_idx_and_more'),
+        ('accounts', '0001_initial'),
+        ('planner', '0002_remedialsession_end_time_remedialsession_start_time'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='remedialsession',
+            index=models.Index(fields=['section', 'scheduled_date'], name='remedial_section_date_idx'),
+        ),
+    ]
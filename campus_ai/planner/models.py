@@ -20,6 +20,12 @@ class RemedialSession(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Upcoming remedials for a section.
+            models.Index(fields=["section", "scheduled_date"], name="remedial_section_date_idx"),
+        ]
+
     def __str__(self):
         return f"{self.code} - {self.subject.subject_code}"
 
@@ -41,4 +47,4 @@ class RemedialAttendance(models.Model):
         unique_together = ("session", "student")
 
     def __str__(self):
-        return f"{self.student.user_id} - {self.session.code}"
+        return f"{self.student_id} - {self.session.code}"
@@ -1,3 +1,10 @@
 from django.test import TestCase
 
-# Create your tests here.
+from core.query_assertions import QueryBudgetMixin
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    REQUESTS = [
+        ("schedule_remedial", "FACULTY", {}, [""]),
+        ("join_remedial", "STUDENT", {}, [""]),
+    ]
@@ -6,7 +6,6 @@ from django.contrib import messages
 from django.shortcuts import redirect, render
 from django.utils import timezone
 
-from accounts.models import User
 from academics.models import Section, Subject
 from .models import RemedialAttendance, RemedialSession
 
@@ -17,14 +16,9 @@ def _session_user_by_role(request, required_role):
     if not user_id or role != required_role:
         return None, redirect("login")
 
-    user = User.objects.filter(
-        user_id=user_id,
-        role=required_role,
-        is_active=True,
-    ).first()
-    if not user:
+    if not request.current_user:
         return None, redirect("login")
-    return user, None
+    return request.current_user, None
 
 
 def _generate_unique_code(length=6):